@@ -0,0 +1,455 @@
+import argparse
+import datetime
+import json
+
+from pymongo import MongoClient
+
+import bench_leaderboard
+import seed_indexes
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+RATIO_LIMIT = 10  # Documents examined per matching document before a shape is flagged
+SEARCH_LENGTH = 3  # Characters of a sampled student's name used as the leaderboard search term
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+def in_classes(class_ids):
+    """Student filter the report services use for a set of classes: either class reference"""
+    return {"$or": [{"currentClass.ref": {"$in": class_ids}}, {"class": {"$in": class_ids}}]}
+
+def sample_context(db):
+    """Ids and values the catalogue's shapes are filled with, taken from the seeded data"""
+    cls = db.classes.find_one({"facultyAssigned.0": {"$exists": True}, "academicAdvisors.0": {"$exists": True}},
+                              sort=[("_id", 1)])
+    student = db.students.find_one(in_classes([cls["_id"]])) if cls else None
+    if student is None:
+        raise SystemExit("No class with students, faculty and advisors; seed the database first (python main.py)")
+
+    department = cls["department"]
+    advisor_id = cls["academicAdvisors"][0]
+    advisor_classes = [c["_id"] for c in db.classes.find({"academicAdvisors": advisor_id, "department": department},
+                                                         {"_id": 1})]
+    class_students = [s["_id"] for s in db.students.find(in_classes([cls["_id"]]), {"_id": 1})]
+    advisor_students = [s["_id"] for s in db.students.find(dict(in_classes(advisor_classes), department=department),
+                                                           {"_id": 1})]
+
+    # The services count back from new Date(); seeded dates run up to the seeding time, so count back from
+    # the newest event instead and keep the windows as selective as they are in production
+    latest = db.events.find_one({}, {"createdAt": 1}, sort=[("createdAt", -1)])
+    now = latest["createdAt"] if latest and latest.get("createdAt") else datetime.datetime.now()
+    name = student.get("name") or "a"
+    return {
+        "department": department,
+        "year": cls["year"],
+        "section": student.get("currentClass", {}).get("section", cls.get("section")),
+        "class_id": cls["_id"],
+        "faculty_id": cls["facultyAssigned"][0],
+        "advisor_id": advisor_id,
+        "advisor_classes": advisor_classes,
+        "class_students": class_students,
+        "advisor_students": advisor_students,
+        "student_id": student["_id"],
+        "category": (db.events.find_one({"submittedBy": {"$in": class_students}}, {"category": 1},
+                                        sort=[("_id", 1)]) or {}).get("category"),
+        "search": name[:SEARCH_LENGTH],
+        "now": now,
+        "month_ago": now - datetime.timedelta(days=30),
+        "six_months_ago": now - datetime.timedelta(days=182),
+        "year_ago": now - datetime.timedelta(days=365),
+    }
+
+def catalogue(ctx):
+    """Every query and pipeline shape the report and leaderboard services send, filled from ctx.
+
+    A shape is a find (filter with optional projection, sort, skip, limit), a count, a distinct
+    or an aggregate pipeline, named after the service method that sends it.
+    """
+    department = ctx["department"]
+    class_students = {"$in": ctx["class_students"]}
+    advisor_students = {"$in": ctx["advisor_students"]}
+    window = {"$gte": ctx["year_ago"], "$lte": ctx["now"]}
+    student_filter = in_classes(ctx["advisor_classes"])
+    student_filter["department"] = department
+    context_filter = {"currentClass.year": ctx["year"], "department": department}
+    search_filter = dict(context_filter, **{"$or": bench_leaderboard.search_clause(ctx["search"])})
+    monthly = {"month": {"$month": "$date"}, "year": {"$year": "$date"}}
+
+    return [
+        # roleBasedEventReports.service.js
+        {"name": "reports.getRoleBasedFilters:advisor", "collection": "classes",
+         "filter": {"academicAdvisors": ctx["advisor_id"], "department": department}, "projection": {"_id": 1}},
+        {"name": "reports.getRoleBasedFilters:faculty", "collection": "classes",
+         "filter": {"facultyAssigned": ctx["faculty_id"], "department": department}, "projection": {"_id": 1}},
+        {"name": "reports.getAvailableClasses:advisorYears", "collection": "classes", "distinct": "year",
+         "filter": {"academicAdvisors": ctx["advisor_id"], "department": department}},
+        {"name": "reports.getAvailableClasses", "collection": "classes",
+         "filter": {"department": department, "year": ctx["year"]},
+         "sort": {"year": 1, "section": 1, "department": 1}},
+        {"name": "reports.getStudentClassMap", "collection": "students", "filter": student_filter,
+         "projection": {"_id": 1, "currentClass": 1, "class": 1}},
+        {"name": "reports.getTopStudents", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": advisor_students, "status": "Approved"}},
+            {"$group": {"_id": "$submittedBy", "totalPoints": {"$sum": "$points"}, "eventCount": {"$sum": 1}}},
+            {"$sort": {"totalPoints": -1}},
+            {"$limit": 10},
+        ]},
+        {"name": "reports.getPopularCategories:dateRange", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": advisor_students, "status": "Approved", "createdAt": window}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}, "totalPoints": {"$sum": "$pointsEarned"}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 5},
+            {"$project": {"category": "$_id", "count": 1, "totalPoints": 1, "_id": 0}},
+        ]},
+        {"name": "reports.getClassPerformance", "collection": "events", "pipeline": [
+            {"$match": {"status": "Approved", "submittedBy": class_students}},
+            {"$group": {"_id": None, "totalEvents": {"$sum": 1}, "totalPoints": {"$sum": "$pointsEarned"},
+                        "avgPoints": {"$avg": "$pointsEarned"}, "categoryCount": {"$addToSet": "$category"}}},
+        ]},
+        {"name": "reports.getApprovalRates", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": advisor_students}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]},
+        {"name": "reports.getInactiveStudents", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": advisor_students}},
+            {"$sort": {"createdAt": -1}},
+            {"$group": {"_id": "$submittedBy", "lastActivity": {"$first": "$createdAt"}}},
+        ]},
+        {"name": "reports.getDetailedStudentPerformance:count", "collection": "events",
+         "count": {"submittedBy": ctx["student_id"], "status": "Approved"}},
+        {"name": "reports.getDetailedStudentPerformance", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": ctx["student_id"], "status": "Approved"}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}, "points": {"$sum": "$pointsEarned"}}},
+            {"$project": {"category": "$_id", "count": 1, "points": 1, "_id": 0}},
+        ]},
+        {"name": "reports.getCategoryPerformanceByClass", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved",
+                        "category": ctx["category"], "createdAt": window}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}, "points": {"$sum": "$pointsEarned"}}},
+            {"$project": {"category": "$_id", "count": 1, "points": 1, "_id": 0}},
+        ]},
+        {"name": "reports.getTrends", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": advisor_students, "status": "Approved",
+                        "date": {"$gte": ctx["six_months_ago"]}}},
+            {"$group": {"_id": monthly, "count": {"$sum": 1}, "points": {"$sum": "$pointsEarned"}}},
+            {"$sort": {"_id.year": 1, "_id.month": 1}},
+        ]},
+        {"name": "reports.getClassParticipation:students", "collection": "students",
+         "filter": {"$or": [{"currentClass.ref": ctx["class_id"]}, {"class": ctx["class_id"]}]},
+         "projection": {"_id": 1}},
+        {"name": "reports.getClassParticipation", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved",
+                        "date": {"$gte": ctx["six_months_ago"]}}},
+            {"$group": {"_id": monthly, "count": {"$sum": 1}}},
+            {"$sort": {"_id.year": 1, "_id.month": 1}},
+        ]},
+
+        # facultyReport.service.js
+        {"name": "faculty.getFacultyClass", "collection": "classes",
+         "filter": {"facultyAssigned": ctx["faculty_id"]}, "limit": 1},
+        {"name": "faculty.getDepartmentRanking", "collection": "classes",
+         "filter": {"department": department, "year": ctx["year"]}},
+        {"name": "faculty.getClassOverview:count", "collection": "events",
+         "count": {"submittedBy": class_students, "status": "Approved"}},
+        {"name": "faculty.getStudentAnalysis:latest", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved"}},
+            {"$sort": {"createdAt": -1}},
+            {"$group": {"_id": "$submittedBy", "lastActivity": {"$first": "$createdAt"}}},
+        ]},
+        {"name": "faculty.getStudentAnalysis:recent", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved",
+                        "createdAt": {"$gte": ctx["month_ago"]}}},
+            {"$group": {"_id": "$submittedBy", "recentPoints": {"$sum": "$pointsEarned"},
+                        "recentActivities": {"$sum": 1}}},
+            {"$sort": {"recentPoints": -1}},
+            {"$limit": 10},
+        ]},
+        {"name": "faculty.getCategoryAnalysis:popular", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved"}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}, "totalPoints": {"$sum": "$pointsEarned"}}},
+            {"$sort": {"count": -1}},
+            {"$project": {"category": "$_id", "count": 1, "totalPoints": 1, "_id": 0}},
+        ]},
+        {"name": "faculty.getCategoryAnalysis:approval", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students}},
+            {"$group": {"_id": {"category": "$category", "status": "$status"}, "count": {"$sum": 1}}},
+            {"$group": {"_id": "$_id.category", "statuses": {"$push": {"status": "$_id.status", "count": "$count"}},
+                        "total": {"$sum": "$count"}}},
+        ]},
+        {"name": "faculty.getParticipationTrends", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students,
+                        "createdAt": {"$gte": ctx["six_months_ago"], "$lte": ctx["now"]}}},
+            {"$group": {"_id": {"month": {"$month": "$createdAt"}, "year": {"$year": "$createdAt"}},
+                        "submissions": {"$sum": 1},
+                        "approvals": {"$sum": {"$cond": [{"$eq": ["$status", "Approved"]}, 1, 0]}},
+                        "points": {"$sum": "$pointsEarned"}, "date": {"$first": "$createdAt"}}},
+            {"$sort": {"_id.year": 1, "_id.month": 1, "_id.week": 1}},
+        ]},
+        {"name": "faculty.getEngagementOpportunities:categories", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved"}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}, "studentCount": {"$addToSet": "$submittedBy"}}},
+            {"$project": {"category": "$_id", "count": 1, "uniqueStudents": {"$size": "$studentCount"}, "_id": 0}},
+            {"$sort": {"uniqueStudents": 1, "count": 1}},
+        ]},
+        {"name": "faculty.getEngagementOpportunities:active", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "createdAt": {"$gte": ctx["month_ago"]}}},
+            {"$group": {"_id": "$submittedBy"}},
+            {"$count": "activeCount"},
+        ]},
+        {"name": "faculty.getEngagementOpportunities:topAchievers", "collection": "students",
+         "filter": {"_id": class_students, "totalPoints": {"$gt": 0}},
+         "projection": {"_id": 1, "name": 1, "registerNo": 1, "totalPoints": 1}, "sort": {"totalPoints": -1},
+         "limit": 3},
+        {"name": "faculty.getEngagementOpportunities:improved", "collection": "events", "pipeline": [
+            {"$match": {"submittedBy": class_students, "status": "Approved",
+                        "createdAt": {"$gte": ctx["month_ago"]}}},
+            {"$group": {"_id": "$submittedBy", "recentPoints": {"$sum": "$pointsEarned"},
+                        "recentActivities": {"$sum": 1}}},
+            {"$match": {"recentPoints": {"$gt": 100}, "recentActivities": {"$gt": 3}}},
+            {"$sort": {"recentPoints": -1}},
+            {"$limit": 3},
+        ]},
+
+        # leaderboard.service.js
+        {"name": "leaderboard.getStudentRank:overall", "collection": "students", "filter": {},
+         "projection": bench_leaderboard.RANK_PROJECTION, "sort": {"totalPoints": -1}},
+        {"name": "leaderboard.getStudentRank:context", "collection": "students", "filter": context_filter,
+         "projection": bench_leaderboard.RANK_PROJECTION, "sort": {"totalPoints": -1}},
+        {"name": "leaderboard.getLeaderboard:section", "collection": "students",
+         "filter": dict(context_filter, **{"currentClass.section": ctx["section"]}),
+         "projection": bench_leaderboard.PAGE_PROJECTION, "sort": {"totalPoints": -1},
+         "limit": bench_leaderboard.PAGE_LIMIT},
+        {"name": "leaderboard.getLeaderboard:search", "collection": "students",
+         "filter": {"$or": bench_leaderboard.search_clause(ctx["search"])},
+         "projection": bench_leaderboard.PAGE_PROJECTION, "sort": {"totalPoints": -1},
+         "limit": bench_leaderboard.PAGE_LIMIT},
+        {"name": "leaderboard.getLeaderboard:searchCount", "collection": "students",
+         "count": {"$or": bench_leaderboard.search_clause(ctx["search"])}},
+        {"name": "leaderboard.getStudentContextLeaderboard:search", "collection": "students",
+         "filter": search_filter, "projection": bench_leaderboard.CONTEXT_PAGE_PROJECTION,
+         "sort": {"totalPoints": -1}, "limit": bench_leaderboard.PAGE_LIMIT},
+    ]
+
+def explain_command(shape):
+    """The command a shape runs as, ready to wrap in explain"""
+    collection = shape["collection"]
+    if "pipeline" in shape:
+        return {"aggregate": collection, "pipeline": shape["pipeline"], "cursor": {}}
+    if "count" in shape:
+        return {"count": collection, "query": shape["count"]}
+    if "distinct" in shape:
+        return {"distinct": collection, "key": shape["distinct"], "query": shape["filter"]}
+    command = {"find": collection, "filter": shape["filter"]}
+    for option in ("projection", "sort", "skip", "limit"):
+        if shape.get(option):
+            command[option] = shape[option]
+    return command
+
+def leading_filter(shape):
+    """The filter the query layer answers: a find's filter, or a pipeline's first $match"""
+    if "pipeline" in shape:
+        first = shape["pipeline"][0] if shape["pipeline"] else {}
+        return first.get("$match", {})
+    return shape["count"] if "count" in shape else shape["filter"]
+
+def leading_sort(shape):
+    """Sort an index could provide: a find's sort, or a $sort straight after the first $match"""
+    if "pipeline" not in shape:
+        return shape.get("sort") or {}
+    pipeline = shape["pipeline"]
+    if len(pipeline) > 1 and "$match" in pipeline[0] and "$sort" in pipeline[1]:
+        return pipeline[1]["$sort"]
+    return {}
+
+def plan_sections(explained):
+    """(queryPlanner, executionStats) of every query layer: the top level, $cursor stages and shards"""
+    if "queryPlanner" in explained:
+        yield explained["queryPlanner"], explained.get("executionStats", {})
+    for stage in explained.get("stages", []):
+        if "$cursor" in stage:
+            yield from plan_sections(stage["$cursor"])
+    for shard in explained.get("shards", {}).values():
+        yield from plan_sections(shard)
+
+def plan_nodes(node):
+    """Every plan stage under node, depth first"""
+    if isinstance(node, dict):
+        if "stage" in node:
+            yield node
+        for value in node.values():
+            yield from plan_nodes(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from plan_nodes(item)
+
+def blocking_sort(explained):
+    """True when a pipeline $sort runs on raw documents, before any $group shrank them"""
+    for stage in explained.get("stages", []):
+        if "$group" in stage:
+            return False
+        if "$sort" in stage:
+            return True
+    return False
+
+def audit_shape(db, shape):
+    """Explain one shape with executionStats and flag the work it does"""
+    explained = db.command("explain", explain_command(shape), verbosity="executionStats")
+    stages = []
+    indexes = []
+    docs_examined = keys_examined = returned = millis = 0
+    for planner, stats in plan_sections(explained):
+        for node in plan_nodes(planner.get("winningPlan", {})):
+            stages.append(node["stage"])
+            if node["stage"] == "IXSCAN" and node.get("indexName") not in indexes:
+                indexes.append(node.get("indexName"))
+        docs_examined += stats.get("totalDocsExamined", 0)
+        keys_examined += stats.get("totalKeysExamined", 0)
+        returned += stats.get("nReturned", 0)
+        millis += stats.get("executionTimeMillis", 0)
+
+    # Compare with what the filter really matches: a $group's output says nothing of its input
+    matched = db[shape["collection"]].count_documents(leading_filter(shape))
+    ratio = docs_examined / max(matched, 1)
+    flags = []
+    if "COLLSCAN" in stages:
+        flags.append("COLLSCAN")
+    if "SORT" in stages or blocking_sort(explained):
+        flags.append("in-memory SORT")
+    if ratio > RATIO_LIMIT:
+        flags.append(f"{ratio:,.0f} docs examined per match")
+    return {
+        "name": shape["name"], "collection": shape["collection"], "indexes": indexes, "flags": flags,
+        "docs_examined": docs_examined, "keys_examined": keys_examined, "returned": returned,
+        "matched": matched, "ratio": ratio, "millis": millis,
+    }
+
+def index_keys(query, sort):
+    """Equality fields, then sort fields, then range fields (the ESR rule), as (field, direction) pairs,
+    with the number of leading equality fields, whose order does not matter.
+
+    Regex, $exists and other operators that cannot bound a scan are left out.
+    """
+    equality = []
+    ranges = []
+    for field, condition in query.items():
+        if field.startswith("$"):
+            continue
+        if not isinstance(condition, dict) or set(condition) <= {"$eq", "$in"}:
+            equality.append(field)
+        elif set(condition) <= RANGE_OPERATORS:
+            ranges.append(field)
+    keys = [(field, 1) for field in equality]
+    keys += [(field, direction) for field, direction in sort.items() if field not in equality]
+    keys += [(field, 1) for field in ranges if field not in sort]
+    return keys, len(equality)
+
+def suggested_indexes(shape):
+    """(keys, equality count) of indexes that would serve a shape; an $or needs one per branch"""
+    query = leading_filter(shape)
+    sort = leading_sort(shape)
+    outer = {field: condition for field, condition in query.items() if field != "$or"}
+    branches = [dict(outer, **branch) for branch in query["$or"]] if "$or" in query else [query]
+    suggestions = []
+    for branch in branches:
+        keys, equality = index_keys(branch, sort)
+        if keys and (keys, equality) not in suggestions:
+            suggestions.append((keys, equality))
+    return suggestions
+
+def serves(index, keys, equality):
+    """True when an index starts with the equality fields in any order, then the rest of keys
+    read forwards or backwards"""
+    if len(index) < len(keys) or {field for field, _ in index[:equality]} != {field for field, _ in keys[:equality]}:
+        return False
+    rest = index[equality:len(keys)]
+    return rest == keys[equality:] or rest == [(field, -direction) for field, direction in keys[equality:]]
+
+def suggest(db, results, shapes):
+    """Indexes no existing one serves for the flagged shapes, and the flagged shapes no index can bound"""
+    existing = {}
+    suggestions = {}
+    unindexable = []
+    for result in results:
+        if not result["flags"]:
+            continue
+        collection = result["collection"]
+        if collection not in existing:
+            existing[collection] = [list(spec["key"].items()) for spec in db[collection].list_indexes()]
+        candidates = suggested_indexes(shapes[result["name"]])
+        if not candidates:
+            unindexable.append(result["name"])
+        for keys, equality in candidates:
+            if any(serves(index, keys, equality) for index in existing[collection]):
+                continue
+            # Prefer an index seed_indexes.py declares but that is not built, so one build serves many shapes
+            configured = [index for index, _ in seed_indexes.INDEXES.get(collection, [])
+                          if serves(index, keys, equality)]
+            if configured:
+                keys = configured[0]
+            suggestion = suggestions.setdefault((collection, seed_indexes.index_name(keys)), {
+                "collection": collection, "keys": keys, "equality": equality, "configured": bool(configured),
+                "shapes": []})
+            if result["name"] not in suggestion["shapes"]:
+                suggestion["shapes"].append(result["name"])
+
+    # Fold a suggestion into a wider one that serves it too
+    merged = []
+    for suggestion in sorted(suggestions.values(), key=lambda s: (-len(s["keys"]), not s["configured"])):
+        wider = [other for other in merged if other["collection"] == suggestion["collection"]
+                 and serves(other["keys"], suggestion["keys"], suggestion["equality"])]
+        if wider:
+            wider[0]["shapes"].extend(name for name in suggestion["shapes"] if name not in wider[0]["shapes"])
+        else:
+            merged.append(suggestion)
+    return merged, unindexable
+
+def audit(db, only=None):
+    """Explain every catalogued shape; returns results ranked worst first, plus index suggestions"""
+    shapes = {shape["name"]: shape for shape in catalogue(sample_context(db))}
+    results = [audit_shape(db, shape) for name, shape in shapes.items()
+               if not only or any(name.startswith(prefix) for prefix in only)]
+    results.sort(key=lambda result: (-len(result["flags"]), -result["docs_examined"], -result["millis"]))
+    suggestions, unindexable = suggest(db, results, shapes)
+    return {"results": results, "suggestions": suggestions, "unindexable": unindexable}
+
+def print_report(report):
+    """Ranked table of shapes and their flags, then the suggested indexes"""
+    print(f"{'#':>3} {'shape':<48} {'docs exam.':>11} {'keys exam.':>11} {'matched':>8} {'ms':>6}  plan")
+    for rank, result in enumerate(report["results"], 1):
+        plan = ", ".join(result["indexes"]) or ("COLLSCAN" if "COLLSCAN" in result["flags"] else "-")
+        print(f"{rank:>3} {result['name']:<48} {result['docs_examined']:>11,} {result['keys_examined']:>11,} "
+              f"{result['matched']:>8,} {result['millis']:>6}  {plan}")
+        for flag in result["flags"]:
+            print(f"{'':>4}! {flag}")
+
+    flagged = sum(1 for result in report["results"] if result["flags"])
+    print(f"\n{flagged} of {len(report['results'])} shapes flagged")
+    if report["suggestions"]:
+        print("\nSuggested indexes:")
+    for suggestion in report["suggestions"]:
+        keys = ", ".join(f"{field}: {direction}" for field, direction in suggestion["keys"])
+        note = " (declared in seed_indexes.py; run it)" if suggestion["configured"] else ""
+        print(f"  db.{suggestion['collection']}.createIndex({{ {keys} }}){note}")
+        print(f"    for {', '.join(suggestion['shapes'])}")
+    if report["unindexable"]:
+        print(f"\nNo index can bound the filters of {', '.join(report['unindexable'])} "
+              f"(e.g. unanchored case-insensitive regex)")
+    return flagged
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Explain the report and leaderboard services' query shapes and flag scans, sorts and waste")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="audit shapes starting with PREFIX")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    report = audit(db, args.only)
+    flagged = print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    raise SystemExit(1 if flagged else 0)
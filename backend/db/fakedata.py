@@ -1,9 +1,18 @@
 from faker import Faker
 from pymongo import MongoClient
+from bson import ObjectId
+import argparse
+import multiprocessing
+import os
 import random
-import bcrypt
+import sys
 from datetime import datetime, timedelta
 
+# The password hashing stage lives with main.py at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from passwords import (BCRYPT_ROUNDS, HASH_CACHE_PATH, HASH_WORKERS, hash_passwords, load_password_cache,
+                       save_password_cache)
+
 # Initialize Faker
 faker = Faker()
 
@@ -17,9 +26,12 @@ students_col = db["students"]
 classes_col = db["classes"]
 events_col = db["events"]
 
-# Helper functions
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# Batched mode configuration
+BATCH_SIZE = 1000
+ORDERED_WRITES = False
+
+# Password hashing configuration; the hashing stage is shared with main.py
+bcrypt_rounds = BCRYPT_ROUNDS
 
 def generate_register_number(year):
     return f"RA{year}{random.randint(100000000, 999999999)}"
@@ -28,12 +40,11 @@ def create_teacher():
     name = faker.name()
     email = faker.unique.email()
     raw_password = faker.password()
-    password = hash_password(raw_password)
     print(f"Created teacher: {name} ({email})")
     return {
         "name": name,
         "email": email,
-        "password": password,
+        "password": None,  # Filled in by hash_passwords
         "rawPassword": raw_password,
         "profileImg": "http://res.cloudinary.com/dyiph7is1/image/upload/v1736782080/lbblteg4fwnrlg2jci5v.jpg",
         "registerNo": faker.unique.uuid4(),
@@ -44,7 +55,6 @@ def create_student(class_id, year):
     name = faker.name()
     email = faker.unique.email()
     raw_password = faker.password()
-    password = hash_password(raw_password)
     register_number = generate_register_number(year)
     print(f"Created student: {name} ({email}) with Register No: {register_number} in class ID {class_id}")
     return {
@@ -52,7 +62,7 @@ def create_student(class_id, year):
         "profileImg": "http://res.cloudinary.com/dyiph7is1/image/upload/v1736782080/lbblteg4fwnrlg2jci5v.jpg",
         "email": email,
         "registerNo": register_number,
-        "password": password,
+        "password": None,  # Filled in by hash_passwords
         "rawPassword": raw_password,
         "class": class_id,
         "totalPoints": 0,
@@ -88,7 +98,17 @@ def create_class(name, teacher_id):
     }
 
 # Populate database
-def populate_database():
+def populate_database(workers=HASH_WORKERS):
+    # One pool for the whole run; starting one per class costs more than the hashing it saves
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        populate_with_pool(workers, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+def populate_with_pool(workers, pool):
     print("Clearing existing data...")
     teachers_col.delete_many({})
     students_col.delete_many({})
@@ -96,9 +116,10 @@ def populate_database():
     events_col.delete_many({})
 
     print("Creating teachers...")
+    new_teachers = [create_teacher() for _ in range(26)]
+    hash_passwords(new_teachers, workers, pool, bcrypt_rounds)
     teachers = []
-    for _ in range(26):
-        teacher = create_teacher()
+    for teacher in new_teachers:
         teacher_id = teachers_col.insert_one(teacher).inserted_id
         teachers.append((teacher, teacher_id))
 
@@ -125,9 +146,11 @@ def populate_database():
 
     print("Creating students and assigning them to classes...")
     for class_id, teacher_id, year in classes:
+        # A class's passwords are hashed together so the pool has work to share
+        class_students = [create_student(class_id, year) for _ in range(60)]
+        hash_passwords(class_students, workers, pool, bcrypt_rounds)
         student_ids = []
-        for _ in range(60):
-            student = create_student(class_id, year)
+        for student in class_students:
             student_id = students_col.insert_one(student).inserted_id
             student_ids.append(student_id)
 
@@ -164,6 +187,121 @@ def populate_database():
 
     print("Database populated successfully!")
 
+def insert_in_batches(collection, docs, batch_size, ordered):
+    """Insert documents with insert_many in fixed-size batches"""
+    for start in range(0, len(docs), batch_size):
+        collection.insert_many(docs[start:start + batch_size], ordered=ordered)
+    print(f"Inserted {len(docs)} documents into {collection.name}")
+
+# Populate database with documents built in memory
+def populate_database_batched(batch_size=BATCH_SIZE, ordered=ORDERED_WRITES, workers=HASH_WORKERS):
+    print("Clearing existing data...")
+    teachers_col.delete_many({})
+    students_col.delete_many({})
+    classes_col.delete_many({})
+    events_col.delete_many({})
+
+    # Every _id is assigned client-side so cross-references can be
+    # filled in before anything is written
+    print("Creating teachers...")
+    teachers = []
+    for _ in range(26):
+        teacher = create_teacher()
+        teacher["_id"] = ObjectId()
+        teachers.append(teacher)
+
+    print("Creating classes with assigned teachers...")
+    classes = []
+    class_names = set()
+    years = ["22", "23"]
+    for year in years:
+        for char in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            for num in range(1, 3):  # A1, A2, ..., Z1, Z2
+                class_name = f"{char}{num}"
+                teacher = teachers[len(classes) % len(teachers)]
+
+                # Same de-duplication as the find_one check in populate_database
+                if class_name not in class_names:
+                    class_names.add(class_name)
+                    class_data = create_class(class_name, teacher["_id"])
+                    class_data["_id"] = ObjectId()
+                    classes.append((class_data, teacher, year))
+                    teacher["classes"].append(class_data["_id"])
+
+    print("Creating students and assigning them to classes...")
+    students = []
+    events = []
+    for class_data, teacher, year in classes:
+        for _ in range(60):
+            student = create_student(class_data["_id"], year)
+            student["_id"] = ObjectId()
+
+            # Create an event for the student
+            event_name = faker.unique.catch_phrase()
+            category = random.choice(["Hackathon", "Ideathon", "Coding", "Global-Certificates", "Workshop", "Conference", "Others"])
+
+            # Teacher's decision for the event
+            status = random.choices(["Approved", "Rejected", "Pending"], weights=[40, 30, 30], k=1)[0]
+            approved_by = teacher["_id"] if status != "Pending" else None
+
+            event = create_event(event_name, student["_id"], category, approved_by, status)
+            event["_id"] = ObjectId()
+
+            student["eventsParticipated"].append(event["_id"])
+
+            # Add points for approved or participated events
+            if status in ["Approved", "Pending"]:
+                student["totalPoints"] += event["pointsEarned"]
+
+            class_data["students"].append(student["_id"])
+            students.append(student)
+            events.append(event)
+
+    hash_passwords(teachers + students, workers, rounds=bcrypt_rounds)
+
+    print("Writing documents...")
+    insert_in_batches(teachers_col, teachers, batch_size, ordered)
+    insert_in_batches(classes_col, [class_data for class_data, _, _ in classes], batch_size, ordered)
+    insert_in_batches(students_col, students, batch_size, ordered)
+    insert_in_batches(events_col, events, batch_size, ordered)
+
+    print("Database populated successfully!")
+
 # Run the script
 if __name__ == "__main__":
-    populate_database()
+    parser = argparse.ArgumentParser(description="Populate the leaderboard database with fake data")
+    parser.add_argument("--batched", action="store_true",
+                        help="build all documents in memory and write them with insert_many batches")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"documents per insert_many call in batched mode (default: {BATCH_SIZE})")
+    parser.add_argument("--ordered", action="store_true", default=ORDERED_WRITES,
+                        help="use ordered inserts in batched mode (stops at the first error)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=BCRYPT_ROUNDS,
+                        help=f"bcrypt cost factor, 4-31; lower is faster (default: {BCRYPT_ROUNDS})")
+    parser.add_argument("--hash-workers", type=int, default=HASH_WORKERS,
+                        help=f"processes hashing passwords (default: {HASH_WORKERS}, the CPU count)")
+    parser.add_argument("--hash-cache", default=HASH_CACHE_PATH,
+                        help=f"file mapping raw passwords to hashes, reused across runs (default: {HASH_CACHE_PATH})")
+    parser.add_argument("--no-hash-cache", action="store_true", help="neither read nor write the hash cache")
+    parser.add_argument("--seed", type=int,
+                        help="seed Faker and random so reruns repeat the same passwords and hit the cache")
+    args = parser.parse_args()
+
+    if not 4 <= args.bcrypt_rounds <= 31:
+        parser.error("--bcrypt-rounds must be between 4 and 31")
+    bcrypt_rounds = args.bcrypt_rounds
+    if args.seed is not None:
+        Faker.seed(args.seed)
+        random.seed(args.seed)
+    cache_path = None if args.no_hash_cache else args.hash_cache
+    load_password_cache(cache_path)
+
+    try:
+        if args.batched:
+            populate_database_batched(args.batch_size, args.ordered, args.hash_workers)
+        else:
+            populate_database(args.hash_workers)
+    finally:
+        # Hashes made before a failed write are still good next time
+        save_password_cache(cache_path)
+
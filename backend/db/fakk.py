@@ -7,13 +7,23 @@ import datetime
 from bson import ObjectId
 import time
 from tqdm import tqdm
+import argparse
+import os
+import sys
+
+# The sink implementations live with main.py at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import bson_dump
+import sinks
 
 # Initialize faker
 fake = Faker('en_IN')
 
 # Connect to MongoDB
-client = MongoClient('mongodb://localhost:27017/')
-db = client['leaderboard_db']
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+client = MongoClient(MONGO_URI)
+db = client[DB_NAME]
 
 # Configuration
 PASSWORD = bcrypt.hashpw("password123".encode('utf-8'), bcrypt.gensalt()).decode()
@@ -405,12 +415,18 @@ def create_events(students, classes_data, faculty_data):
     
     return events
 
-def seed_database():
+def seed_database(sink_kind="mongo", dump_name=None, force=False):
     """Main function to seed the database"""
     start_time = time.time()
     
-    # Clear existing data
-    clear_database()
+    # Clear existing data, or start a fresh output directory
+    sink_spec = sinks.sink_spec(sink_kind, MONGO_URI, DB_NAME, dump_name)
+    if sink_kind == "mongo":
+        clear_database()
+    try:
+        sinks.prepare_sink(sink_spec, force)
+    except FileExistsError as e:
+        raise SystemExit(str(e))
     
     # Define years for BTech program
     years = [1, 2, 3, 4]
@@ -435,6 +451,8 @@ def seed_database():
     
     # Insert data into database
     print("Inserting data into database...")
+    generation_seconds = time.time() - start_time
+    sink = sinks.open_sink(sink_spec, "all")
     
     # Insert HODs
     all_teachers = list(hods.values())
@@ -450,7 +468,7 @@ def seed_database():
             all_teachers.extend(faculty[dept][year])
     
     # Insert teachers
-    db.teachers.insert_many(all_teachers)
+    sink.write("teachers", all_teachers)
     print(f"Inserted {len(all_teachers)} teachers")
     
     # Flatten classes
@@ -459,19 +477,23 @@ def seed_database():
         for year in years:
             all_classes.extend(classes[dept][year])
     
-    # Insert classes (fix: use dictionary-style access)
-    db['classes'].insert_many(all_classes)
+    # Insert classes
+    sink.write("classes", all_classes)
     print(f"Inserted {len(all_classes)} classes")
     
     # Insert students
-    db.students.insert_many(students)
+    sink.write("students", students)
     print(f"Inserted {len(students)} students")
     
     # Insert events
     if events:
-        db.events.insert_many(events)
+        sink.write("events", events)
         print(f"Inserted {len(events)} events")
     
+    sink.close()
+    sinks.finish_sink(sink_spec, ["teachers", "classes", "students", "events"], ["all"])
+    sinks.print_sink_report(sink_kind, sink.stats, generation_seconds)
+    
     # Print summary
     print("\nDatabase seeding completed!")
     print(f"- {len(all_teachers)} teachers created")
@@ -481,4 +503,14 @@ def seed_database():
     print(f"Total time: {time.time() - start_time:.2f} seconds")
 
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the leaderboard database with generated data")
+    parser.add_argument("--sink", choices=sinks.SINK_KINDS, default="mongo",
+                        help="where documents go: mongo (default), bson dump, jsonl files, or null")
+    parser.add_argument("--dump", metavar="NAME",
+                        help=f"output directory dbdump/NAME for the bson and jsonl sinks "
+                             f"(default: {bson_dump.default_dump_name(DB_NAME)})")
+    parser.add_argument("--force", action="store_true",
+                        help="replace a non-empty dump directory instead of refusing to write into it")
+    args = parser.parse_args()
+    
+    seed_database(args.sink, args.dump, args.force)
@@ -0,0 +1,70 @@
+import argparse
+import contextlib
+import io
+import time
+
+import main
+
+# Benchmark configuration
+CLASS_COUNTS = [10, 100, 1000, 5000]
+STUDENT_COUNTS = [1000, 2000, 4000]
+DEPARTMENT = 'CSE'
+YEAR = 1
+
+def build_fixture(class_count, student_count):
+    """Build one department/year with class_count classes and student_count students"""
+    main.apply_scale({
+        "departments": 1,
+        "classes_per_year": class_count,
+        "students_per_class": max(1, student_count // class_count),
+        "max_events": main.MAX_EVENTS_PER_STUDENT,
+    })
+    main.seed_rng(f"bench:{class_count}:{student_count}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        advisors = main.create_academic_advisors([DEPARTMENT], [YEAR])
+        faculty = main.create_faculty([DEPARTMENT], [YEAR], class_count)
+        classes = main.create_classes([DEPARTMENT], [YEAR], faculty, advisors, main.SECTIONS)
+        students = list(main.create_students([DEPARTMENT], [YEAR], classes))
+
+    # Spread the students over every class so lookups hit the whole class list
+    class_list = classes[DEPARTMENT][YEAR]
+    students = students[:student_count]
+    for i, student in enumerate(students):
+        student["class"] = class_list[i % class_count]["_id"]
+
+    return students, classes, faculty
+
+def time_create_events(class_count, student_count):
+    """Seconds, students and events from generating the fixture's events"""
+    students, classes, faculty = build_fixture(class_count, student_count)
+
+    event_count = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _, events in main.create_events(students, classes, faculty, progress=False):
+            event_count += len(events)
+    return time.perf_counter() - start, len(students), event_count
+
+def run_benchmark(class_counts, student_counts):
+    """Print create_events cost per student for every class/student count pair"""
+    print(f"{'classes':>8} {'students':>9} {'events':>8} {'seconds':>9} {'us/student':>11} {'events/s':>10}")
+    for class_count in class_counts:
+        for student_count in student_counts:
+            elapsed, generated, events = time_create_events(class_count, student_count)
+            print(f"{class_count:>8} {generated:>9} {events:>8} {elapsed:>9.3f} "
+                  f"{elapsed / generated * 1e6:>11.1f} {events / elapsed:>10,.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Show create_events time stays linear in students as the class count grows")
+    parser.add_argument("--classes", type=int, nargs="+", default=CLASS_COUNTS,
+                        help="classes per department/year to benchmark")
+    parser.add_argument("--students", type=int, nargs="+", default=STUDENT_COUNTS,
+                        help="student counts to benchmark")
+    args = parser.parse_args()
+
+    # Generated users draw from the seeder's password pool; hash it once, outside the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.PASSWORDS = main.build_passwords("bench", cache_path=None)
+    run_benchmark(args.classes, args.students)
@@ -0,0 +1,294 @@
+import argparse
+import json
+import math
+import random
+import re
+import time
+
+from pymongo import DESCENDING, MongoClient
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+
+# Benchmark configuration
+ITERATIONS = 50
+EXPLAIN_ITERATIONS = 3  # Requests replayed under explain to count documents examined
+PAGE_LIMIT = 10
+STUDENT_SAMPLE = 200  # Students sampled up front to build filters and rank lookups
+RANDOM_SEED = 2024
+
+# Projections used by leaderboard.service.js
+RANK_PROJECTION = {"_id": 1, "totalPoints": 1}
+PAGE_PROJECTION = {"name": 1, "registerNo": 1, "totalPoints": 1, "department": 1, "currentClass": 1}
+CONTEXT_PAGE_PROJECTION = {"name": 1, "registerNo": 1, "totalPoints": 1}
+
+class QueryRunner:
+    """Runs the service's queries, optionally explaining each one to total the work done"""
+
+    def __init__(self, students, explain=False):
+        self.students = students
+        self.explain = explain
+        self.docs_examined = 0
+        self.keys_examined = 0
+        self.queries = 0
+
+    def add_stats(self, stats):
+        self.docs_examined += stats.get("totalDocsExamined", 0)
+        self.keys_examined += stats.get("totalKeysExamined", 0)
+        self.queries += 1
+
+    def find(self, query, projection, sort=None, skip=0, limit=0):
+        cursor = self.students.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        if self.explain:
+            self.add_stats(cursor.explain().get("executionStats", {}))
+        return list(cursor)
+
+    def find_by_id(self, student_id):
+        return self.find({"_id": student_id}, None, limit=1)[0]
+
+    def count(self, query):
+        if self.explain:
+            explained = self.students.database.command(
+                "explain", {"count": self.students.name, "query": query}, verbosity="executionStats")
+            self.add_stats(explained.get("executionStats", {}))
+        return self.students.count_documents(query)
+
+def dense_ranks(students):
+    """Same dense ranking loop as the service: equal points share a rank"""
+    ranks = {}
+    current_rank = 0
+    previous_points = None
+    for student in students:
+        if student.get("totalPoints") != previous_points:
+            current_rank += 1
+            previous_points = student.get("totalPoints")
+        ranks[student["_id"]] = current_rank
+    return ranks
+
+def search_clause(search):
+    """The case-insensitive name/registerNo regex $or used for search.
+
+    The term is escaped, unlike in leaderboard.service.js, which passes it to $regex as typed: there a
+    term such as "a.b" or "(" matches differently or fails, here it always matches literally.
+    """
+    pattern = re.escape(search)
+    return [
+        {"name": {"$regex": pattern, "$options": "i"}},
+        {"registerNo": {"$regex": pattern, "$options": "i"}},
+    ]
+
+def get_leaderboard(runner, department=None, year=None, section=None, search=None, page=1,
+                    limit=PAGE_LIMIT):
+    """Replay leaderboard.service.js getLeaderboard"""
+    base_filter = {}
+    if department:
+        base_filter["department"] = department
+    if year:
+        base_filter["currentClass.year"] = year
+    if section:
+        base_filter["currentClass.section"] = section
+
+    # Every matching student, to build the dense rank map
+    ranks = dense_ranks(runner.find(base_filter, RANK_PROJECTION, [("totalPoints", DESCENDING)]))
+
+    search_filter = dict(base_filter)
+    if search:
+        search_filter["$or"] = search_clause(search)
+
+    page_students = runner.find(search_filter, PAGE_PROJECTION, [("totalPoints", DESCENDING)],
+                                skip=(page - 1) * limit, limit=limit)
+    total = runner.count(search_filter)
+    return [ranks.get(student["_id"]) for student in page_students], total
+
+def get_student_rank(runner, student_id):
+    """Replay leaderboard.service.js getStudentRank"""
+    student = runner.find_by_id(student_id)
+
+    overall = dense_ranks(runner.find({}, RANK_PROJECTION, [("totalPoints", DESCENDING)]))
+    context_filter = {
+        "currentClass.year": student.get("currentClass", {}).get("year"),
+        "department": student.get("department"),
+    }
+    context = dense_ranks(runner.find(context_filter, RANK_PROJECTION, [("totalPoints", DESCENDING)]))
+    return overall.get(student_id), context.get(student_id)
+
+def get_student_context_leaderboard(runner, student, search=None, page=1, limit=PAGE_LIMIT):
+    """Replay leaderboard.service.js getStudentContextLeaderboard"""
+    context_filter = {
+        "currentClass.year": student.get("currentClass", {}).get("year"),
+        "department": student.get("department"),
+    }
+    ranks = dense_ranks(runner.find(context_filter, RANK_PROJECTION, [("totalPoints", DESCENDING)]))
+
+    search_filter = dict(context_filter)
+    if search:
+        search_filter["$or"] = search_clause(search)
+
+    page_students = runner.find(search_filter, CONTEXT_PAGE_PROJECTION, [("totalPoints", DESCENDING)],
+                                skip=(page - 1) * limit, limit=limit)
+    total = runner.count(search_filter)
+    return [ranks.get(s["_id"]) for s in page_students], total
+
+def search_term(rng, student):
+    """A fragment of a sampled student's name or register number"""
+    if rng.random() < 0.5:
+        name = student.get("name", "") or "a"
+        start = rng.randrange(max(len(name) - 3, 1))
+        return name[start:start + 3]
+    register_no = student.get("registerNo", "") or "0"
+    return register_no[-4:]
+
+def deep_page(total, limit=PAGE_LIMIT):
+    """A page near the end of the result set, where skip is most expensive"""
+    return max(1, (total + limit - 1) // limit - 1)
+
+def build_scenarios(students, rng):
+    """Scenario name -> callable(runner) covering the filter mixes and page depths"""
+    sample = list(students.aggregate([
+        {"$sample": {"size": STUDENT_SAMPLE}},
+        {"$project": {"name": 1, "registerNo": 1, "department": 1, "currentClass": 1}},
+    ]))
+    if not sample:
+        raise SystemExit("No students found; seed the database first (python main.py)")
+    total_students = students.estimated_document_count()
+
+    # Deep-page offsets need the filter's size; counting it up front keeps that query out of the timings
+    dept_year_totals = {
+        (row["_id"].get("department"), row["_id"].get("year")): row["count"]
+        for row in students.aggregate([
+            {"$group": {"_id": {"department": "$department", "year": "$currentClass.year"},
+                        "count": {"$sum": 1}}},
+        ])
+    }
+
+    def pick():
+        return rng.choice(sample)
+
+    def context(student):
+        current = student.get("currentClass", {})
+        return student.get("department"), current.get("year"), current.get("section")
+
+    def dept_year_deep(runner):
+        dept, year, _ = context(pick())
+        return get_leaderboard(runner, dept, year, page=deep_page(dept_year_totals.get((dept, year), 0)))
+
+    return {
+        "leaderboard:all": lambda runner: get_leaderboard(runner),
+        "leaderboard:department": lambda runner: get_leaderboard(runner, context(pick())[0]),
+        "leaderboard:dept-year": lambda runner: get_leaderboard(runner, *context(pick())[:2]),
+        "leaderboard:dept-year-section": lambda runner: get_leaderboard(runner, *context(pick())),
+        "leaderboard:search": lambda runner: get_leaderboard(runner, search=search_term(rng, pick())),
+        "leaderboard:dept-search": lambda runner: get_leaderboard(
+            runner, context(pick())[0], search=search_term(rng, pick())),
+        "leaderboard:all-deep-page": lambda runner: get_leaderboard(runner, page=deep_page(total_students)),
+        "leaderboard:dept-year-deep-page": dept_year_deep,
+        "rank:student": lambda runner: get_student_rank(runner, pick()["_id"]),
+        "context:page-1": lambda runner: get_student_context_leaderboard(runner, pick()),
+        "context:search": lambda runner: get_student_context_leaderboard(
+            runner, pick(), search=search_term(rng, pick())),
+    }
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list: the ceil(fraction * n)-th smallest value"""
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+def run_scenario(students, scenario, iterations, explain_iterations):
+    """Time a scenario, then replay it under explain to average the documents it examines"""
+    latencies = []
+    for _ in range(iterations):
+        runner = QueryRunner(students)
+        start = time.perf_counter()
+        scenario(runner)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    explained = QueryRunner(students, explain=True)
+    for _ in range(explain_iterations):
+        scenario(explained)
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1],
+        "queries_per_request": explained.queries / max(explain_iterations, 1),
+        "docs_examined": explained.docs_examined / max(explain_iterations, 1),
+        "keys_examined": explained.keys_examined / max(explain_iterations, 1),
+    }
+
+def run_suite(db, iterations=ITERATIONS, explain_iterations=EXPLAIN_ITERATIONS, only=None):
+    """Run every scenario against the current database"""
+    students = db[STUDENT_COLLECTION]
+    rng = random.Random(RANDOM_SEED)
+    results = {}
+    for name, scenario in build_scenarios(students, rng).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = run_scenario(students, scenario, iterations, explain_iterations)
+    return {"students": students.estimated_document_count(), "scenarios": results}
+
+def print_results(label, suite):
+    """Print one line per scenario"""
+    print(f"\n{label}: {suite['students']:,} students")
+    print(f"{'scenario':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} "
+          f"{'docs exam.':>11} {'keys exam.':>11}")
+    for name, r in suite["scenarios"].items():
+        print(f"{name:<34} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['queries_per_request']:>8.1f} {r['docs_examined']:>11,.0f} {r['keys_examined']:>11,.0f}")
+
+def seed_scale(uri, db_name, scale_factor, workers):
+    """Reseed the benchmark database at a scale factor with main.py"""
+    import main
+
+    main.MONGO_URI = uri
+    main.DB_NAME = db_name
+    main.client = MongoClient(uri)
+    main.db = main.client[db_name]
+    main.seed_database(workers=workers, seed=RANDOM_SEED, scale_factor=scale_factor)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay leaderboard.service.js query sequences and report latency percentiles")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--scale-factors", nargs="+", metavar="SF",
+                        help="reseed with main.py at each scale factor before benchmarking it; "
+                             "without this the existing data is used")
+    parser.add_argument("--workers", type=int, default=1, help="seeding workers for --scale-factors")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS,
+                        help=f"timed requests per scenario (default: {ITERATIONS})")
+    parser.add_argument("--explain-iterations", type=int, default=EXPLAIN_ITERATIONS,
+                        help=f"requests per scenario replayed under explain (default: {EXPLAIN_ITERATIONS})")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="run scenarios starting with PREFIX")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+    if args.scale_factors:
+        import main
+        for scale_factor in args.scale_factors:
+            try:
+                main.resolve_scale(scale_factor)
+            except ValueError as e:
+                parser.error(str(e))
+
+    db = MongoClient(args.uri)[args.db]
+    report = {}
+    for scale_factor in args.scale_factors or [None]:
+        if scale_factor is not None:
+            seed_scale(args.uri, args.db, scale_factor, args.workers)
+        label = f"scale {scale_factor}" if scale_factor else args.db
+        report[label] = run_suite(db, args.iterations, args.explain_iterations, args.only)
+        print_results(label, report[label])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
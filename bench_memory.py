@@ -0,0 +1,82 @@
+import argparse
+import contextlib
+import gc
+import io
+import tracemalloc
+
+import main
+import records
+
+# Benchmark configuration
+STUDENT_COUNTS = [1000, 5000]
+CLASS_COUNT = 20
+DEPARTMENT = 'CSE'
+YEAR = 1
+
+def build_classes(student_count):
+    """One department/year whose classes hold student_count students"""
+    main.apply_scale({
+        "departments": 1,
+        "classes_per_year": CLASS_COUNT,
+        "students_per_class": max(1, student_count // CLASS_COUNT),
+        "max_events": main.MAX_EVENTS_PER_STUDENT,
+    })
+    main.seed_rng(f"memory:{student_count}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        advisors = main.create_academic_advisors([DEPARTMENT], [YEAR])
+        faculty = main.create_faculty([DEPARTMENT], [YEAR], CLASS_COUNT)
+        classes = main.create_classes([DEPARTMENT], [YEAR], faculty, advisors, main.SECTIONS)
+    return classes, faculty
+
+def measure(student_count, as_dicts):
+    """Bytes held per student and per event while a shard's documents are buffered"""
+    classes, faculty = build_classes(student_count)
+    students = []
+    events = []
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        generated = main.create_events(main.create_students([DEPARTMENT], [YEAR], classes), classes, faculty,
+                                       progress=False)
+        for student, student_events in generated:
+            # The dict form is what generation buffered before records; convert as soon as each is final
+            if as_dicts:
+                student = student.to_document()
+                student_events = records.to_documents(student_events)
+            students.append(student)
+            events.extend(student_events)
+        # The last loop values would keep their sample batch alive
+        del generated, student, student_events
+
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    event_count = len(events)
+    events = None
+    gc.collect()
+    without_events = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return ((without_events - baseline) / len(students), (held - without_events) / max(event_count, 1),
+            len(students), event_count)
+
+def run_benchmark(student_counts):
+    """Print buffered bytes per student and per event as dicts and as records"""
+    print(f"{'students':>9} {'events':>8} {'form':>7} {'B/student':>10} {'B/event':>8}")
+    for student_count in student_counts:
+        for form, as_dicts in (("dict", True), ("record", False)):
+            per_student, per_event, students, events = measure(student_count, as_dicts)
+            print(f"{students:>9} {events:>8} {form:>7} {per_student:>10,.0f} {per_event:>8,.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the memory generated students and events hold as dicts and as records")
+    parser.add_argument("--students", type=int, nargs="+", default=STUDENT_COUNTS,
+                        help="student counts to benchmark")
+    args = parser.parse_args()
+
+    # Generated users draw from the seeder's password pool; hash it once, outside the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.PASSWORDS = main.build_passwords("bench", cache_path=None)
+    run_benchmark(args.students)
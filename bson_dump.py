@@ -0,0 +1,153 @@
+import os
+import shutil
+import uuid
+
+import bson
+from bson import json_util
+
+# mongodump-style output lives next to the existing snapshots
+DUMP_ROOT = 'dbdump'
+PARTS_DIR = '.parts'
+DEFAULT_DUMP_SUFFIX = '_seed'  # Generated dumps stay clear of the committed dbdump/<db> snapshots
+
+# Same Extended JSON flavour mongodump uses for *.metadata.json
+METADATA_JSON_OPTIONS = json_util.CANONICAL_JSON_OPTIONS
+
+def dump_path(name):
+    """Directory holding the dump of database `name`"""
+    return os.path.join(DUMP_ROOT, name)
+
+def default_dump_name(db_name):
+    """Dump directory name used when none is given"""
+    return f"{db_name}{DEFAULT_DUMP_SUFFIX}"
+
+def prepare_dump(path, force=False):
+    """Create an empty dump directory; an existing non-empty one is only replaced when forced
+
+    Writing into an old dump would leave its other collections next to the new ones.
+    """
+    if os.path.isdir(path) and any(name != PARTS_DIR for name in os.listdir(path)):
+        if not force:
+            raise FileExistsError(f"Dump directory {path} is not empty; pick another name or pass --force")
+        shutil.rmtree(path)
+    os.makedirs(path, exist_ok=True)
+    shutil.rmtree(os.path.join(path, PARTS_DIR), ignore_errors=True)
+    os.makedirs(os.path.join(path, PARTS_DIR))
+
+def part_path(path, collection, part, extension="bson"):
+    """File one writer appends its share of a collection to"""
+    return os.path.join(path, PARTS_DIR, f"{collection}.{part}.{extension}")
+
+def append_documents(file, docs):
+    """Append documents to an open BSON file; a .bson dump is just concatenated documents"""
+    data = b"".join(bson.encode(doc) for doc in docs)
+    file.write(data)
+    return len(data)
+
+def read_documents(path, start=0, end=None, codec_options=None):
+    """Stream the documents of a .bson file, or only those starting in [start, end)"""
+    if end is not None and start >= end:
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        for doc in bson.decode_file_iter(f, codec_options or bson.DEFAULT_CODEC_OPTIONS):
+            yield doc
+            if end is not None and f.tell() >= end:
+                return
+
+def split_offsets(path, parts):
+    """(start, end) byte ranges on document boundaries dividing a .bson file into about `parts` pieces"""
+    size = os.path.getsize(path)
+    target = size / parts
+    bounds = [0]
+    with open(path, "rb") as f:
+        # Hop from length prefix to length prefix; nothing is decoded
+        position = 0
+        while position < size:
+            f.seek(position)
+            position += int.from_bytes(f.read(4), "little")
+            if position - bounds[-1] >= target and position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def read_cstring(f):
+    name = bytearray()
+    while True:
+        byte = f.read(1)
+        if byte in (b"", b"\x00"):
+            return name.decode()
+        name += byte
+
+def backup_collections(path):
+    """(collection, start, end) of every array in a single-document backup like backend/backup/backup.bson.
+
+    Such a file is one {collection: [documents]} document, what restoreUtil.js deserializes in
+    one go; only the array headers are read here.
+    """
+    ranges = []
+    with open(path, "rb") as f:
+        f.read(4)
+        while True:
+            kind = f.read(1)
+            if kind in (b"", b"\x00"):
+                return ranges
+            name = read_cstring(f)
+            if kind != b"\x04":
+                raise ValueError(f"{path}: '{name}' is not an array of documents")
+            length = int.from_bytes(f.read(4), "little")
+            start = f.tell()
+            # Elements run up to the array's closing null byte
+            ranges.append((name, start, start + length - 5))
+            f.seek(start + length - 4)
+
+def read_array_documents(path, start, end, codec_options=None):
+    """Stream the documents of one backup_collections array, one element at a time"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            kind = f.read(1)
+            index = read_cstring(f)
+            if kind != b"\x03":
+                raise ValueError(f"{path}: element {index} at {f.tell()} is not a document")
+            prefix = f.read(4)
+            data = prefix + f.read(int.from_bytes(prefix, "little") - 4)
+            yield bson.decode(data, codec_options or bson.DEFAULT_CODEC_OPTIONS)
+
+def write_metadata(path, collection, indexes=None, seed=None):
+    """Write <collection>.metadata.json as mongodump does; mongorestore builds the listed indexes.
+
+    A seed derives the collection UUID from it, so seeded dumps are byte-identical.
+    """
+    collection_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"{seed}:{collection}") if seed is not None else uuid.uuid4()
+    metadata = {
+        "indexes": indexes or [{"v": 2, "key": {"_id": 1}, "name": "_id_"}],
+        "uuid": collection_uuid.hex,
+        "collectionName": collection,
+        "type": "collection",
+    }
+    with open(os.path.join(path, f"{collection}.metadata.json"), "w") as f:
+        f.write(json_util.dumps(metadata, json_options=METADATA_JSON_OPTIONS))
+
+def merge_parts(path, collections, parts, extension):
+    """Concatenate each collection's parts in order into <collection>.<extension>"""
+    sizes = {}
+    for collection in collections:
+        target = os.path.join(path, f"{collection}.{extension}")
+        with open(target, "wb") as out:
+            for part in parts:
+                source = part_path(path, collection, part, extension)
+                if os.path.exists(source):
+                    with open(source, "rb") as f:
+                        shutil.copyfileobj(f, out, 1024 * 1024)
+        sizes[collection] = os.path.getsize(target)
+
+    shutil.rmtree(os.path.join(path, PARTS_DIR))
+    return sizes
+
+def finish_dump(path, collections, parts, indexes=None, seed=None):
+    """Merge each collection's parts into <collection>.bson and write its metadata"""
+    sizes = merge_parts(path, collections, parts, "bson")
+    for collection in collections:
+        write_metadata(path, collection, (indexes or {}).get(collection), seed)
+    return sizes
@@ -0,0 +1,206 @@
+import argparse
+import time
+
+import numpy as np
+from bson import ObjectId
+from pymongo import MongoClient
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+CHUNK_DOCS = 100000  # Documents whose ids are packed into arrays at a time
+SAMPLES = 5  # Offending links printed per check
+
+# Every reference as (name, collection, field path, target collection); paths walk into arrays
+LINKS = [
+    ("students.class", "students", "class", "classes"),
+    ("students.currentClass.ref", "students", "currentClass.ref", "classes"),
+    ("students.classHistory.classRef", "students", "classHistory.classRef", "classes"),
+    ("students.eventsParticipated", "students", "eventsParticipated", "events"),
+    ("classes.students", "classes", "students", "students"),
+    ("classes.assignedFaculty", "classes", "assignedFaculty", "teachers"),
+    ("classes.facultyAssigned", "classes", "facultyAssigned", "teachers"),
+    ("classes.academicAdvisors", "classes", "academicAdvisors", "teachers"),
+    ("teachers.classes", "teachers", "classes", "classes"),
+    ("events.submittedBy", "events", "submittedBy", "students"),
+    ("events.approvedBy", "events", "approvedBy", "teachers"),
+]
+
+# Links the seeders maintain from both ends: every forward link needs a matching backward one
+PAIRS = [
+    ("class.students <-> student.class", ["classes.students"], ["students.class"]),
+    ("teacher.classes <-> class.assignedFaculty/facultyAssigned/academicAdvisors", ["teachers.classes"],
+     ["classes.assignedFaculty", "classes.facultyAssigned", "classes.academicAdvisors"]),
+    ("event.submittedBy <-> student.eventsParticipated", ["events.submittedBy"], ["students.eventsParticipated"]),
+]
+
+# Collections fakk.py writes under singular names, which the backend never reads
+STRAY_COLLECTIONS = {"teacher": "teachers", "student": "students"}
+
+def field_values(doc, path):
+    """Every value at a dotted path, stepping through arrays like a MongoDB query does"""
+    values = [doc]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(item.get(part) for item in value if isinstance(item, dict))
+            elif isinstance(value, dict):
+                found.append(value.get(part))
+        values = found
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(value)
+        elif value is not None:
+            flat.append(value)
+    return flat
+
+def as_oid(value):
+    """Numpy S12 stores ObjectId bytes with trailing zero bytes stripped; put them back"""
+    return ObjectId(bytes(value).ljust(12, b"\0"))
+
+def split_pairs(pairs):
+    """S24 (source + target) array -> S12 source and target arrays, without leaving NumPy"""
+    raw = pairs.view(np.uint8).reshape(-1, 24)
+    return raw[:, :12].copy().view("S12").ravel(), raw[:, 12:].copy().view("S12").ravel()
+
+def join_pairs(first, second):
+    """Two S12 arrays -> one S24 array; np.char.add would drop trailing zero bytes"""
+    return np.hstack([first.view(np.uint8).reshape(-1, 12),
+                      second.view(np.uint8).reshape(-1, 12)]).view("S24").ravel()
+
+class Collector:
+    """Packs _ids and link endpoints into fixed-width byte arrays as a collection streams past"""
+
+    def __init__(self):
+        self.chunks = {}
+        self.pending = {}
+
+    def add(self, key, value):
+        pending = self.pending.setdefault(key, [])
+        pending.append(value)
+        if len(pending) >= CHUNK_DOCS:
+            self.flush(key)
+
+    def flush(self, key):
+        pending = self.pending.pop(key, [])
+        if pending:
+            width = len(pending[0])
+            self.chunks.setdefault(key, []).append(np.array(pending, dtype=f"S{width}"))
+
+    def array(self, key, width):
+        self.flush(key)
+        chunks = self.chunks.pop(key, [])
+        return np.concatenate(chunks) if chunks else np.array([], dtype=f"S{width}")
+
+def scan_collection(db, collection, links, collector):
+    """Stream one collection, collecting its _ids and (source, target) bytes for each of its links"""
+    projection = {path: 1 for _, _, path, _ in links}
+    documents = 0
+    malformed = {name: 0 for name, _, _, _ in links}
+    for doc in db[collection].find({}, projection, batch_size=10000):
+        documents += 1
+        source = doc["_id"].binary if isinstance(doc["_id"], ObjectId) else None
+        if source is None:
+            continue
+        collector.add(("ids", collection), source)
+        for name, _, path, _ in links:
+            for value in field_values(doc, path):
+                if isinstance(value, ObjectId):
+                    collector.add(("links", name), source + value.binary)
+                else:
+                    malformed[name] += 1
+    return documents, malformed
+
+def check_references(db):
+    """Stream each collection once, then check every link for dangling targets and every pair for asymmetry"""
+    collector = Collector()
+    counts = {}
+    malformed = {}
+    timings = {}
+    collections = sorted({link[1] for link in LINKS} | {link[3] for link in LINKS})
+    for collection in collections:
+        start = time.perf_counter()
+        links = [link for link in LINKS if link[1] == collection]
+        counts[collection], found = scan_collection(db, collection, links, collector)
+        malformed.update(found)
+        timings[collection] = time.perf_counter() - start
+
+    ids = {collection: np.unique(collector.array(("ids", collection), 12)) for collection in collections}
+    edges = {}
+    results = {"documents": counts, "timings": timings, "links": [], "pairs": [], "stray": []}
+
+    # Dangling: the target id is not in the target collection
+    for name, collection, _, target in LINKS:
+        pairs = collector.array(("links", name), 24)
+        sources, targets = split_pairs(pairs)
+        present = np.isin(targets, ids[target])
+        dangling = np.flatnonzero(~present)
+        results["links"].append({
+            "name": name, "target": target, "references": len(pairs), "dangling": len(dangling),
+            "malformed": malformed[name],
+            "samples": [(as_oid(sources[i]), as_oid(targets[i])) for i in dangling[:SAMPLES]],
+        })
+        # Pairs only compare links whose both ends exist, so dangling ones are not reported twice
+        edges[name] = (sources[present], targets[present])
+
+    # Asymmetric: a link one side lists that the other side does not list back
+    for description, forward_names, backward_names in PAIRS:
+        forward = np.unique(np.concatenate([join_pairs(*edges[name]) for name in forward_names]))
+        backward = np.unique(np.concatenate([join_pairs(edges[name][1], edges[name][0])
+                                             for name in backward_names]))
+        forward_only = forward[~np.isin(forward, backward)]
+        backward_only = backward[~np.isin(backward, forward)]
+        samples = np.concatenate([forward_only[:SAMPLES], backward_only[:SAMPLES]])
+        results["pairs"].append({
+            "name": description, "forward": forward_names[0], "backward": " / ".join(backward_names),
+            "forward_only": len(forward_only), "backward_only": len(backward_only),
+            "samples": [(as_oid(source), as_oid(target)) for source, target in zip(*split_pairs(samples))],
+        })
+
+    existing = set(db.list_collection_names())
+    for stray, expected in STRAY_COLLECTIONS.items():
+        if stray in existing and db[stray].estimated_document_count():
+            results["stray"].append((stray, expected, db[stray].estimated_document_count()))
+    return results
+
+def print_results(results):
+    """Report per collection, per link and per pair; returns the number of problems found"""
+    for collection, documents in results["documents"].items():
+        print(f"Scanned {collection}: {documents:,} documents in {results['timings'][collection]:.2f}s")
+
+    problems = 0
+    print(f"\n{'link':<32} {'target':<10} {'references':>11} {'dangling':>9} {'malformed':>10}")
+    for link in results["links"]:
+        print(f"{link['name']:<32} {link['target']:<10} {link['references']:>11,} {link['dangling']:>9,} "
+              f"{link['malformed']:>10,}")
+        for source, target in link["samples"]:
+            print(f"  {source} -> missing {target}")
+        problems += link["dangling"] + link["malformed"]
+
+    print()
+    for pair in results["pairs"]:
+        print(f"{pair['name']}: {pair['forward_only']:,} in {pair['forward']} only, "
+              f"{pair['backward_only']:,} in {pair['backward']} only")
+        for source, target in pair["samples"]:
+            print(f"  {source} -> {target} not listed back")
+        problems += pair["forward_only"] + pair["backward_only"]
+
+    for stray, expected, documents in results["stray"]:
+        print(f"Collection '{stray}' holds {documents:,} documents the backend never reads (it uses '{expected}')")
+        problems += 1
+    print(f"\n{problems:,} problems found")
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check references between students, classes, teachers and events without $lookup")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    problems = print_results(check_references(db))
+    raise SystemExit(1 if problems else 0)
@@ -0,0 +1,245 @@
+import argparse
+import heapq
+import itertools
+import os
+import tempfile
+import time
+from operator import itemgetter
+
+import bson
+from bson import json_util
+from pymongo import DeleteOne, MongoClient, ReplaceOne, UpdateOne
+
+import load_dump
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+RUN_DOCS = 100000  # Documents sorted in memory before a run is spilled to disk
+BATCH_SIZE = 1000  # Operations per bulk_write when applying
+KEY_MODES = ['id', 'natural']
+
+def document_key(collection, doc, key_mode):
+    """Fields two snapshots' documents are matched on: _id, or restoreUtil's natural key"""
+    if key_mode == "natural":
+        return load_dump.unique_criteria(collection, doc)
+    return {"_id": doc["_id"]}
+
+def sort_key(criteria):
+    """Byte string equal exactly when the key values are; only consistency matters, not meaning"""
+    return bson.encode(criteria)
+
+def write_run(path, records):
+    """Spill sorted (key, raw document) pairs: key length, key bytes, then the BSON document"""
+    with open(path, "wb") as f:
+        for key, raw in records:
+            f.write(len(key).to_bytes(4, "little"))
+            f.write(key)
+            f.write(raw)
+
+def spill(workdir, records):
+    """Write one sorted run to a new file in workdir; returns its path"""
+    handle, path = tempfile.mkstemp(suffix=".run", dir=workdir)
+    os.close(handle)
+    write_run(path, records)
+    return path
+
+def read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(4)
+            if not prefix:
+                return
+            key = f.read(int.from_bytes(prefix, "little"))
+            length = f.read(4)
+            yield key, length + f.read(int.from_bytes(length, "little") - 4)
+
+def sorted_documents(source, collection, key_mode, workdir, run_docs=RUN_DOCS, counts=None):
+    """(key, raw BSON) pairs of one collection in key order.
+
+    Documents are sorted run_docs at a time; when there is more than one run they are spilled
+    to workdir and merged, so memory stays bounded whatever the dump size.
+    """
+    records = []
+    runs = []
+    docs = load_dump.task_documents(source, load_dump.RAW_OPTIONS) if source else []
+    for doc in docs:
+        records.append((sort_key(document_key(collection, doc, key_mode)), doc.raw))
+        if counts is not None:
+            counts["docs"] += 1
+        if len(records) >= run_docs:
+            records.sort(key=itemgetter(0))
+            runs.append(spill(workdir, records))
+            records = []
+
+    records.sort(key=itemgetter(0))
+    if not runs:
+        return iter(records)
+    if records:
+        runs.append(spill(workdir, records))
+    return heapq.merge(*(read_run(path) for path in runs), key=itemgetter(0))
+
+def encoded(value):
+    """Exact BSON form of a value, so 1 and 1.0 or a reordered subdocument count as changes"""
+    return bson.encode({"v": value})
+
+def document_changes(collection, old_raw, new_raw, key_mode):
+    """Operations turning one stored document into another; none when they are identical"""
+    if old_raw == new_raw:
+        return []
+    old = bson.decode(old_raw)
+    new = bson.decode(new_raw)
+
+    # _id is immutable, so a natural key that moved to another _id is a replacement
+    if old["_id"] != new["_id"]:
+        return [removal(collection, old, key_mode), ("insert", new)]
+
+    update = {}
+    changed = {field: value for field, value in new.items()
+               if field != "_id" and (field not in old or encoded(old[field]) != encoded(value))}
+    removed = {field: "" for field in old if field not in new}
+    if changed:
+        update["$set"] = changed
+    if removed:
+        update["$unset"] = removed
+    return [("update", {"_id": old["_id"]}, update)] if update else []
+
+def removal(collection, doc, key_mode):
+    """Delete guarded by the old key too, so it is a no-op once its _id was reused under a new key"""
+    criteria = dict(document_key(collection, doc, key_mode))
+    criteria["_id"] = doc["_id"]
+    return ("delete", criteria)
+
+def grouped(pairs):
+    """(key, [raw documents]) for runs of equal keys; natural keys are not always unique"""
+    for key, items in itertools.groupby(pairs, key=itemgetter(0)):
+        yield key, [raw for _, raw in items]
+
+def diff_collection(collection, old_pairs, new_pairs, key_mode, counts):
+    """Merge-join two key-ordered streams, yielding the operations that turn old into new"""
+    old_groups = grouped(old_pairs)
+    new_groups = grouped(new_pairs)
+    old = next(old_groups, None)
+    new = next(new_groups, None)
+
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            old_docs, new_docs = old[1], []
+            old = next(old_groups, None)
+        elif old is None or new[0] < old[0]:
+            old_docs, new_docs = [], new[1]
+            new = next(new_groups, None)
+        else:
+            old_docs, new_docs = old[1], new[1]
+            old = next(old_groups, None)
+            new = next(new_groups, None)
+
+        # Pair documents sharing a key in dump order; the leftovers are deletes or inserts
+        for old_raw, new_raw in zip(old_docs, new_docs):
+            operations = document_changes(collection, old_raw, new_raw, key_mode)
+            counts["unchanged"] += not operations
+            yield from operations
+        for old_raw in old_docs[len(new_docs):]:
+            yield removal(collection, bson.decode(old_raw), key_mode)
+        for new_raw in new_docs[len(old_docs):]:
+            yield ("insert", bson.decode(new_raw))
+
+def write_operation(operation):
+    """pymongo request for a diff operation; inserts upsert so a reused _id is replaced in place"""
+    kind = operation[0]
+    if kind == "insert":
+        return ReplaceOne({"_id": operation[1]["_id"]}, operation[1], upsert=True)
+    if kind == "update":
+        return UpdateOne(operation[1], operation[2])
+    return DeleteOne(operation[1])
+
+def operation_record(collection, operation):
+    """One line of the --output file"""
+    kind = operation[0]
+    if kind == "insert":
+        record = {"collection": collection, "op": kind, "document": operation[1]}
+    elif kind == "update":
+        record = {"collection": collection, "op": kind, "filter": operation[1], "update": operation[2]}
+    else:
+        record = {"collection": collection, "op": kind, "filter": operation[1]}
+    return json_util.dumps(record, json_options=json_util.RELAXED_JSON_OPTIONS)
+
+def collection_sources(path, collections=None):
+    """collection -> whole-collection read task for a dump directory or backup document"""
+    return {task["collection"]: task for task in load_dump.dump_tasks(path, 1, collections)}
+
+def diff_dumps(old_path, new_path, key_mode="id", collections=None, run_docs=RUN_DOCS, output=None,
+               db=None, batch_size=BATCH_SIZE):
+    """Diff every collection of two dumps; writes operations to output and applies them to db when given"""
+    old_sources = collection_sources(old_path, collections)
+    new_sources = collection_sources(new_path, collections)
+    summary = {}
+    out = open(output, "w") if output else None
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="diff_dumps.") as workdir:
+            for collection in sorted(set(old_sources) | set(new_sources)):
+                start = time.perf_counter()
+                counts = {"old": {"docs": 0}, "new": {"docs": 0}, "unchanged": 0,
+                          "insert": 0, "update": 0, "delete": 0}
+                old_pairs = sorted_documents(old_sources.get(collection), collection, key_mode, workdir,
+                                             run_docs, counts["old"])
+                new_pairs = sorted_documents(new_sources.get(collection), collection, key_mode, workdir,
+                                             run_docs, counts["new"])
+
+                batch = []
+                for operation in diff_collection(collection, old_pairs, new_pairs, key_mode, counts):
+                    counts[operation[0]] += 1
+                    if out is not None:
+                        out.write(operation_record(collection, operation) + "\n")
+                    if db is not None:
+                        batch.append(write_operation(operation))
+                        if len(batch) >= batch_size:
+                            db[collection].bulk_write(batch, ordered=True)
+                            batch = []
+                if batch:
+                    db[collection].bulk_write(batch, ordered=True)
+
+                counts["seconds"] = time.perf_counter() - start
+                summary[collection] = counts
+    finally:
+        if out is not None:
+            out.close()
+    return summary
+
+def print_summary(summary, applied):
+    print(f"\n{'collection':<22} {'old':>8} {'new':>8} {'same':>8} {'insert':>7} {'update':>7} {'delete':>7} "
+          f"{'seconds':>8}")
+    for collection, counts in summary.items():
+        print(f"{collection:<22} {counts['old']['docs']:>8,} {counts['new']['docs']:>8,} "
+              f"{counts['unchanged']:>8,} {counts['insert']:>7,} {counts['update']:>7,} {counts['delete']:>7,} "
+              f"{counts['seconds']:>8.2f}")
+    total = sum(counts["insert"] + counts["update"] + counts["delete"] for counts in summary.values())
+    print(f"{total:,} operations {'applied' if applied else 'needed'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Diff two BSON dumps and emit (or apply) the inserts, updates and deletes between them")
+    parser.add_argument("old", help="dump the database currently matches, e.g. dbdump/leaderboard_db")
+    parser.add_argument("new", help="dump to migrate to, e.g. dbdump/leaderboard_db_updated/leaderboard_db")
+    parser.add_argument("--key", choices=KEY_MODES, default="id",
+                        help="match documents by _id, or by the natural keys restoreUtil.js uses (default: id)")
+    parser.add_argument("--collection", action="append", help="diff only this collection; repeat for several")
+    parser.add_argument("--run-docs", type=int, default=RUN_DOCS,
+                        help=f"documents sorted in memory per spilled run (default: {RUN_DOCS})")
+    parser.add_argument("--output", metavar="PATH", help="write the operations as Extended JSON lines")
+    parser.add_argument("--apply", action="store_true", help="apply the operations to --uri/--db")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"operations per bulk write when applying (default: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not os.path.exists(path):
+            parser.error(f"{path} does not exist")
+    db = MongoClient(args.uri)[args.db] if args.apply else None
+    summary = diff_dumps(args.old, args.new, args.key, args.collection, args.run_docs, args.output, db,
+                         args.batch_size)
+    print_summary(summary, args.apply)
@@ -0,0 +1,234 @@
+import argparse
+import time
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient, UpdateOne
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+
+# Materialized ranks: one document per student, keyed by the student's _id
+RANK_COLLECTION = 'leaderboard_ranks'
+STATE_COLLECTION = 'leaderboard_rank_state'
+STATE_ID = 'ranks'
+BATCH_SIZE = 1000
+
+STUDENT_PROJECTION = {"_id": 1, "totalPoints": 1, "department": 1, "currentClass.year": 1,
+                      "currentClass.section": 1}
+
+# Rank field -> partition key, mirroring leaderboard.service.js: overall, department and
+# the (department, year) context getStudentRank/getStudentContextLeaderboard use
+PARTITIONS = {
+    "overallRank": lambda doc: "all",
+    "departmentRank": lambda doc: doc.get("department"),
+    "contextRank": lambda doc: (doc.get("department"), doc.get("year")),
+}
+
+# Indexes that turn rank lookups and ranked pages into single indexed reads
+RANK_INDEXES = [
+    IndexModel([("overallRank", ASCENDING)]),
+    IndexModel([("department", ASCENDING), ("departmentRank", ASCENDING)]),
+    IndexModel([("department", ASCENDING), ("year", ASCENDING), ("contextRank", ASCENDING)]),
+]
+
+def rank_document(student):
+    """Partition fields copied from a student onto its rank document"""
+    current = student.get("currentClass") or {}
+    return {
+        "_id": student["_id"],
+        "totalPoints": student.get("totalPoints"),
+        "department": student.get("department"),
+        "year": current.get("year"),
+        "section": current.get("section"),
+    }
+
+def partition_filter(field, key):
+    """Filter selecting one partition, for the students and the rank collection"""
+    if field == "overallRank":
+        return {}, {}
+    if field == "departmentRank":
+        return {"department": key}, {"department": key}
+    department, year = key
+    return {"department": department, "currentClass.year": year}, {"department": department, "year": year}
+
+def total_key(field, key):
+    """Key a partition's size is stored under in the state document"""
+    if field == "overallRank":
+        return "all"
+    if field == "departmentRank":
+        return str(key)
+    return f"{key[0]}:{key[1]}"
+
+def sorted_students(db, query=None):
+    """Students by totalPoints descending, the order every rank is computed in"""
+    return db[STUDENT_COLLECTION].find(query or {}, STUDENT_PROJECTION).sort("totalPoints", DESCENDING)
+
+def save_state(db, started, totals):
+    """Remember when this run started and how big each partition is"""
+    update = {"$set": {"lastRun": started}}
+    for field, sizes in totals.items():
+        for key, size in sizes.items():
+            update["$set"][f"totals.{field}.{key}"] = size
+    db[STATE_COLLECTION].update_one({"_id": STATE_ID}, update, upsert=True)
+
+def full_refresh(db, batch_size=BATCH_SIZE):
+    """Rank every partition in one sorted pass and swap in a freshly built collection"""
+    started = datetime.now(timezone.utc)
+    staging = db[f"{RANK_COLLECTION}_staging"]
+    staging.drop()
+
+    # Dense rank per partition: [current rank, previous points] for every key seen so far
+    counters = {field: {} for field in PARTITIONS}
+    totals = {field: {} for field in PARTITIONS}
+    batch = []
+    written = 0
+    for student in sorted_students(db):
+        doc = rank_document(student)
+        for field, partition in PARTITIONS.items():
+            key = partition(doc)
+            counter = counters[field].setdefault(key, [0, object()])
+            if doc["totalPoints"] != counter[1]:
+                counter[0] += 1
+                counter[1] = doc["totalPoints"]
+            doc[field] = counter[0]
+            name = total_key(field, key)
+            totals[field][name] = totals[field].get(name, 0) + 1
+        doc["computedAt"] = started
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            staging.insert_many(batch, ordered=False)
+            written += len(batch)
+            batch = []
+    if batch:
+        staging.insert_many(batch, ordered=False)
+        written += len(batch)
+
+    if written:
+        staging.create_indexes(RANK_INDEXES)
+        staging.rename(RANK_COLLECTION, dropTarget=True)
+    else:
+        db[RANK_COLLECTION].drop()
+    db[STATE_COLLECTION].delete_one({"_id": STATE_ID})
+    save_state(db, started, totals)
+    return {"mode": "full", "students": written, "partitions": sum(len(t) for t in totals.values()),
+            "updated": written}
+
+def needs_full_refresh(db, state, new_students):
+    """True without a previous run or when students were deleted since it"""
+    if state is None:
+        return True
+    known = db[RANK_COLLECTION].count_documents({})
+    return known + new_students != db[STUDENT_COLLECTION].count_documents({})
+
+def changed_partitions(old, new):
+    """Partition keys a student left or joined, as (rank field, key) pairs"""
+    affected = set()
+    for field, partition in PARTITIONS.items():
+        if old is None or old["totalPoints"] != new["totalPoints"] or partition(old) != partition(new):
+            if old is not None:
+                affected.add((field, partition(old)))
+            affected.add((field, partition(new)))
+    return affected
+
+def rerank_partition(db, field, key, started, batch_size=BATCH_SIZE):
+    """Recompute one partition and write only the ranks that moved; returns (size, updated)"""
+    student_query, rank_query = partition_filter(field, key)
+    current = {doc["_id"]: doc.get(field) for doc in db[RANK_COLLECTION].find(rank_query, {field: 1})}
+
+    operations = []
+    updated = 0
+    size = 0
+    rank = 0
+    previous_points = object()
+    for student in sorted_students(db, student_query):
+        if student.get("totalPoints") != previous_points:
+            rank += 1
+            previous_points = student.get("totalPoints")
+        size += 1
+        if current.get(student["_id"]) != rank:
+            operations.append(UpdateOne({"_id": student["_id"]}, {"$set": {field: rank, "computedAt": started}}))
+        if len(operations) >= batch_size:
+            db[RANK_COLLECTION].bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        db[RANK_COLLECTION].bulk_write(operations, ordered=False)
+        updated += len(operations)
+    return size, updated
+
+def incremental_refresh(db, batch_size=BATCH_SIZE):
+    """Re-rank only the partitions holding students whose points, department or year changed.
+
+    Change detection relies on the updatedAt timestamp Mongoose maintains on students;
+    writes that bypass it (raw driver updates, mongorestore) need a full refresh.
+    """
+    state = db[STATE_COLLECTION].find_one({"_id": STATE_ID})
+    if state is None:
+        return full_refresh(db, batch_size)
+    started = datetime.now(timezone.utc)
+
+    changed = list(db[STUDENT_COLLECTION].find({"updatedAt": {"$gt": state["lastRun"]}}, STUDENT_PROJECTION))
+    previous = {doc["_id"]: doc for doc in db[RANK_COLLECTION].find(
+        {"_id": {"$in": [student["_id"] for student in changed]}},
+        {"totalPoints": 1, "department": 1, "year": 1, "section": 1})}
+    if needs_full_refresh(db, state, sum(1 for student in changed if student["_id"] not in previous)):
+        return full_refresh(db, batch_size)
+
+    # Bring partition fields up to date first so each partition's rank documents match its students
+    affected = set()
+    operations = []
+    for student in changed:
+        doc = rank_document(student)
+        old = previous.get(student["_id"])
+        if old is not None and all(old.get(k) == doc[k] for k in ("totalPoints", "department", "year", "section")):
+            continue
+        affected |= changed_partitions(old, doc)
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": doc}, upsert=True))
+    for start in range(0, len(operations), batch_size):
+        db[RANK_COLLECTION].bulk_write(operations[start:start + batch_size], ordered=False)
+
+    totals = {field: {} for field in PARTITIONS}
+    updated = 0
+    for field, key in sorted(affected, key=repr):
+        size, moved = rerank_partition(db, field, key, started, batch_size)
+        totals[field][total_key(field, key)] = size
+        updated += moved
+    save_state(db, started, totals)
+    return {"mode": "incremental", "students": len(changed), "partitions": len(affected), "updated": updated}
+
+def student_rank(db, student_id):
+    """getStudentRank's result from one indexed read plus the stored partition sizes"""
+    doc = db[RANK_COLLECTION].find_one({"_id": student_id})
+    if doc is None:
+        return None
+    totals = (db[STATE_COLLECTION].find_one({"_id": STATE_ID}) or {}).get("totals", {})
+    return {
+        "overallRank": doc["overallRank"],
+        "contextRank": doc["contextRank"],
+        "totalPoints": doc["totalPoints"],
+        "totalStudents": totals.get("overallRank", {}).get("all"),
+        "contextTotalStudents": totals.get("contextRank", {}).get(total_key("contextRank", PARTITIONS["contextRank"](doc))),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=f"Materialize dense leaderboard ranks into the {RANK_COLLECTION} collection")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--full", action="store_true",
+                        help="rebuild every partition instead of only the ones that changed")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"documents per bulk write (default: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    start = time.perf_counter()
+    if args.full:
+        result = full_refresh(db, args.batch_size)
+    else:
+        result = incremental_refresh(db, args.batch_size)
+    print(f"{result['mode'].capitalize()} refresh: {result['students']:,} students read, "
+          f"{result['partitions']:,} partitions ranked, {result['updated']:,} rank documents written "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,303 @@
+import argparse
+import collections
+import multiprocessing
+import os
+import time
+
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import IndexModel, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+import bson_dump
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+BATCH_SIZE = 1000  # Documents per insert_many / bulk_write
+SPLIT_BYTES = 64 * 2 ** 20  # .bson files larger than this are shared between workers by byte range
+LOAD_MODES = ['insert', 'upsert']
+
+# Inserts pass the undecoded bytes straight back to the driver
+RAW_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# Natural keys restoreUtil.getUniqueCriteria upserts on; other collections use _id
+UNIQUE_FIELDS = {
+    "admins": ["email"],
+    "students": ["email"],
+    "teachers": ["email"],
+    "classes": ["className"],
+    "blacklisttokens": ["token"],
+    "events": ["eventName", "proofUrl"],
+}
+
+def natural_key(collection, doc):
+    """Values of the collection's natural key fields, or None when it has none or a field is missing"""
+    fields = UNIQUE_FIELDS.get(collection)
+    if not fields or any(doc.get(field) is None for field in fields):
+        return None
+    return tuple(doc[field] for field in fields)
+
+def unique_criteria(collection, doc, repeated=()):
+    """Upsert filter as getUniqueCriteria builds it, falling back to _id when a key field is missing
+
+    A key the dump itself repeats also falls back to _id, or the later documents would overwrite the first.
+    """
+    key = natural_key(collection, doc)
+    if key is None or key in repeated:
+        return {"_id": doc["_id"]}
+    return dict(zip(UNIQUE_FIELDS[collection], key))
+
+def dump_tasks(path, workers, collections=None):
+    """Units of work: a .bson file, a byte range of a large one, or one array of a backup document"""
+    tasks = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            collection, extension = os.path.splitext(name)
+            if extension != ".bson" or (collections and collection not in collections):
+                continue
+            file_path = os.path.join(path, name)
+            size = os.path.getsize(file_path)
+            parts = min(workers, -(-size // SPLIT_BYTES))
+            ranges = bson_dump.split_offsets(file_path, parts) if parts > 1 else [(0, size)]
+            tasks.extend({"collection": collection, "path": file_path, "layout": "file", "start": start,
+                          "end": end} for start, end in ranges)
+    else:
+        for collection, start, end in bson_dump.backup_collections(path):
+            if not collections or collection in collections:
+                tasks.append({"collection": collection, "path": path, "layout": "array", "start": start,
+                              "end": end})
+
+    # Largest first, so a big collection is not the last one started
+    tasks.sort(key=lambda task: task["end"] - task["start"], reverse=True)
+    return tasks
+
+def repeated_keys(tasks):
+    """Natural keys that more than one document of the dump shares, per collection"""
+    counts = collections.defaultdict(collections.Counter)
+    for task in tasks:
+        if task["collection"] not in UNIQUE_FIELDS:
+            continue
+        counter = counts[task["collection"]]
+        for doc in task_documents(task):
+            key = natural_key(task["collection"], doc)
+            if key is not None:
+                counter[key] += 1
+    return {name: {key for key, count in counter.items() if count > 1} for name, counter in counts.items()}
+
+def id_conflicts(collection, criteria, docs):
+    """Documents whose natural key already belongs to a stored document with another _id"""
+    keyed = [(query, doc) for query, doc in zip(criteria, docs) if "_id" not in query]
+    if not keyed:
+        return 0
+    fields = UNIQUE_FIELDS[collection.name]
+    stored = {tuple(found.get(field) for field in fields): found["_id"]
+              for found in collection.find({"$or": [query for query, _ in keyed]}, {field: 1 for field in fields})}
+    return sum(stored.get(tuple(query.values()), doc["_id"]) != doc["_id"] for query, doc in keyed)
+
+def write_batch(collection, docs, upsert, repeated=()):
+    """Unordered insert_many, or upserts keyed like getUniqueCriteria
+
+    Returns (duplicates skipped, documents upserted onto a stored document with another _id).
+    """
+    if upsert:
+        criteria = [unique_criteria(collection.name, doc, repeated) for doc in docs]
+        # Such a document keeps the stored _id, so references to its own _id dangle
+        conflicts = id_conflicts(collection, criteria, docs)
+        operations = []
+        for query, doc in zip(criteria, docs):
+            # Keep the dump's _id on insert so references between collections still resolve
+            update = {"$setOnInsert": {"_id": doc["_id"]}}
+            fields = {key: value for key, value in doc.items() if key != "_id"}
+            if fields:
+                update["$set"] = fields
+            operations.append(UpdateOne(query, update, upsert=True))
+        collection.bulk_write(operations, ordered=False)
+        return 0, conflicts
+
+    try:
+        collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # Like mongorestore, documents already present are reported and skipped
+        errors = e.details["writeErrors"]
+        if any(error["code"] != 11000 for error in errors):
+            raise
+        return len(errors), 0
+    return 0, 0
+
+def task_documents(task, codec_options=None):
+    """Stream the documents of one dump_tasks task"""
+    if task["layout"] == "file":
+        return bson_dump.read_documents(task["path"], task["start"], task["end"], codec_options)
+    return bson_dump.read_array_documents(task["path"], task["start"], task["end"], codec_options)
+
+def load_task(task, settings):
+    """Stream one task's documents into the database in batches"""
+    started = time.time()
+    upsert = settings["mode"] == "upsert"
+    docs = task_documents(task, None if upsert else RAW_OPTIONS)
+    repeated = settings["repeated"].get(task["collection"], set())
+
+    # Opened here, inside the worker, since clients are not fork-safe
+    client = MongoClient(settings["uri"])
+    collection = client[settings["db"]][task["collection"]]
+    count = 0
+    duplicates = 0
+    conflicts = 0
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= settings["batch_size"]:
+            skipped, remapped = write_batch(collection, batch, upsert, repeated)
+            duplicates += skipped
+            conflicts += remapped
+            count += len(batch)
+            batch = []
+    if batch:
+        skipped, remapped = write_batch(collection, batch, upsert, repeated)
+        duplicates += skipped
+        conflicts += remapped
+        count += len(batch)
+    client.close()
+
+    return {"collection": task["collection"], "docs": count, "duplicates": duplicates, "conflicts": conflicts,
+            "bytes": task["end"] - task["start"], "started": started, "finished": time.time()}
+
+def load_task_entry(task):
+    """Pool entry point unpacking a (task, settings) pair"""
+    return load_task(*task)
+
+def restore_indexes(db, path, collection):
+    """Build the indexes listed in <collection>.metadata.json, as mongorestore does after the data"""
+    metadata_path = os.path.join(path, f"{collection}.metadata.json")
+    if not os.path.exists(metadata_path):
+        return []
+    with open(metadata_path) as f:
+        metadata = json_util.loads(f.read())
+
+    models = []
+    for spec in metadata.get("indexes", []):
+        if spec["name"] == "_id_":
+            continue
+        options = {key: value for key, value in spec.items() if key not in ("v", "key", "ns")}
+        models.append(IndexModel(list(spec["key"].items()), **options))
+    if models:
+        db[collection].create_indexes(models)
+    return [model.document["name"] for model in models]
+
+def ensure_lookup_indexes(db, names):
+    """Index the natural keys upserts filter on, unless an index on them already exists"""
+    for name in names:
+        if name not in UNIQUE_FIELDS:
+            continue
+        try:
+            db[name].create_index([(field, 1) for field in UNIQUE_FIELDS[name]])
+        except OperationFailure as e:
+            # The same keys under another name or options, e.g. the unique email_1 from the metadata
+            if e.code not in (85, 86):
+                raise
+
+def load_dump(path, uri=MONGO_URI, db_name=DB_NAME, workers=1, mode="insert", batch_size=BATCH_SIZE,
+              drop=False, collections=None, build_indexes=True):
+    """Load every collection of a dump in parallel; returns per-collection totals"""
+    tasks = dump_tasks(path, workers, collections)
+    names = sorted({task["collection"] for task in tasks})
+    client = MongoClient(uri)
+    db = client[db_name]
+    if drop:
+        for name in names:
+            db[name].drop()
+
+    # Upserts look every document up by its natural key; inserts index afterwards, which is cheaper
+    upsert = mode == "upsert"
+    repeated = {}
+    if upsert:
+        if build_indexes and os.path.isdir(path):
+            for name in names:
+                restore_indexes(db, path, name)
+        ensure_lookup_indexes(db, names)
+        repeated = repeated_keys(tasks)
+        for name, keys in sorted(repeated.items()):
+            if keys:
+                print(f"{name}: {len(keys)} natural keys repeat within the dump; those documents upsert on _id")
+
+    print(f"Loading {len(names)} collections from {path} ({len(tasks)} tasks, {workers} worker(s), "
+          f"{mode} mode)...")
+    settings = {"uri": uri, "db": db_name, "mode": mode, "batch_size": batch_size, "repeated": repeated}
+    totals = {name: {"docs": 0, "duplicates": 0, "conflicts": 0, "bytes": 0, "started": None, "finished": None}
+              for name in names}
+
+    if workers == 1:
+        results = map(load_task_entry, [(task, settings) for task in tasks])
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(load_task_entry, [(task, settings) for task in tasks])
+
+    try:
+        for result in results:
+            entry = totals[result["collection"]]
+            for key in ("docs", "duplicates", "conflicts", "bytes"):
+                entry[key] += result[key]
+            entry["started"] = min(filter(None, [entry["started"], result["started"]]))
+            entry["finished"] = max(filter(None, [entry["finished"], result["finished"]]))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # A backup document carries no index metadata
+    if build_indexes and not upsert and os.path.isdir(path):
+        for name in names:
+            built = restore_indexes(db, path, name)
+            if built:
+                print(f"Built {len(built)} indexes on {name}: {', '.join(built)}")
+    client.close()
+    return totals
+
+def print_report(totals, seconds):
+    """Documents, size and throughput per collection"""
+    print(f"\n{'collection':<22} {'docs':>10} {'MB':>8} {'seconds':>8} {'MB/s':>8} {'duplicates':>10} "
+          f"{'conflicts':>10}")
+    for name, entry in sorted(totals.items(), key=lambda item: -item[1]["bytes"]):
+        elapsed = entry["finished"] - entry["started"] if entry["started"] is not None else 0.0
+        size = entry["bytes"] / 2 ** 20
+        rate = f"{size / elapsed:8,.1f}" if elapsed else f"{'-':>8}"
+        print(f"{name:<22} {entry['docs']:>10,} {size:>8,.2f} {elapsed:>8.2f} {rate} {entry['duplicates']:>10,} "
+              f"{entry['conflicts']:>10,}")
+    total_size = sum(entry["bytes"] for entry in totals.values()) / 2 ** 20
+    print(f"Loaded {sum(entry['docs'] for entry in totals.values()):,} documents ({total_size:,.1f} MB) "
+          f"in {seconds:.2f}s ({total_size / seconds if seconds else 0:,.1f} MB/s)")
+    conflicts = sum(entry["conflicts"] for entry in totals.values())
+    if conflicts:
+        print(f"Warning: {conflicts:,} documents matched a stored document with another _id and were merged "
+              f"into it; references to their own _ids do not resolve")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a BSON dump or backup into MongoDB, streaming and in parallel")
+    parser.add_argument("dump", help="dump directory such as dbdump/leaderboard_db, or a single-document "
+                                     "backup such as backend/backup/backup.bson")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes loading collections (and ranges of large files) in parallel "
+                             "(default: the CPU count)")
+    parser.add_argument("--mode", choices=LOAD_MODES, default="insert",
+                        help="insert: unordered insert_many, skipping existing _ids; upsert: update or insert "
+                             "on the natural keys restoreUtil.js uses (default: insert)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"documents per bulk write (default: {BATCH_SIZE})")
+    parser.add_argument("--collection", action="append", help="load only this collection; repeat for several")
+    parser.add_argument("--drop", action="store_true", help="drop each collection before loading it")
+    parser.add_argument("--no-index", action="store_true",
+                        help="skip building the indexes listed in the dump's metadata files")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.dump):
+        parser.error(f"{args.dump} does not exist")
+    start = time.perf_counter()
+    totals = load_dump(args.dump, args.uri, args.db, args.workers, args.mode, args.batch_size, args.drop,
+                       args.collection, not args.no_index)
+    print_report(totals, time.perf_counter() - start)
@@ -1,39 +1,97 @@
 import pymongo
 from pymongo import MongoClient
+import argparse
+import multiprocessing
 import random
+import struct
 from faker import Faker
-import bcrypt
 import datetime
+import bson
 from bson import ObjectId
+import contextlib
+import io
+import itertools
+import os
+import numpy as np
 import time
 from tqdm import tqdm
+import bson_dump
+import passwords
+import seed_indexes
+import seed_metrics
+import records
+import sinks
+import year_end
 
 # Initialize faker
 fake = Faker('en_IN')
 
-# Connect to MongoDB
-client = MongoClient('mongodb://localhost:27017/')
-db = client['leaderboard_db']
+# Connect to MongoDB; connect() opens the client, so importing this module stays cheap
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+client = None
+db = None
 
 # Configuration
-PASSWORD = bcrypt.hashpw("password123".encode('utf-8'), bcrypt.gensalt()).decode()
-RAW_PASSWORD = "password123"
+PASSWORDS = None  # (rawPassword, bcrypt hash) pairs users draw from, built by build_passwords
+PASSWORD_POOL_SIZE = 1000  # Distinct raw passwords per run; each is hashed once
+BCRYPT_ROUNDS = 4  # Cheap enough to hash every distinct password; --bcrypt-rounds raises it
 CURRENT_YEAR = 2024
 ACADEMIC_YEAR = "2024-2025"
 DEPARTMENTS = ['CSE', 'ECE', 'EEE', 'MECH', 'CIVIL', 'IT']
 SECTIONS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'D1', 'D2', 'E1', 'E2']
 STUDENTS_PER_CLASS = 20
 CLASSES_PER_YEAR_PER_DEPT = 20  # User specified 20 classes per year per department
+MAX_EVENTS_PER_STUDENT = 5
+CHUNK_SIZE = 5000  # Documents buffered per collection before an insert_many
+YEARS = [1, 2, 3, 4]  # BTech program years
+ADVISORS_PER_YEAR_PER_DEPT = 2
+APPEND_BATCH = 1000  # Existing documents updated per bulk_write when appending
+
+# Department codes available to larger scale configurations
+DEPARTMENT_POOL = DEPARTMENTS + [
+    'AERO', 'AUTO', 'BIOTECH', 'BIOMED', 'CHEM', 'EIE', 'ICE', 'MECHATRONICS',
+    'NANO', 'AIML', 'DS', 'CYBER', 'ROBOTICS', 'ARCH'
+]
+
+# Named dataset sizes; "campus" matches our real enrolment
+SCALE_PRESETS = {
+    "small": {"departments": 6, "classes_per_year": 2, "students_per_class": 20, "max_events": 5},
+    "campus": {"departments": 6, "classes_per_year": 20, "students_per_class": 20, "max_events": 5},
+    "university": {"departments": 12, "classes_per_year": 50, "students_per_class": 30, "max_events": 5},
+    "consortium": {"departments": 20, "classes_per_year": 200, "students_per_class": 60, "max_events": 6},
+}
+DEFAULT_SCALE = "campus"
+SIZE_SAMPLE_STUDENTS = 200  # Students generated to estimate document sizes
+MAX_SECTIONS = 26 * 2 * 4  # A1-Z8: the backend's class model only takes a letter and one digit
+
+# Timestamp stamped on generated documents; fixed when a seed is given
+RUN_TIME = datetime.datetime.now()
+RUN_SEED = None  # Seed of the run in progress; keys the per-process text pool cache
+SEEDED_RUN_TIME = datetime.datetime(CURRENT_YEAR + 1, 1, 1)
+
+# Collection names used by the backend's Mongoose models
+TEACHER_COLLECTION = "teachers"
+STUDENT_COLLECTION = "students"
+CLASS_COLLECTION = "classes"
+EVENT_COLLECTION = "events"
 
 # Event configuration
 EVENT_CATEGORIES = ['Hackathon', 'Ideathon', 'Coding', 'Global-Certificates', 'Workshop', 'Conference', 'Others']
 EVENT_STATUSES = ['Pending', 'Approved', 'Rejected']
+EVENT_STATUS_WEIGHTS = [0.2, 0.7, 0.1]  # 20% pending, 70% approved, 10% rejected
 EVENT_POSITIONS = ['First', 'Second', 'Third', 'Participant', 'None']
 EVENT_LOCATIONS = ['Within College', 'Outside College']
 EVENT_SCOPES = ['International', 'National', 'State']
 EVENT_ORGANIZERS = ['Industry Based', 'College Based']
 EVENT_TYPES = ['Individual', 'Team']
 COLLEGES = ['IIT Madras', 'NIT Trichy', 'VIT University', 'SRM University', 'Anna University']
+DETAILED_CATEGORIES = ['Hackathon', 'Ideathon', 'Coding', 'Workshop', 'Conference']  # Carry location/scope fields
+DETAILED_CATEGORY_INDEXES = [EVENT_CATEGORIES.index(category) for category in DETAILED_CATEGORIES]
+EVENT_SAMPLE_BATCH = 1000  # Students whose events are sampled together
+TEXT_POOL_SIZE = 1000  # Faker phrases and paragraphs pre-generated per run
+HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+UUID_DIGIT_COLUMNS = [i for i in range(36) if i not in (8, 13, 18, 23)]
 
 # Points configuration
 POINTS_CONFIG = {
@@ -59,13 +117,100 @@ YEAR_TO_ACADEMIC_YEAR = {
     4: "2021-2025",  # 4th year academic span
 }
 
+def new_object_id(created_at):
+    """ObjectId drawn from the seeded RNG so a seed reproduces the same ids"""
+    timestamp = struct.pack(">I", int(created_at.timestamp()))
+    return ObjectId(timestamp + random.getrandbits(64).to_bytes(8, "big"))
+
+def make_departments(count):
+    """Department codes for a scale configuration, numbering repeats past the pool"""
+    departments = []
+    for i in range(count):
+        code = DEPARTMENT_POOL[i % len(DEPARTMENT_POOL)]
+        if i >= len(DEPARTMENT_POOL):
+            code = f"{code}{i // len(DEPARTMENT_POOL) + 1}"
+        departments.append(code)
+    return departments
+
+def make_sections(count):
+    """Section names A1, A2, B1, ... Z2, A3, A4, ... so every class name is unique"""
+    if count > MAX_SECTIONS:
+        raise ValueError(f"{count} sections per year is more than the {MAX_SECTIONS} (A1-Z8) the backend accepts")
+    sections = []
+    for i in range(count):
+        letter = chr(ord('A') + (i // 2) % 26)
+        number = (i // 52) * 2 + i % 2 + 1
+        sections.append(f"{letter}{number}")
+    return sections
+
+def resolve_scale(scale_factor):
+    """Turn a preset name or a numeric multiple of the campus preset into a scale configuration"""
+    if scale_factor in SCALE_PRESETS:
+        scale = dict(SCALE_PRESETS[scale_factor])
+        scale["name"] = scale_factor
+        return scale
+    
+    try:
+        factor = float(scale_factor)
+    except ValueError:
+        raise ValueError(f"Unknown scale factor '{scale_factor}'; use a number or one of "
+                         f"{', '.join(SCALE_PRESETS)}")
+    if factor <= 0:
+        raise ValueError("Scale factor must be positive")
+    
+    # Numeric factors grow the number of classes, like TPC table cardinalities
+    scale = dict(SCALE_PRESETS[DEFAULT_SCALE])
+    scale["classes_per_year"] = max(1, round(scale["classes_per_year"] * factor))
+    if scale["classes_per_year"] > MAX_SECTIONS:
+        limit = MAX_SECTIONS / SCALE_PRESETS[DEFAULT_SCALE]["classes_per_year"]
+        raise ValueError(f"Scale factor {factor:g} needs {scale['classes_per_year']} classes per year, but the "
+                         f"backend's section names (A1-Z8) allow {MAX_SECTIONS}; use a factor of at most "
+                         f"{limit:g} or a preset")
+    scale["name"] = f"SF {factor:g}"
+    return scale
+
+def apply_scale(scale):
+    """Point the generation constants at a scale configuration"""
+    global DEPARTMENTS, SECTIONS, STUDENTS_PER_CLASS, CLASSES_PER_YEAR_PER_DEPT, MAX_EVENTS_PER_STUDENT
+    DEPARTMENTS = make_departments(scale["departments"])
+    SECTIONS = make_sections(max(scale["classes_per_year"], 10))
+    STUDENTS_PER_CLASS = scale["students_per_class"]
+    CLASSES_PER_YEAR_PER_DEPT = scale["classes_per_year"]
+    MAX_EVENTS_PER_STUDENT = scale["max_events"]
+
+def build_passwords(seed, fixed_salts=False, rounds=BCRYPT_ROUNDS, workers=passwords.HASH_WORKERS,
+                    cache_path=passwords.HASH_CACHE_PATH):
+    """Distinct raw passwords for the run, hashed once through the shared hashing stage
+
+    Fixed salts make a seeded run store the same hashes every time, whatever the cache holds.
+    """
+    faker = Faker('en_IN')
+    faker.seed_instance(f"{seed}:passwords")
+    docs = [{"rawPassword": faker.password()} for _ in range(PASSWORD_POOL_SIZE)]
+    passwords.load_password_cache(cache_path)
+    passwords.hash_passwords(docs, workers, rounds=rounds, fixed=fixed_salts)
+    passwords.save_password_cache(cache_path)
+    return [(doc["rawPassword"], doc["password"]) for doc in docs]
+
+def pick_password():
+    """A (rawPassword, password hash) pair for one new user"""
+    return random.choice(PASSWORDS)
+
+def connect():
+    """Open the MongoDB client for MONGO_URI/DB_NAME unless one is already open"""
+    global client, db
+    if client is None:
+        client = MongoClient(MONGO_URI)
+        db = client[DB_NAME]
+    return db
+
 def clear_database():
     """Clear all collections before seeding"""
     print("Clearing existing database...")
-    db.teacher.drop()
-    db.student.drop()
-    db["class"].drop()  # Use bracket notation to avoid syntax error
-    db.event.drop()
+    db[TEACHER_COLLECTION].drop()
+    db[STUDENT_COLLECTION].drop()
+    db[CLASS_COLLECTION].drop()
+    db[EVENT_COLLECTION].drop()
     print("Database cleared successfully")
 
 def create_hods():
@@ -75,63 +220,65 @@ def create_hods():
     
     for dept in DEPARTMENTS:
         register_no = f"HOD-{dept}-001"
+        raw_password, password = pick_password()
         hod = {
-            "_id": ObjectId(),
+            "_id": new_object_id(RUN_TIME),
             "name": f"Dr. {fake.name()}",
             "email": f"hod.{dept.lower()}@college.edu",
-            "password": PASSWORD,
-            "rawPassword": RAW_PASSWORD,
+            "password": password,
+            "rawPassword": raw_password,
             "profileImg": None,
             "registerNo": register_no,
             "role": "HOD",
             "department": dept,
             "classes": [],
             "isActive": True,
-            "createdAt": datetime.datetime.now(),
-            "updatedAt": datetime.datetime.now()
+            "createdAt": RUN_TIME,
+            "updatedAt": RUN_TIME
         }
         hods[dept] = hod
     
     return hods
 
-def create_academic_advisors(departments, years):
+def create_academic_advisors(departments, years, counter_start=1):
     """Create academic advisors for each department and year"""
     print("Creating Academic Advisors...")
     advisors = {}
-    counter = 1
+    counter = counter_start
     
     for dept in departments:
         advisors[dept] = {}
         for year in years:
             advisors[dept][year] = []
             # Create two academic advisors per year per department
-            for i in range(2):
+            for i in range(ADVISORS_PER_YEAR_PER_DEPT):
                 register_no = f"ADV-{dept}-{year}-{counter:03d}"
+                raw_password, password = pick_password()
                 advisor = {
-                    "_id": ObjectId(),
+                    "_id": new_object_id(RUN_TIME),
                     "name": f"Dr. {fake.name()}",
                     "email": f"advisor{counter}.{dept.lower()}@college.edu",
-                    "password": PASSWORD,
-                    "rawPassword": RAW_PASSWORD,
+                    "password": password,
+                    "rawPassword": raw_password,
                     "profileImg": None,
                     "registerNo": register_no,
                     "role": "Academic Advisor",
                     "department": dept,
                     "classes": [],
                     "isActive": True,
-                    "createdAt": datetime.datetime.now(),
-                    "updatedAt": datetime.datetime.now()
+                    "createdAt": RUN_TIME,
+                    "updatedAt": RUN_TIME
                 }
                 advisors[dept][year].append(advisor)
                 counter += 1
     
     return advisors
 
-def create_faculty(departments, years, classes_per_year):
+def create_faculty(departments, years, classes_per_year, counter_start=1):
     """Create faculty members for each class"""
     print("Creating Faculty members...")
     faculty = {}
-    counter = 1
+    counter = counter_start
     
     for dept in departments:
         faculty[dept] = {}
@@ -140,20 +287,21 @@ def create_faculty(departments, years, classes_per_year):
             # Create faculty for each class
             for i in range(classes_per_year):
                 register_no = f"FAC-{dept}-{year}-{counter:03d}"
+                raw_password, password = pick_password()
                 teacher = {
-                    "_id": ObjectId(),
+                    "_id": new_object_id(RUN_TIME),
                     "name": f"Prof. {fake.name()}",
                     "email": f"faculty{counter}.{dept.lower()}@college.edu",
-                    "password": PASSWORD,
-                    "rawPassword": RAW_PASSWORD,
+                    "password": password,
+                    "rawPassword": raw_password,
                     "profileImg": None,
                     "registerNo": register_no,
                     "role": "Faculty",
                     "department": dept,
                     "classes": [],
                     "isActive": True,
-                    "createdAt": datetime.datetime.now(),
-                    "updatedAt": datetime.datetime.now()
+                    "createdAt": RUN_TIME,
+                    "updatedAt": RUN_TIME
                 }
                 faculty[dept][year].append(teacher)
                 counter += 1
@@ -184,7 +332,7 @@ def create_classes(departments, years, faculty_data, advisors_data, sections):
                 assigned_faculty = dept_faculty[i % len(dept_faculty)]
                 
                 class_obj = {
-                    "_id": ObjectId(),
+                    "_id": new_object_id(RUN_TIME),
                     "year": year,
                     "section": section,
                     "className": class_name,
@@ -194,8 +342,8 @@ def create_classes(departments, years, faculty_data, advisors_data, sections):
                     "students": [],
                     "facultyAssigned": [assigned_faculty["_id"]],
                     "academicAdvisors": [advisor["_id"] for advisor in dept_advisors],
-                    "createdAt": datetime.datetime.now(),
-                    "updatedAt": datetime.datetime.now()
+                    "createdAt": RUN_TIME,
+                    "updatedAt": RUN_TIME
                 }
                 
                 # Add this class to the faculty's classes
@@ -209,15 +357,75 @@ def create_classes(departments, years, faculty_data, advisors_data, sections):
     
     return classes
 
-def create_students(departments, years, classes_data):
-    """Create students for each class"""
+class StudentRecord(records.Record):
+    """Student being generated: only its own values; constant and derived fields are added on conversion"""
+    
+    __slots__ = ("_id", "name", "registerNo", "password", "rawPassword", "class", "year", "section", "department",
+                 "totalPoints", "eventsParticipated", "registrationYear", "academicYear", "createdAt")
+    
+    def __init__(self, _id, name, reg_no, class_obj, registration_year, academic_year):
+        self._id = _id
+        self.name = name
+        self.registerNo = reg_no
+        self.rawPassword, self.password = pick_password()
+        self["class"] = class_obj["_id"]  # A keyword, so only reachable by name
+        self.year = class_obj["year"]
+        self.section = class_obj["section"]
+        self.department = class_obj["department"]
+        self.totalPoints = 0
+        self.eventsParticipated = []
+        self.registrationYear = registration_year
+        self.academicYear = academic_year
+        self.createdAt = RUN_TIME
+    
+    def to_document(self):
+        return {
+            "_id": self._id,
+            "name": self.name,
+            "profileImg": None,
+            "email": f"{self.registerNo.lower()}@student.college.edu",
+            "registerNo": self.registerNo,
+            "password": self.password,
+            "rawPassword": self.rawPassword,
+            "class": self["class"],
+            "year": self.year,
+            "course": f"BTech-{self.department}",
+            "totalPoints": self.totalPoints,
+            "eventsParticipated": self.eventsParticipated,
+            "isActive": True,
+            "isGraduated": False,
+            "isArchived": False,
+            "registrationYear": self.registrationYear,
+            "program": "BTech",
+            "department": self.department,
+            "currentClass": {
+                "year": self.year,
+                "section": self.section,
+                "ref": self["class"]
+            },
+            "classHistory": [{
+                "year": self.year,
+                "section": self.section,
+                "academicYear": self.academicYear,
+                "classRef": self["class"]
+            }],
+            "achievements": [],
+            "createdAt": self.createdAt,
+            "updatedAt": self.createdAt
+        }
+
+def build_student(class_obj, reg_no, registration_year, academic_year):
+    """Student record enrolled in class_obj"""
+    return StudentRecord(new_object_id(RUN_TIME), fake.name(), reg_no, class_obj, registration_year, academic_year)
+
+def create_students(departments, years, classes_data, register_start=1):
+    """Lazily create students for each class"""
     print("Creating Students...")
-    students = []
     register_counter = {}
     
     # Initialize counters for each department
     for dept in departments:
-        register_counter[dept] = 1
+        register_counter[dept] = register_start
     
     for dept in departments:
         for year in years:
@@ -231,253 +439,830 @@ def create_students(departments, years, classes_data):
                     reg_year = YEAR_TO_REG[year]
                     reg_no = f"{reg_year}{dept}{register_counter[dept]:03d}"
                     
-                    student = {
-                        "_id": ObjectId(),
-                        "name": fake.name(),
-                        "profileImg": None,
-                        "email": f"{reg_no.lower()}@student.college.edu",
-                        "registerNo": reg_no,
-                        "password": PASSWORD,
-                        "rawPassword": RAW_PASSWORD,
-                        "class": class_obj["_id"],
-                        "year": year,
-                        "course": f"BTech-{dept}",
-                        "totalPoints": 0,
-                        "eventsParticipated": [],
-                        "isActive": True,
-                        "isGraduated": False,
-                        "isArchived": False,
-                        "registrationYear": YEAR_TO_REG[year],
-                        "program": "BTech",
-                        "department": dept,
-                        "currentClass": {
-                            "year": year,
-                            "section": class_obj["section"],
-                            "ref": class_obj["_id"]
-                        },
-                        "classHistory": [{
-                            "year": year,
-                            "section": class_obj["section"],
-                            "academicYear": YEAR_TO_ACADEMIC_YEAR[year],
-                            "classRef": class_obj["_id"]
-                        }],
-                        "achievements": [],
-                        "createdAt": datetime.datetime.now(),
-                        "updatedAt": datetime.datetime.now()
-                    }
-                    
-                    # Add student to this class's student list
-                    class_obj["students"].append(student["_id"])
-                    students.append(student)
+                    # Class membership is settled when the student is written
+                    yield build_student(class_obj, reg_no, reg_year, YEAR_TO_ACADEMIC_YEAR[year])
                     
                     # Increment counter
                     register_counter[dept] += 1
+
+def build_class_faculty_index(classes_data):
+    """Map each class _id to the faculty member who approves its events"""
+    class_faculty = {}
+    for dept_classes in classes_data.values():
+        for year_classes in dept_classes.values():
+            for class_obj in year_classes:
+                class_faculty[class_obj["_id"]] = class_obj["assignedFaculty"][0]
+    return class_faculty
+
+def build_text_pools(size=TEXT_POOL_SIZE, faker=None):
+    """Pre-generate Faker text once; events draw from these pools by index"""
+    faker = faker or fake
+    return {
+        "names": [faker.bs() for _ in range(size)],
+        "descriptions": [faker.paragraph() for _ in range(size)],
+    }
+
+text_pool_cache = {}
+
+def run_text_pools():
+    """The run's text pools, built once per process from their own Faker seeded by RUN_SEED
+
+    Shards share them whichever worker runs them, so the data stays the same for any worker count.
+    """
+    if RUN_SEED not in text_pool_cache:
+        text_pool_cache.clear()
+        faker = Faker('en_IN')
+        if RUN_SEED is not None:
+            faker.seed_instance(f"{RUN_SEED}:text")
+        text_pool_cache[RUN_SEED] = build_text_pools(faker=faker)
+    return text_pool_cache[RUN_SEED]
+
+def build_points_table():
+    """POINTS_CONFIG as a position x scope array, with a last scope column of zeros for no scope"""
+    table = np.zeros((len(EVENT_POSITIONS), len(EVENT_SCOPES) + 1), dtype=np.int64)
+    for position_index, position in enumerate(EVENT_POSITIONS):
+        for scope_index, scope in enumerate(EVENT_SCOPES):
+            table[position_index, scope_index] = POINTS_CONFIG[position][scope]
+    return table
+
+def random_uuids(rng, count):
+    """Version 4 UUID strings built from one block of random bytes"""
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
     
-    return students
+    # Spell the nibbles out as hex digits and splice in the dashes
+    digits = np.empty((count, 32), dtype=np.uint8)
+    digits[:, 0::2] = HEX_DIGITS[raw >> 4]
+    digits[:, 1::2] = HEX_DIGITS[raw & 0x0F]
+    text = np.full((count, 36), ord('-'), dtype=np.uint8)
+    text[:, UUID_DIGIT_COLUMNS] = digits
+    text = text.tobytes().decode('ascii')
+    return [text[i:i + 36] for i in range(0, count * 36, 36)]
+
+def random_object_ids(rng, timestamps):
+    """ObjectIds carrying the given unix timestamps and random trailing bytes"""
+    count = len(timestamps)
+    raw = np.empty((count, 12), dtype=np.uint8)
+    raw[:, :4] = timestamps.astype(">u4").view(np.uint8).reshape(count, 4)
+    raw[:, 4:] = rng.integers(0, 256, size=(count, 8), dtype=np.uint8)
+    raw = raw.tobytes()
+    return [ObjectId(raw[i:i + 12]) for i in range(0, count * 12, 12)]
+
+def pick(values, indexes):
+    """Look up many indexes in a list of Python values at once"""
+    return np.asarray(values, dtype=object)[indexes]
 
-def create_events(students, classes_data, faculty_data):
-    """Create events for students with various statuses"""
+def sample_events(rng, count, start, end, text_pools, points_table):
+    """Draw the field values of count events at once, with the same distributions as per-event sampling"""
+    # Random date in the window, to the second
+    span = int((end - start).total_seconds())
+    offsets = rng.integers(0, span + 1, size=count)
+    start_seconds = np.datetime64(start, "s")
+    dates = (start_seconds + offsets.astype("timedelta64[s]")).tolist()
+    timestamps = start_seconds.astype(np.int64) + offsets
+    
+    # Categorical fields; scope index len(EVENT_SCOPES) means the category has no details
+    category = rng.integers(0, len(EVENT_CATEGORIES), size=count)
+    has_details = np.isin(category, DETAILED_CATEGORY_INDEXES)
+    location = rng.integers(0, len(EVENT_LOCATIONS), size=count)
+    outside = has_details & (location == EVENT_LOCATIONS.index('Outside College'))
+    college = rng.integers(0, len(COLLEGES), size=count)
+    scope = np.where(has_details, rng.integers(0, len(EVENT_SCOPES), size=count), len(EVENT_SCOPES))
+    organizer = rng.integers(0, len(EVENT_ORGANIZERS), size=count)
+    participation = rng.integers(0, len(EVENT_TYPES), size=count)
+    position = rng.integers(0, len(EVENT_POSITIONS), size=count)
+    status = rng.choice(len(EVENT_STATUSES), size=count, p=EVENT_STATUS_WEIGHTS)
+    
+    # Only approved events contribute points; prize money goes to placed finishes
+    approved = status == EVENT_STATUSES.index("Approved")
+    points = np.where(approved, points_table[position, scope], 0)
+    prize = np.where(has_details & (position < 3), rng.integers(1000, 50001, size=count), 0)
+    
+    # Text comes from the pre-generated pools
+    categories = pick(EVENT_CATEGORIES, category)
+    names = pick(text_pools["names"], rng.integers(0, len(text_pools["names"]), size=count))
+    descriptions = pick(text_pools["descriptions"], rng.integers(0, len(text_pools["descriptions"]), size=count))
+    
+    return {
+        "_id": random_object_ids(rng, timestamps),
+        "date": dates,
+        "eventName": (categories + " - " + names).tolist(),
+        "description": descriptions.tolist(),
+        "proofUrl": ["https://proof.example.com/" + u for u in random_uuids(rng, count)],
+        "pdfDocument": ["https://docs.example.com/" + u + ".pdf" for u in random_uuids(rng, count)],
+        "category": categories.tolist(),
+        "positionSecured": pick(EVENT_POSITIONS, position).tolist(),
+        "status": pick(EVENT_STATUSES, status).tolist(),
+        "pointsEarned": points.tolist(),
+        "hasDetails": has_details.tolist(),
+        "eventLocation": pick(EVENT_LOCATIONS, location).tolist(),
+        "otherCollegeName": np.where(outside, pick(COLLEGES, college), None).tolist(),
+        "eventScope": pick(EVENT_SCOPES + [None], scope).tolist(),
+        "eventOrganizer": pick(EVENT_ORGANIZERS, organizer).tolist(),
+        "participationType": pick(EVENT_TYPES, participation).tolist(),
+        "priceMoney": prize.tolist(),
+    }
+
+def build_event(sample, i, student_id, faculty_id, updated_at=None):
+    """Event document for row i of a sample_events batch"""
+    status = sample["status"][i]
+    event_date = sample["date"][i]
+    
+    # Create event object
+    event = {
+        "_id": sample["_id"][i],
+        "eventName": sample["eventName"][i],
+        "description": sample["description"][i],
+        "date": event_date,
+        "proofUrl": sample["proofUrl"][i],
+        "pdfDocument": sample["pdfDocument"][i],
+        "category": sample["category"][i],
+        "positionSecured": sample["positionSecured"][i],
+        "status": status,
+        "pointsEarned": sample["pointsEarned"][i],
+        "submittedBy": student_id,
+        "approvedBy": faculty_id if status != "Pending" else None,
+        "createdAt": event_date,
+        "updatedAt": updated_at or RUN_TIME
+    }
+    
+    # Add conditional fields
+    if sample["hasDetails"][i]:
+        event["eventLocation"] = sample["eventLocation"][i]
+        if sample["otherCollegeName"][i]:
+            event["otherCollegeName"] = sample["otherCollegeName"][i]
+        event["eventScope"] = sample["eventScope"][i]
+        event["eventOrganizer"] = sample["eventOrganizer"][i]
+        event["participationType"] = sample["participationType"][i]
+    if sample["priceMoney"][i]:
+        event["priceMoney"] = sample["priceMoney"][i]
+    return event
+
+class EventRecord(records.Record):
+    """Event being generated: a row of its sample_events batch, its submitter and approving faculty"""
+    
+    __slots__ = ("sample", "row", "student", "faculty")
+    
+    def __init__(self, sample, row, student_id, faculty_id):
+        self.sample = sample
+        self.row = row
+        self.student = student_id
+        self.faculty = faculty_id
+    
+    def __getitem__(self, key):
+        column = self.sample.get(key)
+        return column[self.row] if column is not None else self.to_document()[key]
+    
+    def to_document(self):
+        return build_event(self.sample, self.row, self.student, self.faculty)
+
+def create_events(students, classes_data, faculty_data, total=None, progress=True):
+    """Lazily create events for students, yielding each student with its events"""
     print("Creating Events...")
-    events = []
+    
+    # Look classes up by _id instead of scanning the department/year per student
+    class_faculty = build_class_faculty_index(classes_data)
+    
+    # NumPy generator derived from the seeded RNG so seeds stay reproducible
+    rng = np.random.default_rng(random.getrandbits(64))
+    text_pools = run_text_pools()
+    points_table = build_points_table()
     
     # Current date for reference
-    now = datetime.datetime.now()
+    now = RUN_TIME
     one_year_ago = now - datetime.timedelta(days=365)
     
-    # Create events with random distribution
-    for student in tqdm(students):
-        # Randomly decide how many events this student has (0-5)
-        num_events = random.randint(0, 5)
-        
-        if num_events == 0:
-            continue
-        
-        # Get the faculty for this student's class
-        student_class_id = student["class"]
-        student_dept = student["department"]
-        student_year = student["year"]
-        
-        # Find the class object and its assigned faculty
-        class_obj = None
-        for cls in classes_data[student_dept][student_year]:
-            if cls["_id"] == student_class_id:
-                class_obj = cls
+    students = iter(students)
+    with tqdm(total=total, disable=not progress) as progress_bar:
+        while True:
+            batch = list(itertools.islice(students, EVENT_SAMPLE_BATCH))
+            if not batch:
                 break
-        
-        if not class_obj:
-            continue  # Skip if class not found
-            
-        faculty_id = class_obj["assignedFaculty"][0]
-        
-        # Create events
-        for _ in range(num_events):
-            # Random date in the past year
-            event_date = fake.date_time_between(
-                start_date=one_year_ago,
-                end_date=now
-            )
             
-            # Random event category
-            category = random.choice(EVENT_CATEGORIES)
+            # Randomly decide how many events each student has, then sample them all at once
+            counts = rng.integers(0, MAX_EVENTS_PER_STUDENT + 1, size=len(batch)).tolist()
+            sample = sample_events(rng, sum(counts), one_year_ago, now, text_pools, points_table)
             
-            # Default values for optional fields
-            event_location = None
-            other_college = None
-            event_scope = None
-            event_organizer = None
-            participation_type = None
-            price_money = None
-            
-            # Fill required fields based on category
-            if category in ['Hackathon', 'Ideathon', 'Coding', 'Workshop', 'Conference']:
-                event_location = random.choice(EVENT_LOCATIONS)
-                if event_location == 'Outside College':
-                    other_college = random.choice(COLLEGES)
-                event_scope = random.choice(EVENT_SCOPES)
-                event_organizer = random.choice(EVENT_ORGANIZERS)
-                participation_type = random.choice(EVENT_TYPES)
+            offset = 0
+            for student, num_events in zip(batch, counts):
+                events = []
+                first = offset
+                offset += num_events
                 
-            # Position and points
-            position = random.choice(EVENT_POSITIONS)
-            points = 0
-            
-            if position in ['First', 'Second', 'Third'] and event_scope:
-                points = POINTS_CONFIG[position][event_scope]
-                price_money = random.randint(1000, 50000)
-            elif position == 'Participant' and event_scope:
-                points = POINTS_CONFIG['Participant'][event_scope]
-            elif event_scope:
-                points = POINTS_CONFIG['None'][event_scope]
-            
-            # Status (randomly choose, with bias toward approval)
-            status = random.choices(
-                EVENT_STATUSES, 
-                weights=[0.2, 0.7, 0.1],  # 20% pending, 70% approved, 10% rejected
-                k=1
-            )[0]
-            
-            # Only approved events contribute points
-            if status != "Approved":
-                points = 0
+                # Get the faculty for this student's class
+                faculty_id = class_faculty.get(student["class"])
+                if faculty_id is None:
+                    num_events = 0  # Skip if class not found
                 
-            # Create event object
-            event = {
-                "_id": ObjectId(),
-                "eventName": f"{category} - {fake.bs()}",
-                "description": fake.paragraph(),
-                "date": event_date,
-                "proofUrl": f"https://proof.example.com/{fake.uuid4()}",
-                "pdfDocument": f"https://docs.example.com/{fake.uuid4()}.pdf",
-                "category": category,
-                "positionSecured": position,
-                "status": status,
-                "pointsEarned": points,
-                "submittedBy": student["_id"],
-                "approvedBy": faculty_id if status != "Pending" else None,
-                "createdAt": event_date,
-                "updatedAt": datetime.datetime.now()
-            }
-            
-            # Add conditional fields
-            if event_location:
-                event["eventLocation"] = event_location
-            if other_college:
-                event["otherCollegeName"] = other_college
-            if event_scope:
-                event["eventScope"] = event_scope
-            if event_organizer:
-                event["eventOrganizer"] = event_organizer
-            if participation_type:
-                event["participationType"] = participation_type
-            if price_money:
-                event["priceMoney"] = price_money
+                for i in range(first, first + num_events):
+                    event = EventRecord(sample, i, student["_id"], faculty_id)
+                    
+                    # Add event to list
+                    events.append(event)
+                    
+                    # Add event to student's participated events
+                    student["eventsParticipated"].append(event["_id"])
+                    
+                    # Add points to student's total (zero unless approved)
+                    student["totalPoints"] += event["pointsEarned"]
                 
-            # Add event to list
-            events.append(event)
-            
-            # Add event to student's participated events
-            student["eventsParticipated"].append(event["_id"])
-            
-            # Add points to student's total if approved
-            if status == "Approved":
-                student["totalPoints"] += points
+                # The student is complete once all of its events exist
+                progress_bar.update(1)
+                yield student, events
+
+def build_shards(departments, years):
+    """Split the dataset into department/year shards with pre-assigned counter ranges"""
+    shards = []
+    students_per_year = CLASSES_PER_YEAR_PER_DEPT * STUDENTS_PER_CLASS
     
-    return events
+    for dept_index, dept in enumerate(departments):
+        for year_index, year in enumerate(years):
+            # Same numbering the sequential loops in create_* would produce
+            shard_index = dept_index * len(years) + year_index
+            shards.append({
+                "part": f"{shard_index:04d}",
+                "department": dept,
+                "year": year,
+                "advisor_start": shard_index * ADVISORS_PER_YEAR_PER_DEPT + 1,
+                "faculty_start": shard_index * CLASSES_PER_YEAR_PER_DEPT + 1,
+                "register_start": year_index * students_per_year + 1,
+            })
+    
+    return shards
 
-def seed_database():
-    """Main function to seed the database"""
-    start_time = time.time()
+def seed_rng(seed):
+    """Seed both random and Faker so generation is reproducible"""
+    random.seed(seed)
+    fake.seed_instance(seed)
+
+def estimate_dataset():
+    """Expected document counts and BSON sizes for the active scale configuration"""
+    dept = DEPARTMENTS[0]
+    year = YEARS[0]
     
-    # Clear existing data
-    clear_database()
+    # Generate a sample shard quietly; seeding reseeds the RNGs afterwards
+    with contextlib.redirect_stdout(io.StringIO()):
+        hods = create_hods()
+        academic_advisors = create_academic_advisors([dept], [year])
+        faculty = create_faculty([dept], [year], CLASSES_PER_YEAR_PER_DEPT)
+        classes = create_classes([dept], [year], faculty, academic_advisors, SECTIONS)
+        sample_students = []
+        sample_events = []
+        students = create_students([dept], [year], classes)
+        for student, events in create_events(students, classes, faculty, progress=False):
+            sample_students.append(student)
+            sample_events.extend(events)
+            if len(sample_students) >= SIZE_SAMPLE_STUDENTS:
+                break
     
-    # Define years for BTech program
-    years = [1, 2, 3, 4]
+    sample_teachers = list(hods.values()) + academic_advisors[dept][year] + faculty[dept][year]
+    sample_class = dict(classes[dept][year][0])
+    sample_class["students"] = [ObjectId() for _ in range(STUDENTS_PER_CLASS)]
     
-    # Create HODs
-    hods = create_hods()
+    def average_size(docs):
+        return sum(len(bson.encode(doc)) for doc in records.to_documents(docs)) / max(len(docs), 1)
+    
+    departments = len(DEPARTMENTS)
+    class_count = departments * len(YEARS) * CLASSES_PER_YEAR_PER_DEPT
+    student_count = class_count * STUDENTS_PER_CLASS
+    event_count = round(student_count * MAX_EVENTS_PER_STUDENT / 2)
+    teacher_count = departments * (1 + len(YEARS) * (ADVISORS_PER_YEAR_PER_DEPT + CLASSES_PER_YEAR_PER_DEPT))
+    
+    return {
+        TEACHER_COLLECTION: (teacher_count, teacher_count * average_size(sample_teachers)),
+        CLASS_COLLECTION: (class_count, class_count * average_size([sample_class])),
+        STUDENT_COLLECTION: (student_count, student_count * average_size(sample_students)),
+        EVENT_COLLECTION: (event_count, event_count * average_size(sample_events)),
+    }
+
+def print_estimate(scale, estimate):
+    """Print the scale configuration and its expected size"""
+    print(f"Scale '{scale['name']}': {len(DEPARTMENTS)} departments x {len(YEARS)} years x "
+          f"{CLASSES_PER_YEAR_PER_DEPT} classes x {STUDENTS_PER_CLASS} students, "
+          f"0-{MAX_EVENTS_PER_STUDENT} events per student")
+    print("Expected documents:")
+    total_bytes = 0
+    for collection, (count, size) in estimate.items():
+        print(f"- {collection}: {count:,} (~{size / 2 ** 20:,.1f} MB)")
+        total_bytes += size
+    print(f"Expected total: ~{total_bytes / 2 ** 20:,.1f} MB of BSON")
+
+def seed_shard(shard, settings):
+    """Generate one department/year shard and write it through the configured sink"""
+    global PASSWORDS, RUN_TIME, RUN_SEED
+    start_time = time.perf_counter()
+    
+    # Settings travel with the task so spawned workers agree with the parent
+    PASSWORDS = settings["passwords"]
+    RUN_TIME = settings["run_time"]
+    RUN_SEED = settings["seed"]
+    apply_scale(settings["scale"])
+    dept = shard["department"]
+    year = shard["year"]
+    seed_rng(f"{settings['seed']}:{dept}:{year}")
+    metrics = {}
+    
+    # Create academic advisors, faculty and classes for this shard
+    with seed_metrics.phase(metrics, "advisors") as counts:
+        academic_advisors = create_academic_advisors([dept], [year], shard["advisor_start"])
+        counts["docs"] = len(academic_advisors[dept][year])
+    with seed_metrics.phase(metrics, "faculty") as counts:
+        faculty = create_faculty([dept], [year], CLASSES_PER_YEAR_PER_DEPT, shard["faculty_start"])
+        counts["docs"] = len(faculty[dept][year])
+    with seed_metrics.phase(metrics, "classes") as counts:
+        classes = create_classes([dept], [year], faculty, academic_advisors, SECTIONS)
+        counts["docs"] = len(classes[dept][year])
+    
+    sink = sinks.open_sink(settings["sink"], shard["part"])
+    write = sink.write
+    
+    # Insert teachers
+    teachers = academic_advisors[dept][year] + faculty[dept][year]
+    write(TEACHER_COLLECTION, teachers)
+    
+    # Stream students and events through fixed-size chunks
+    chunk_size = settings["chunk_size"]
+    shard_classes = classes[dept][year]
+    students = seed_metrics.timed(create_students([dept], [year], classes, shard["register_start"]),
+                                  metrics, "students")
+    student_total = len(shard_classes) * STUDENTS_PER_CLASS
+    class_by_id = {class_obj["_id"]: class_obj for class_obj in shard_classes}
+    student_chunk = []
+    event_chunk = []
+    student_count = 0
+    event_count = 0
+    
+    events_stream = create_events(students, classes, faculty, total=student_total,
+                                  progress=settings["progress"])
+    for student, events in seed_metrics.timed(events_stream, metrics, "events",
+                                              size=lambda item: len(item[1])):
+        event_chunk.extend(events)
+        if len(event_chunk) >= chunk_size:
+            write(EVENT_COLLECTION, event_chunk)
+            event_count += len(event_chunk)
+            event_chunk = []
+        
+        # Class membership only grows with this shard, so it stays in memory
+        class_by_id[student["class"]]["students"].append(student["_id"])
+        student_chunk.append(student)
+        if len(student_chunk) >= chunk_size:
+            write(STUDENT_COLLECTION, student_chunk)
+            student_count += len(student_chunk)
+            student_chunk = []
     
-    # Create academic advisors
-    academic_advisors = create_academic_advisors(DEPARTMENTS, years)
+    # Flush whatever is left in the buffers
+    if event_chunk:
+        write(EVENT_COLLECTION, event_chunk)
+        event_count += len(event_chunk)
+    if student_chunk:
+        write(STUDENT_COLLECTION, student_chunk)
+        student_count += len(student_chunk)
     
-    # Create faculty
-    faculty = create_faculty(DEPARTMENTS, years, CLASSES_PER_YEAR_PER_DEPT)
+    # Classes go last, once their student lists are complete; a dump cannot be updated later
+    write(CLASS_COLLECTION, shard_classes)
+    sink.close()
     
-    # Create classes
-    classes = create_classes(DEPARTMENTS, years, faculty, academic_advisors, SECTIONS)
+    # Students are pulled from inside the events generator; keep the phases exclusive
+    seed_metrics.exclude(metrics, "events", "students")
+    seed_metrics.record_sink_stats(metrics, sink.stats)
     
-    # Create students
-    students = create_students(DEPARTMENTS, years, classes)
+    return {
+        "seconds": time.perf_counter() - start_time,
+        "sink_stats": sink.stats,
+        "metrics": metrics,
+        "department": dept,
+        "year": year,
+        "teachers": len(teachers),
+        "classes": len(shard_classes),
+        "students": student_count,
+        "events": event_count,
+    }
+
+def seed_shard_task(task):
+    """Pool entry point unpacking a (shard, settings) task"""
+    return seed_shard(*task)
+
+def seed_database(chunk_size=CHUNK_SIZE, workers=1, seed=None, scale_factor=DEFAULT_SCALE,
+                  estimate_only=False, sink_kind="mongo", dump_name=None, metrics_json=None,
+                  metrics_prometheus=None, build_indexes=True, force=False, bcrypt_rounds=BCRYPT_ROUNDS,
+                  hash_workers=passwords.HASH_WORKERS, hash_cache=passwords.HASH_CACHE_PATH):
+    """Main function to seed the database"""
+    global PASSWORDS, RUN_TIME
+    start_time = time.time()
+    metrics = {}
     
-    # Create events
-    events = create_events(students, classes, faculty)
+    # Without an explicit seed pick one, so the run can still be reproduced
+    fixed_salts = seed is not None
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    else:
+        RUN_TIME = SEEDED_RUN_TIME
+    PASSWORDS = build_passwords(seed, fixed_salts, bcrypt_rounds, hash_workers, hash_cache)
     
-    # Insert data into database
-    print("Inserting data into database...")
+    # Size the dataset and report what is about to be written; the sample needs the real password hashes
+    scale = resolve_scale(scale_factor)
+    apply_scale(scale)
+    print_estimate(scale, estimate_dataset())
+    if estimate_only:
+        return
+    print(f"Using seed {seed}")
+    
+    # Clear existing data, or start a fresh output directory
+    sink_spec = sinks.sink_spec(sink_kind, MONGO_URI, DB_NAME, dump_name)
+    if sink_kind == "mongo":
+        connect()
+        clear_database()
+    try:
+        sinks.prepare_sink(sink_spec, force)
+    except FileExistsError as e:
+        raise SystemExit(str(e))
+    if sink_spec["path"] is not None:
+        print(f"Writing {sink_kind} output to {sink_spec['path']}")
+    
+    # Create HODs
+    seed_rng(f"{seed}:HOD")
+    with seed_metrics.phase(metrics, "hods") as counts:
+        hods = create_hods()
+        counts["docs"] = len(hods)
     
     # Insert HODs
-    all_teachers = list(hods.values())
+    hod_sink = sinks.open_sink(sink_spec, "hods")
+    hod_sink.write(TEACHER_COLLECTION, list(hods.values()))
+    hod_sink.close()
+    sink_stats = sinks.merge_stats({}, hod_sink.stats)
+    print(f"Inserted {len(hods)} HODs")
     
-    # Insert academic advisors
-    for dept in DEPARTMENTS:
-        for year in years:
-            all_teachers.extend(academic_advisors[dept][year])
+    # Every department/year pair is independent once its counters are fixed
+    shards = build_shards(DEPARTMENTS, YEARS)
+    settings = {
+        "sink": sink_spec,
+        "seed": seed,
+        "passwords": PASSWORDS,
+        "run_time": RUN_TIME,
+        "chunk_size": chunk_size,
+        "progress": workers == 1,
+        "scale": scale,
+    }
+    tasks = [(shard, settings) for shard in shards]
     
-    # Insert faculty
-    for dept in DEPARTMENTS:
-        for year in years:
-            all_teachers.extend(faculty[dept][year])
+    print(f"Seeding {len(shards)} department/year shards with {workers} worker(s), "
+          f"chunks of {chunk_size}...")
+    totals = {"teachers": len(hods), "classes": 0, "students": 0, "events": 0}
+    shard_seconds = 0.0
     
-    # Insert teachers
-    db.teacher.insert_many(all_teachers)
-    print(f"Inserted {len(all_teachers)} teachers")
+    if workers == 1:
+        results = map(seed_shard_task, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(seed_shard_task, tasks)
     
-    # Flatten classes
-    all_classes = []
-    for dept in DEPARTMENTS:
-        for year in years:
-            all_classes.extend(classes[dept][year])
+    try:
+        for result in results:
+            print(f"Shard {result['department']} year {result['year']} done: "
+                  f"{result['students']} students, {result['events']} events")
+            for key in totals:
+                totals[key] += result[key]
+            sinks.merge_stats(sink_stats, result["sink_stats"])
+            seed_metrics.merge(metrics, result["metrics"])
+            shard_seconds += result["seconds"]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
     
-    # Insert classes
-    db.class.insert_many(all_classes)
-    print(f"Inserted {len(all_classes)} classes")
+    collections = [TEACHER_COLLECTION, CLASS_COLLECTION, STUDENT_COLLECTION, EVENT_COLLECTION]
     
-    # Insert students
-    db.student.insert_many(students)
-    print(f"Inserted {len(students)} students")
+    # Stitch the per-shard parts together in shard order so output is independent of workers;
+    # a dump carries the index specs for mongorestore to build after loading
+    if sink_spec["path"] is not None:
+        parts = ["hods"] + [shard["part"] for shard in shards]
+        indexes = {}
+        if build_indexes:
+            indexes = {collection: seed_indexes.metadata_indexes(collection) for collection in collections}
+        sizes = sinks.finish_sink(sink_spec, collections, parts, indexes, seed)
+        for collection, size in sizes.items():
+            print(f"Wrote {os.path.join(sink_spec['path'], collection)}.{sink_kind} ({size / 2 ** 20:,.1f} MB)")
+        if sink_kind == "bson":
+            print(f"Restore with: mongorestore --db {DB_NAME} {sink_spec['path']}")
     
-    # Insert events
-    if events:
-        db.event.insert_many(events)
-        print(f"Inserted {len(events)} events")
+    # Indexing after the bulk load is far cheaper than maintaining indexes during inserts
+    if sink_kind == "mongo" and build_indexes:
+        print("Building indexes...")
+        index_results = seed_indexes.build_indexes(db, collections)
+        for collection, name, seconds, size in index_results:
+            seed_metrics.record(metrics, f"index:{collection}", seconds, 0.0, bytes_written=size)
+        seed_indexes.print_index_report(index_results)
+    
+    # Per-phase figures; insert phases include the HOD write done here
+    seed_metrics.record_sink_stats(metrics, hod_sink.stats)
+    write_seconds = sum(entry["seconds"] for entry in sink_stats.values())
+    report = seed_metrics.build_report(metrics, {
+        "scale": scale,
+        "seed": seed,
+        "workers": workers,
+        "sink": sink_kind,
+        "chunk_size": chunk_size,
+        "wall_seconds": time.time() - start_time,
+        "generation_seconds": shard_seconds - write_seconds,
+        "write_seconds": write_seconds,
+        "peak_rss_bytes": max(entry["peak_rss_bytes"] for entry in metrics.values()),
+    })
+    seed_metrics.print_report(report)
+    if metrics_json:
+        seed_metrics.write_json(report, metrics_json)
+        print(f"Metrics written to {metrics_json}")
+    if metrics_prometheus:
+        seed_metrics.write_prometheus(report, metrics_prometheus)
+        print(f"Prometheus metrics written to {metrics_prometheus}")
     
     # Print summary
     print("\nDatabase seeding completed!")
-    print(f"- {len(all_teachers)} teachers created")
-    print(f"- {len(all_classes)} classes created")
-    print(f"- {len(students)} students created")
-    print(f"- {len(events)} events created")
+    print(f"- {totals['teachers']} teachers created")
+    print(f"- {totals['classes']} classes created")
+    print(f"- {totals['students']} students created")
+    print(f"- {totals['events']} events created")
+    print(f"Total time: {time.time() - start_time:.2f} seconds")
+
+def academic_span_start(class_obj):
+    """Registration year of the cohort a class holds: '2024-2028' -> 2024"""
+    span = class_obj.get("academicYear") or ""
+    return int(span[:4]) if span[:4].isdigit() else YEAR_TO_REG[class_obj["year"]]
+
+def register_counter(student):
+    """Numeric part of a YYYY[DEPT]XXX register number, or None for other formats"""
+    prefix = f"{student.get('registrationYear')}{student.get('department')}"
+    reg_no = student.get("registerNo") or ""
+    suffix = reg_no[len(prefix):]
+    return int(suffix) if reg_no.startswith(prefix) and suffix.isdigit() else None
+
+def load_classes():
+    """Existing classes this generator can place students in, with their faculty and members"""
+    classes = db[CLASS_COLLECTION].find({}, {"year": 1, "section": 1, "className": 1, "department": 1,
+                                             "academicYear": 1, "assignedFaculty": 1, "students": 1})
+    return [class_obj for class_obj in classes if class_obj.get("assignedFaculty")
+            and all(class_obj.get(key) is not None for key in ("year", "section", "department"))]
+
+def discover_dataset():
+    """Classes, register counters and enrolled students of the existing database, in one pass each"""
+    print("Reading existing classes and students...")
+    classes = load_classes()
+    counters = {}
+    enrolled = []
+    scanned = 0
+    projection = {"registerNo": 1, "registrationYear": 1, "department": 1, "class": 1, "isArchived": 1}
+    for student in db[STUDENT_COLLECTION].find({}, projection):
+        scanned += 1
+        counter = register_counter(student)
+        if counter is not None:
+            key = (student["department"], student["registrationYear"])
+            counters[key] = max(counters.get(key, 0), counter)
+        if student.get("class") is not None and not student.get("isArchived"):
+            enrolled.append((student["_id"], student["class"]))
+    
+    print(f"Found {len(classes)} classes, {scanned} students ({len(enrolled)} enrolled)")
+    return {"classes": classes, "counters": counters, "enrolled": enrolled, "students": scanned,
+            "events": db[EVENT_COLLECTION].estimated_document_count()}
+
+def nest_classes(classes):
+    """department -> year -> classes, the shape create_events takes"""
+    nested = {}
+    for class_obj in classes:
+        nested.setdefault(class_obj["department"], {}).setdefault(class_obj["year"], []).append(class_obj)
+    return nested
+
+def update_in_batches(collection, operations):
+    for start in range(0, len(operations), APPEND_BATCH):
+        db[collection].bulk_write(operations[start:start + APPEND_BATCH], ordered=False)
+
+def append_students(placements, dataset, sink, chunk_size):
+    """Generate a student (and its events) per (class, registration year, academic year) placement.
+
+    Register numbers continue from the discovered counters, and each class gets one $push of
+    its new members, so class.students and eventsParticipated stay consistent.
+    """
+    def students():
+        for class_obj, reg_year, academic_year in placements:
+            key = (class_obj["department"], reg_year)
+            dataset["counters"][key] = dataset["counters"].get(key, 0) + 1
+            reg_no = f"{reg_year}{class_obj['department']}{dataset['counters'][key]:03d}"
+            yield build_student(class_obj, reg_no, reg_year, academic_year)
+    
+    members = {}
+    student_chunk = []
+    event_chunk = []
+    event_count = 0
+    for student, events in create_events(students(), nest_classes(dataset["classes"]), None,
+                                         total=len(placements)):
+        event_chunk.extend(events)
+        if len(event_chunk) >= chunk_size:
+            sink.write(EVENT_COLLECTION, event_chunk)
+            event_count += len(event_chunk)
+            event_chunk = []
+        
+        members.setdefault(student["class"], []).append(student["_id"])
+        dataset["enrolled"].append((student["_id"], student["class"]))
+        student_chunk.append(student)
+        if len(student_chunk) >= chunk_size:
+            sink.write(STUDENT_COLLECTION, student_chunk)
+            student_chunk = []
+    
+    if event_chunk:
+        sink.write(EVENT_COLLECTION, event_chunk)
+        event_count += len(event_chunk)
+    if student_chunk:
+        sink.write(STUDENT_COLLECTION, student_chunk)
+    
+    # Students exist before the classes point at them; existing documents are stamped with the real time
+    # (not a seeded RUN_TIME) so incremental refreshes see the change
+    now = datetime.datetime.now(datetime.timezone.utc)
+    update_in_batches(CLASS_COLLECTION, [
+        pymongo.UpdateOne({"_id": class_id}, {"$push": {"students": {"$each": ids}},
+                                              "$set": {"updatedAt": now}})
+        for class_id, ids in members.items()])
+    return len(placements), event_count
+
+def spread_students(classes, count):
+    """count placements spread evenly over classes, smallest classes first"""
+    placements = []
+    targets = sorted(classes, key=lambda class_obj: len(class_obj.get("students") or []))
+    for i, class_obj in enumerate(targets):
+        share = count // len(targets) + (i < count % len(targets))
+        placements.extend([(class_obj, academic_span_start(class_obj), class_obj["academicYear"])] * share)
+    return placements
+
+def append_intake(dataset, sink, chunk_size):
+    """Close the academic year with the year-end job, then enroll a first-year cohort as large as the last"""
+    first_year = [class_obj for class_obj in dataset["classes"] if class_obj["year"] == 1]
+    if not first_year:
+        raise SystemExit("No first-year classes to enroll a new intake into")
+    latest = max(academic_span_start(class_obj) for class_obj in first_year)
+    sizes = {class_obj["_id"]: len(class_obj.get("students") or []) for class_obj in first_year}
+    
+    print(f"Closing academic year {latest}-{latest + 1}...")
+    year_end.run_year_end(db, f"{latest}-{latest + 1}")
+    
+    # The year end moved every cohort up and advanced the first-year classes' academicYear
+    dataset["classes"] = load_classes()
+    placements = []
+    for class_obj in dataset["classes"]:
+        if class_obj["year"] == 1:
+            share = sizes.get(class_obj["_id"]) or STUDENTS_PER_CLASS
+            placements.extend([(class_obj, academic_span_start(class_obj), class_obj["academicYear"])] * share)
+    print(f"Enrolling {len(placements)} students registered in {latest + 1}...")
+    return append_students(placements, dataset, sink, chunk_size)
+
+def append_events(dataset, count, sink, chunk_size):
+    """Spread count new events over enrolled students, adding them to eventsParticipated and totalPoints"""
+    print(f"Creating {count} events for existing students...")
+    class_faculty = build_class_faculty_index(nest_classes(dataset["classes"]))
+    targets = [(student_id, class_faculty[class_id]) for student_id, class_id in dataset["enrolled"]
+               if class_id in class_faculty]
+    if not targets:
+        raise SystemExit("No enrolled students to add events to")
+    
+    rng = np.random.default_rng(random.getrandbits(64))
+    text_pools = run_text_pools()
+    points_table = build_points_table()
+    one_year_ago = RUN_TIME - datetime.timedelta(days=365)
+    owners = rng.integers(0, len(targets), size=count)
+    
+    updates = {}
+    for start in tqdm(range(0, count, chunk_size)):
+        rows = owners[start:start + chunk_size].tolist()
+        sample = sample_events(rng, len(rows), one_year_ago, RUN_TIME, text_pools, points_table)
+        events = []
+        for i, target in enumerate(rows):
+            student_id, faculty_id = targets[target]
+            event = build_event(sample, i, student_id, faculty_id)
+            events.append(event)
+            entry = updates.setdefault(student_id, {"ids": [], "points": 0})
+            entry["ids"].append(event["_id"])
+            entry["points"] += event["pointsEarned"]
+        sink.write(EVENT_COLLECTION, events)
+    
+    # Real time, not RUN_TIME: a seeded run's fixed clock would hide these students from incremental refreshes
+    now = datetime.datetime.now(datetime.timezone.utc)
+    update_in_batches(STUDENT_COLLECTION, [
+        pymongo.UpdateOne({"_id": student_id}, {"$push": {"eventsParticipated": {"$each": entry["ids"]}},
+                                                "$inc": {"totalPoints": entry["points"]},
+                                                "$set": {"updatedAt": now}})
+        for student_id, entry in updates.items()])
+    return count
+
+def append_database(add_students=0, add_events=0, add_years=0, chunk_size=CHUNK_SIZE, seed=None,
+                    scale_factor=DEFAULT_SCALE, bcrypt_rounds=BCRYPT_ROUNDS, hash_workers=passwords.HASH_WORKERS,
+                    hash_cache=passwords.HASH_CACHE_PATH):
+    """Grow the existing database in place: new intakes, students and events, without clearing it"""
+    global PASSWORDS, RUN_TIME, RUN_SEED
+    start_time = time.time()
+    apply_scale(resolve_scale(scale_factor))
+    fixed_salts = seed is not None
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    else:
+        RUN_TIME = SEEDED_RUN_TIME
+    PASSWORDS = build_passwords(seed, fixed_salts, bcrypt_rounds, hash_workers, hash_cache)
+    RUN_SEED = seed
+    print(f"Using seed {seed}")
+    
+    connect()
+    dataset = discover_dataset()
+    if not dataset["classes"]:
+        raise SystemExit("No classes found; seed the database before appending to it")
+    
+    # The current size goes into the seed so appending twice with one seed never repeats an _id
+    seed_rng(f"{seed}:append:{dataset['students']}:{dataset['events']}")
+    sink = sinks.open_sink(sinks.sink_spec("mongo", MONGO_URI, DB_NAME), "append")
+    totals = {"students": 0, "events": 0}
+    
+    for _ in range(add_years):
+        students, events = append_intake(dataset, sink, chunk_size)
+        totals["students"] += students
+        totals["events"] += events
+    if add_years:
+        # Promotions and graduations changed who is enrolled where
+        dataset.update(discover_dataset())
+    
+    if add_students:
+        print(f"Adding {add_students} students to {len(dataset['classes'])} existing classes...")
+        students, events = append_students(spread_students(dataset["classes"], add_students),
+                                           dataset, sink, chunk_size)
+        totals["students"] += students
+        totals["events"] += events
+    
+    if add_events:
+        totals["events"] += append_events(dataset, add_events, sink, chunk_size)
+    sink.close()
+    
+    print("\nAppend completed!")
+    print(f"- {add_years} academic years added")
+    print(f"- {totals['students']} students created")
+    print(f"- {totals['events']} events created")
     print(f"Total time: {time.time() - start_time:.2f} seconds")
 
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description="Seed the leaderboard database with generated data")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"documents buffered per collection before writing (default: {CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes generating department/year shards in parallel (default: 1)")
+    parser.add_argument("--seed", type=int,
+                        help="base RNG seed; the same seed yields the same data for any worker count")
+    parser.add_argument("--scale-factor", default=DEFAULT_SCALE,
+                        help=f"dataset size: one of {', '.join(SCALE_PRESETS)} or a multiple of the "
+                             f"{DEFAULT_SCALE} preset such as 2 or 10 (default: {DEFAULT_SCALE})")
+    parser.add_argument("--sink", choices=sinks.SINK_KINDS,
+                        help="where documents go: mongo (default), bson dump, jsonl files, or null "
+                             "to measure generation alone")
+    parser.add_argument("--dump", metavar="NAME",
+                        help=f"output directory {bson_dump.DUMP_ROOT}/NAME for the bson and jsonl sinks "
+                             f"(default: {bson_dump.default_dump_name(DB_NAME)}); implies --sink bson when "
+                             f"--sink is not given")
+    parser.add_argument("--force", action="store_true",
+                        help="replace a non-empty dump directory instead of refusing to write into it")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="write per-phase timings, docs/sec, bytes and peak RSS as JSON")
+    parser.add_argument("--metrics-prometheus", metavar="PATH",
+                        help="write the same metrics in Prometheus text format")
+    parser.add_argument("--no-index", action="store_true",
+                        help="skip building the leaderboard/report indexes after the load")
+    parser.add_argument("--estimate-only", action="store_true",
+                        help="print the expected document counts and sizes without writing anything")
+    parser.add_argument("--add-students", type=int, default=0, metavar="N",
+                        help="append N students (with their events) to the existing classes instead of reseeding")
+    parser.add_argument("--add-events", type=int, default=0, metavar="N",
+                        help="append N events spread over the existing enrolled students")
+    parser.add_argument("--add-years", type=int, default=0, metavar="N",
+                        help="append N academic years: run the year end, then enroll a new first-year intake")
+    parser.add_argument("--bcrypt-rounds", type=int, default=BCRYPT_ROUNDS,
+                        help=f"bcrypt cost factor, 4-31; lower is faster (default: {BCRYPT_ROUNDS})")
+    parser.add_argument("--hash-workers", type=int, default=passwords.HASH_WORKERS,
+                        help=f"processes hashing passwords (default: {passwords.HASH_WORKERS}, the CPU count)")
+    parser.add_argument("--hash-cache", default=passwords.HASH_CACHE_PATH,
+                        help=f"file mapping raw passwords to hashes, reused across runs "
+                             f"(default: {passwords.HASH_CACHE_PATH})")
+    parser.add_argument("--no-hash-cache", action="store_true", help="neither read nor write the hash cache")
+    args = parser.parse_args()
+    
+    try:
+        resolve_scale(args.scale_factor)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 4 <= args.bcrypt_rounds <= 31:
+        parser.error("--bcrypt-rounds must be between 4 and 31")
+    hashing = {"bcrypt_rounds": args.bcrypt_rounds, "hash_workers": args.hash_workers,
+               "hash_cache": None if args.no_hash_cache else args.hash_cache}
+    
+    sink_kind = args.sink or ("bson" if args.dump else "mongo")
+    
+    if args.add_students or args.add_events or args.add_years:
+        if sink_kind != "mongo":
+            parser.error("appending needs the mongo sink; a dump is always written from scratch")
+        append_database(args.add_students, args.add_events, args.add_years, args.chunk_size, args.seed,
+                        args.scale_factor, **hashing)
+    else:
+        seed_database(args.chunk_size, args.workers, args.seed, args.scale_factor, args.estimate_only,
+                      sink_kind, args.dump, args.metrics_json, args.metrics_prometheus, not args.no_index,
+                      args.force, **hashing)
@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+
+import bcrypt
+
+# Password hashing configuration
+BCRYPT_ROUNDS = 12  # bcrypt.gensalt's default cost; 4 is plenty for throwaway test data
+HASH_WORKERS = os.cpu_count() or 1
+HASH_CACHE_PATH = "password_hashes.json"  # rawPassword -> hash, kept between runs
+
+# bcrypt spells base64 with its own alphabet
+BCRYPT_ALPHABET = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+
+password_cache = {}
+
+def fixed_salt(password, rounds):
+    """bcrypt salt derived from the password, so seeded runs store the same hash every time"""
+    digest = hashlib.sha256(f"{password}:salt".encode()).digest()[:16]
+    return f"$2b${rounds:02d}$".encode() + base64.b64encode(digest).rstrip(b"=").translate(BCRYPT_ALPHABET)
+
+def hash_password(args):
+    """bcrypt hash of one (password, rounds, fixed) task; the process pool's unit of work"""
+    password, rounds, fixed = args
+    salt = fixed_salt(password, rounds) if fixed else bcrypt.gensalt(rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def cached_hash(password, rounds=BCRYPT_ROUNDS, fixed=False):
+    """Cached hash of password if it was made with this cost factor, and with its fixed salt when one is wanted"""
+    hashed = password_cache.get(password)
+    if hashed is None:
+        return None
+    if fixed:
+        return hashed if hashed.encode().startswith(fixed_salt(password, rounds)) else None
+    return hashed if rounds == int(hashed.split("$")[2]) else None
+
+def load_password_cache(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            password_cache.update(json.load(f))
+        print(f"Loaded {len(password_cache)} cached password hashes from {path}")
+
+def save_password_cache(path):
+    """Write the cache atomically so an interrupted run never leaves half a file"""
+    if not path:
+        return
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(password_cache, f)
+    os.replace(temporary, path)
+
+def hash_passwords(docs, workers=HASH_WORKERS, pool=None, rounds=BCRYPT_ROUNDS, fixed=False):
+    """Fill in each document's password from its rawPassword.
+
+    Every distinct password missing from the cache is hashed once, across a process pool
+    when there is more than one; documents sharing a password share its hash. Callers
+    hashing repeatedly pass their own pool so its processes are started only once.
+    """
+    missing = sorted({doc["rawPassword"] for doc in docs if cached_hash(doc["rawPassword"], rounds, fixed) is None})
+    tasks = [(password, rounds, fixed) for password in missing]
+    if len(tasks) > 1 and workers > 1:
+        print(f"Hashing {len(tasks)} passwords with {workers} processes (cost {rounds})...")
+        chunksize = max(1, len(tasks) // (workers * 4))
+        if pool is not None:
+            hashes = pool.map(hash_password, tasks, chunksize=chunksize)
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                hashes = pool.map(hash_password, tasks, chunksize=chunksize)
+    else:
+        hashes = [hash_password(task) for task in tasks]
+    password_cache.update(zip(missing, hashes))
+
+    for doc in docs:
+        doc["password"] = password_cache[doc["rawPassword"]]
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+EVENT_COLLECTION = 'events'
+
+CHUNK_SIZE = 1000  # Students checked per chunk
+CHECKPOINT_PATH = 'points_consistency.checkpoint.json'
+GRACE_SECONDS = 120  # Students with events touched this recently are left for the next run
+PAUSE_SECONDS = 0.0
+
+def load_checkpoint(path):
+    """Progress saved by an interrupted run, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically so a crash never leaves half a file"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temporary, path)
+
+def new_checkpoint():
+    return {"lastId": None, "startedAt": datetime.now(timezone.utc).isoformat(), "students": 0,
+            "pointsMismatches": 0, "eventsMismatches": 0, "updatesApplied": 0, "updatesSkipped": 0,
+            "skippedBusy": 0, "orphanEvents": 0}
+
+def student_chunks(db, last_id=None, chunk_size=CHUNK_SIZE):
+    """Students in _id order, chunk_size at a time, starting after last_id"""
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        chunk = list(db[STUDENT_COLLECTION].find(query, {"totalPoints": 1, "eventsParticipated": 1})
+                     .sort("_id", 1).limit(chunk_size))
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]["_id"]
+
+def event_totals(db, first_id, last_id):
+    """Per submittedBy in [first_id, last_id]: approved points, every event id and the latest update"""
+    pipeline = [
+        {"$match": {"submittedBy": {"$gte": first_id, "$lte": last_id}}},
+        {"$group": {
+            "_id": "$submittedBy",
+            "approvedPoints": {"$sum": {"$cond": [{"$eq": ["$status", "Approved"]},
+                                                  {"$ifNull": ["$pointsEarned", 0]}, 0]}},
+            "events": {"$push": "$_id"},
+            "lastUpdated": {"$max": "$updatedAt"},
+        }},
+    ]
+    return {group["_id"]: group for group in db[EVENT_COLLECTION].aggregate(pipeline)}
+
+def check_chunk(chunk, totals, busy_after, now):
+    """Repairs for one chunk of students; returns (operations, counts)"""
+    operations = []
+    counts = {"pointsMismatches": 0, "eventsMismatches": 0, "skippedBusy": 0, "orphanEvents": 0}
+    student_ids = {student["_id"] for student in chunk}
+    counts["orphanEvents"] = sum(len(group["events"]) for owner, group in totals.items()
+                                 if owner not in student_ids)
+
+    for student in chunk:
+        group = totals.get(student["_id"], {"approvedPoints": 0, "events": [], "lastUpdated": None})
+        expected_points = group["approvedPoints"]
+        current_points = student.get("totalPoints")
+        listed = student.get("eventsParticipated") or []
+        owned = set(group["events"])
+        listed_ids = set(listed)
+        missing = [event_id for event_id in group["events"] if event_id not in listed_ids]
+        extra = [event_id for event_id in listed if event_id not in owned]
+
+        points_wrong = current_points != expected_points
+        if not points_wrong and not missing and not extra:
+            continue
+        counts["pointsMismatches"] += points_wrong
+        counts["eventsMismatches"] += bool(missing or extra)
+
+        # An approval in flight saves the event before incrementing the student; leave those alone
+        last_updated = group["lastUpdated"]
+        if last_updated is not None:
+            if last_updated.tzinfo is None:
+                last_updated = last_updated.replace(tzinfo=timezone.utc)
+            if last_updated >= busy_after:
+                counts["skippedBusy"] += 1
+                continue
+
+        # Only repair if totalPoints is still what was read, so a concurrent $inc is never overwritten
+        # Every repair bumps updatedAt, as Mongoose would, so leaderboard_ranks' incremental refresh sees it
+        match = {"_id": student["_id"], "totalPoints": current_points}
+        if points_wrong:
+            operations.append(UpdateOne(match, {"$set": {"totalPoints": expected_points, "updatedAt": now}}))
+            match = {"_id": student["_id"], "totalPoints": expected_points}
+        if missing:
+            operations.append(UpdateOne(match, {"$addToSet": {"eventsParticipated": {"$each": missing}},
+                                                "$set": {"updatedAt": now}}))
+        if extra:
+            operations.append(UpdateOne(match, {"$pull": {"eventsParticipated": {"$in": extra}},
+                                                "$set": {"updatedAt": now}}))
+    return operations, counts
+
+def run_check(db, checkpoint_path=CHECKPOINT_PATH, chunk_size=CHUNK_SIZE, dry_run=False, restart=False,
+              pause=PAUSE_SECONDS, grace=GRACE_SECONDS):
+    """Check every student chunk by chunk, resuming from the checkpoint when one exists"""
+    checkpoint = None if restart else load_checkpoint(checkpoint_path)
+    if checkpoint is None:
+        checkpoint = new_checkpoint()
+    else:
+        print(f"Resuming after {checkpoint['lastId']} ({checkpoint['students']:,} students already checked)")
+    last_id = ObjectId(checkpoint["lastId"]) if checkpoint["lastId"] else None
+
+    start = time.perf_counter()
+    for chunk in student_chunks(db, last_id, chunk_size):
+        now = datetime.now(timezone.utc)
+        totals = event_totals(db, chunk[0]["_id"], chunk[-1]["_id"])
+        operations, counts = check_chunk(chunk, totals, now - timedelta(seconds=grace), now)
+
+        if operations and not dry_run:
+            result = db[STUDENT_COLLECTION].bulk_write(operations, ordered=True)
+            checkpoint["updatesSkipped"] += len(operations) - result.matched_count
+            checkpoint["updatesApplied"] += result.modified_count
+        for key, value in counts.items():
+            checkpoint[key] += value
+        checkpoint["students"] += len(chunk)
+        checkpoint["lastId"] = str(chunk[-1]["_id"])
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - start
+        print(f"\rChecked {checkpoint['students']:,} students ({checkpoint['students'] / elapsed:,.0f}/s), "
+              f"{checkpoint['pointsMismatches']:,} totalPoints and {checkpoint['eventsMismatches']:,} "
+              f"eventsParticipated mismatches", end="", flush=True)
+        if pause:
+            time.sleep(pause)
+    print()
+
+    # A finished run starts from the beginning next time
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint["seconds"] = time.perf_counter() - start
+    return checkpoint
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check student totalPoints and eventsParticipated against their events and repair drift")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"students per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH,
+                        help=f"progress file used to resume (default: {CHECKPOINT_PATH})")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--pause", type=float, default=PAUSE_SECONDS,
+                        help="seconds to sleep between chunks to leave room for live traffic")
+    parser.add_argument("--grace", type=int, default=GRACE_SECONDS,
+                        help=f"skip students with events updated this many seconds ago (default: {GRACE_SECONDS})")
+    parser.add_argument("--dry-run", action="store_true", help="report mismatches without repairing them")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    summary = run_check(db, args.checkpoint, args.chunk_size, args.dry_run, args.restart, args.pause, args.grace)
+    print(f"{summary['students']:,} students checked in {summary['seconds']:.2f}s: "
+          f"{summary['pointsMismatches']:,} totalPoints and {summary['eventsMismatches']:,} eventsParticipated "
+          f"mismatches{' (dry run)' if args.dry_run else ''}; {summary['updatesApplied']:,} repair updates applied, "
+          f"{summary['updatesSkipped']:,} skipped because totalPoints changed meanwhile, "
+          f"{summary['skippedBusy']:,} busy students left for later, {summary['orphanEvents']:,} events "
+          f"from unknown students inside the checked ranges")
@@ -0,0 +1,220 @@
+import argparse
+import json
+import re
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from pymongo import DESCENDING, MongoClient, UpdateOne
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+EVENT_COLLECTION = 'events'
+STUDENT_COLLECTION = 'students'
+POINTS_CONFIG_COLLECTION = 'pointsconfigs'
+
+BATCH_SIZE = 5000
+
+# Paths event[field] resolves to on a Mongoose Event document; anything else is only
+# found through customAnswers, exactly as PointsCalculationService reads it
+EVENT_SCHEMA_FIELDS = ['_id', 'eventName', 'description', 'date', 'proofUrl', 'pdfDocument', 'status',
+                       'category', 'customAnswers', 'dynamicFields', 'pointsEarned', 'submittedBy',
+                       'approvedBy', 'createdAt', 'updatedAt']
+
+def active_configuration(db):
+    """configuration of the active categoryRules document, as PointsConfig.getCurrentConfig picks it"""
+    config = db[POINTS_CONFIG_COLLECTION].find_one(
+        {"configType": "categoryRules", "isActive": True},
+        sort=[("effectiveDate", DESCENDING), ("version", DESCENDING)])
+    return (config or {}).get("configuration")
+
+def js_key(value):
+    """The property name JavaScript looks up for configuration[category][field][value]"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ",".join("" if v is None else js_key(v) for v in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+def js_truthy(value):
+    return value not in (None, False, 0, "") and value == value
+
+def normalize(name):
+    """Field/answer name as the service compares them: lowercase, whitespace runs as underscores"""
+    return re.sub(r"\s+", "_", name.lower())
+
+def compile_rules(configurations):
+    """Lookup tables for one or more categoryRules configurations.
+
+    Every (category, field, value) with points becomes a slot; slot 0 scores nothing. The
+    slots are shared by all configurations so one slot matrix scores an event batch under
+    each of them; points[c] holds configuration c's points per slot.
+    """
+    categories = {}
+    slots = {}
+    for configuration in configurations:
+        for category, fields in (configuration or {}).items():
+            field_list = categories.setdefault(category, [])
+            for field, values in (fields or {}).items():
+                if field not in field_list:
+                    field_list.append(field)
+                for value in (values or {}):
+                    slots.setdefault((category, field, value), len(slots) + 1)
+
+    points = np.zeros((len(configurations), len(slots) + 1), dtype=np.float64)
+    for c, configuration in enumerate(configurations):
+        for (category, field, value), slot in slots.items():
+            raw = ((configuration or {}).get(category) or {}).get(field, {}) or {}
+            amount = raw.get(value) if isinstance(raw, dict) else None
+            if js_truthy(amount):
+                points[c, slot] = float(amount)
+
+    return {
+        "categories": categories,
+        "slots": slots,
+        "points": points,
+        "width": max((len(fields) for fields in categories.values()), default=0),
+        "fields": sorted({field for fields in categories.values() for field in fields}),
+        "matches": {},
+    }
+
+def answer_keys(rules, category, fields, answers):
+    """customAnswers key each field reads, None for none; cached per category and key set"""
+    keys = tuple(answers)
+    cache_key = (category, keys)
+    if cache_key not in rules["matches"]:
+        matched = []
+        for field in fields:
+            if field in answers:
+                matched.append(field)
+                continue
+            # The service's fuzzy fallback: first key whose normalized name contains, or is contained in, the field's
+            normalized_field = normalize(field)
+            matched.append(next((key for key in keys if normalize(key) in normalized_field
+                                 or normalized_field in normalize(key)), None))
+        rules["matches"][cache_key] = matched
+    return rules["matches"][cache_key]
+
+def event_slots(rules, events):
+    """Slot matrix (events x widest category) for a batch; unmatched cells are 0"""
+    slots = rules["slots"]
+    matrix = np.zeros((len(events), rules["width"]), dtype=np.int64)
+    for row, event in enumerate(events):
+        category = event.get("category")
+        fields = rules["categories"].get(category)
+        if not fields:
+            continue
+        answers = event.get("customAnswers")
+        keys = answer_keys(rules, category, fields, answers) if isinstance(answers, dict) else None
+        for column, field in enumerate(fields):
+            value = event.get(field) if field in EVENT_SCHEMA_FIELDS else None
+            if not js_truthy(value) and keys is not None and keys[column] is not None:
+                value = answers[keys[column]]
+            if js_truthy(value):
+                matrix[row, column] = slots.get((category, field, js_key(value)), 0)
+    return matrix
+
+def score(rules, matrix):
+    """Points per event under every configuration: (configurations x events)"""
+    return rules["points"][:, matrix].sum(axis=2)
+
+def stored_number(value):
+    """Store whole points as integers, as the service's additions of integer points do"""
+    return int(value) if float(value).is_integer() else float(value)
+
+def event_query(categories=None):
+    """Approved events, optionally limited to some categories, as the config controller recalculates"""
+    query = {"status": "Approved"}
+    if categories:
+        query["category"] = {"$in": list(categories)}
+    return query
+
+def event_projection(rules):
+    projection = {"category": 1, "customAnswers": 1, "pointsEarned": 1, "submittedBy": 1}
+    for field in rules["fields"]:
+        if field in EVENT_SCHEMA_FIELDS:
+            projection[field] = 1
+    return projection
+
+def event_batches(db, rules, categories=None, batch_size=BATCH_SIZE):
+    """Approved events in lists of batch_size"""
+    cursor = db[EVENT_COLLECTION].find(event_query(categories), event_projection(rules), batch_size=batch_size)
+    batch = []
+    for event in cursor:
+        batch.append(event)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def recompute_points(db, configuration, categories=None, batch_size=BATCH_SIZE, dry_run=False):
+    """Rescore approved events, write changed pointsEarned and apply the differences to totalPoints"""
+    rules = compile_rules([configuration])
+    now = datetime.now(timezone.utc)
+    deltas = {}
+    scanned = 0
+    changed = 0
+
+    for events in event_batches(db, rules, categories, batch_size):
+        new_points = score(rules, event_slots(rules, events))[0]
+        old_points = np.array([event.get("pointsEarned") or 0 for event in events], dtype=np.float64)
+        moved = np.flatnonzero(new_points != old_points)
+        scanned += len(events)
+        changed += len(moved)
+
+        operations = []
+        for i in moved:
+            event = events[i]
+            operations.append(UpdateOne({"_id": event["_id"]}, {"$set": {
+                "pointsEarned": stored_number(new_points[i]), "updatedAt": now}}))
+            student = event.get("submittedBy")
+            deltas[student] = deltas.get(student, 0.0) + new_points[i] - old_points[i]
+        if operations and not dry_run:
+            db[EVENT_COLLECTION].bulk_write(operations, ordered=False)
+
+    # One $inc per student, as updatePointsForEvent does per event
+    operations = [UpdateOne({"_id": student}, {"$inc": {"totalPoints": stored_number(delta)},
+                                               "$set": {"updatedAt": now}})
+                  for student, delta in deltas.items() if delta != 0]
+    if not dry_run:
+        for start in range(0, len(operations), batch_size):
+            db[STUDENT_COLLECTION].bulk_write(operations[start:start + batch_size], ordered=False)
+
+    return {"events": scanned, "changed": changed, "students": len(operations),
+            "delta": float(sum(deltas.values()))}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rescore approved events with the categoryRules points configuration")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--config", metavar="PATH",
+                        help="score with this configuration JSON (e.g. backend/scripts/making.json) "
+                             "instead of the active pointsconfigs document")
+    parser.add_argument("--category", action="append", help="limit to a category; repeat for several")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"events scored and written per batch (default: {BATCH_SIZE})")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing them")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    if args.config:
+        with open(args.config) as f:
+            configuration = json.load(f)
+    else:
+        configuration = active_configuration(db)
+    if not configuration:
+        raise SystemExit("No categoryRules configuration found")
+
+    start = time.perf_counter()
+    result = recompute_points(db, configuration, args.category, args.batch_size, args.dry_run)
+    elapsed = time.perf_counter() - start
+    print(f"{'Would update' if args.dry_run else 'Updated'} {result['changed']:,} of {result['events']:,} "
+          f"approved events and {result['students']:,} students (net {result['delta']:+,.0f} points) "
+          f"in {elapsed:.2f}s ({result['events'] / elapsed if elapsed else 0:,.0f} events/s)")
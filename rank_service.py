@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from pymongo import MongoClient
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+
+# Service defaults
+HOST = '127.0.0.1'
+PORT = 8765
+AROUND_K = 5
+PAGE_LIMIT = 10
+
+STUDENT_PROJECTION = {"_id": 1, "name": 1, "registerNo": 1, "totalPoints": 1, "department": 1,
+                      "currentClass.year": 1}
+
+# Scopes mirror leaderboard.service.js: everyone, one department, and the (department, year) context
+SCOPES = ["overall", "department", "context"]
+
+class Partition:
+    """Members of one scope ordered by points (descending, ties by load order) with the distinct point values"""
+
+    def __init__(self, members, points):
+        order = np.lexsort((members, -points))
+        self.members = members[order]
+        # Negated points so every array is ascending and searchsorted applies directly
+        self.keys = -points[order]
+        self.distinct, self.counts = np.unique(self.keys, return_counts=True)
+
+    def __len__(self):
+        return len(self.members)
+
+    def dense_rank(self, points):
+        """1 + number of distinct point values above `points`"""
+        return np.searchsorted(self.distinct, -np.asarray(points), "left") + 1
+
+    def position(self, member, points):
+        """Index of a member in the ordering, by binary search on points and then on member"""
+        lo = np.searchsorted(self.keys, -points, "left")
+        hi = np.searchsorted(self.keys, -points, "right")
+        return int(lo + np.searchsorted(self.members[lo:hi], member))
+
+    def move_all(self, moves):
+        """Reposition many members after points changes in one pass over the arrays.
+
+        moves is a list of (member, old_points, new_points). Deleting and re-inserting them one at a
+        time would copy the arrays twice per change; this copies them once for the whole batch.
+        """
+        keep = np.ones(len(self.keys), dtype=bool)
+        for member, old_points, _ in moves:
+            keep[self.position(member, old_points)] = False
+        keys = self.keys[keep]
+        members = self.members[keep]
+
+        # Insert in (points, member) order; np.insert keeps equal insertion indices in the order given
+        moved = np.array([member for member, _, _ in moves], dtype=members.dtype)
+        moved_keys = -np.array([new_points for _, _, new_points in moves], dtype=keys.dtype)
+        order = np.lexsort((moved, moved_keys))
+        moved, moved_keys = moved[order], moved_keys[order]
+        lo = np.searchsorted(keys, moved_keys, "left")
+        hi = np.searchsorted(keys, moved_keys, "right")
+        slots = [int(start + np.searchsorted(members[start:end], member))
+                 for start, end, member in zip(lo, hi, moved)]
+        self.keys = np.insert(keys, slots, moved_keys)
+        self.members = np.insert(members, slots, moved)
+
+        # keys are sorted, so the distinct values and their counts come from the run boundaries
+        starts = np.flatnonzero(np.r_[True, self.keys[1:] != self.keys[:-1]])
+        self.distinct = self.keys[starts]
+        self.counts = np.diff(np.r_[starts, len(self.keys)])
+
+class RankIndex:
+    """Students held in NumPy arrays with a Partition per scope key"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.positions = {}
+        self.partitions = {}
+        self.pending = {}
+        self.loaded_at = None
+
+    def load(self, db):
+        """(Re)load every student; returns the number loaded"""
+        students = list(db[STUDENT_COLLECTION].find({}, STUDENT_PROJECTION))
+        ids = [str(s["_id"]) for s in students]
+        names = [s.get("name") for s in students]
+        register_nos = [s.get("registerNo") for s in students]
+        points = np.array([s.get("totalPoints") or 0 for s in students], dtype=np.float64)
+        departments = np.array([s.get("department") or "" for s in students], dtype=object)
+        years = np.array([(s.get("currentClass") or {}).get("year") or 0 for s in students], dtype=np.int64)
+
+        members = np.arange(len(students), dtype=np.int64)
+        partitions = {("overall",): Partition(members, points)}
+        for department in set(departments):
+            in_department = departments == department
+            partitions[("department", department)] = Partition(members[in_department], points[in_department])
+            for year in set(years[in_department]):
+                in_context = in_department & (years == year)
+                partitions[("context", department, int(year))] = Partition(members[in_context], points[in_context])
+
+        with self.lock:
+            self.ids, self.names, self.register_nos = ids, names, register_nos
+            self.points, self.departments, self.years = points, departments, years
+            self.positions = {student_id: i for i, student_id in enumerate(ids)}
+            self.partitions = partitions
+            self.pending = {}
+            self.loaded_at = time.time()
+        return len(ids)
+
+    def member(self, student_id):
+        if student_id not in self.positions:
+            raise LookupError("Student not found")
+        return self.positions[student_id]
+
+    def partition_keys(self, member):
+        department = self.departments[member]
+        year = int(self.years[member])
+        return {"overall": ("overall",), "department": ("department", department),
+                "context": ("context", department, year)}
+
+    def partition(self, scope, department=None, year=None):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}'; use one of {', '.join(SCOPES)}")
+        key = {"overall": ("overall",), "department": ("department", department),
+               "context": ("context", department, year)}[scope]
+        return self.partitions.get(key)
+
+    def entries(self, partition, start, end):
+        """Leaderboard rows for a slice of a partition's ordering"""
+        members = partition.members[start:end]
+        ranks = partition.dense_rank(-partition.keys[start:end])
+        return [{"_id": self.ids[m], "name": self.names[m], "registerNo": self.register_nos[m],
+                 "totalPoints": float(self.points[m]), "rank": int(rank)}
+                for m, rank in zip(members, ranks)]
+
+    def rank(self, student_id):
+        """Same fields getStudentRank returns, plus departmentRank"""
+        with self.lock:
+            self.flush()
+            member = self.member(student_id)
+            points = self.points[member]
+            keys = self.partition_keys(member)
+            result = {"totalPoints": float(points)}
+            for scope, key in keys.items():
+                result[f"{scope}Rank"] = int(self.partitions[key].dense_rank(points))
+            result["totalStudents"] = len(self.partitions[keys["overall"]])
+            result["contextTotalStudents"] = len(self.partitions[keys["context"]])
+            return result
+
+    def around(self, student_id, scope="context", k=AROUND_K):
+        """The k students either side of a student in a scope"""
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}'; use one of {', '.join(SCOPES)}")
+        with self.lock:
+            self.flush()
+            member = self.member(student_id)
+            partition = self.partitions[self.partition_keys(member)[scope]]
+            position = partition.position(member, self.points[member])
+            return {"position": position + 1, "total": len(partition),
+                    "students": self.entries(partition, max(0, position - k), position + k + 1)}
+
+    def page(self, scope="overall", department=None, year=None, page=1, limit=PAGE_LIMIT):
+        """A leaderboard page, as getLeaderboard returns it without search"""
+        with self.lock:
+            self.flush()
+            partition = self.partition(scope, department, year)
+            if partition is None:
+                return {"students": [], "total": 0}
+            start = (page - 1) * limit
+            return {"students": self.entries(partition, start, start + limit), "total": len(partition)}
+
+    def apply(self, updates):
+        """Record [{studentId, delta | totalPoints}] without reloading; returns the count applied.
+
+        Changes are only queued here and folded into the partitions by the next read, so a burst
+        of updates costs one pass over each affected partition rather than one per update.
+        """
+        with self.lock:
+            # Resolve the whole batch first, so a bad entry leaves nothing half applied
+            changes = {}
+            for update in updates:
+                member = self.member(str(update["studentId"]))
+                current = changes.get(member, self.points[member])
+                if "totalPoints" in update:
+                    changes[member] = float(update["totalPoints"])
+                else:
+                    changes[member] = current + float(update["delta"])
+
+            for member, new_points in changes.items():
+                # The first pending change remembers where the member still sits in the partitions
+                self.pending.setdefault(member, self.points[member])
+                self.points[member] = new_points
+            return len(updates)
+
+    def flush(self):
+        """Move every member with queued changes to its new place; called with the lock held"""
+        moves = {}
+        for member, old_points in self.pending.items():
+            new_points = self.points[member]
+            if new_points == old_points:
+                continue
+            for key in self.partition_keys(member).values():
+                moves.setdefault(key, []).append((member, old_points, new_points))
+        for key, partition_moves in moves.items():
+            self.partitions[key].move_all(partition_moves)
+        self.pending = {}
+
+class RankRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over the server's RankIndex:
+
+    GET  /rank?studentId=ID
+    GET  /around?studentId=ID&scope=context&k=5
+    GET  /leaderboard?scope=department&department=CSE&year=2&page=1&limit=10
+    POST /points   [{"studentId": ID, "delta": 10}, {"studentId": ID, "totalPoints": 250}]
+    POST /reload
+    """
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_request(self, routes):
+        url = urlparse(self.path)
+        route = routes.get(url.path)
+        if route is None:
+            return self.send_json(404, {"message": "Not found"})
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            self.send_json(200, route(self.server.index, query))
+        except KeyError as error:
+            self.send_json(400, {"message": f"Missing parameter {error.args[0]}"})
+        except LookupError as error:
+            self.send_json(404, {"message": str(error)})
+        except (ValueError, TypeError) as error:
+            self.send_json(400, {"message": str(error)})
+
+    def do_GET(self):
+        self.handle_request({
+            "/rank": lambda index, q: index.rank(q["studentId"]),
+            "/around": lambda index, q: index.around(q["studentId"], q.get("scope", "context"),
+                                                     int(q.get("k", AROUND_K))),
+            "/leaderboard": lambda index, q: index.page(q.get("scope", "overall"), q.get("department"),
+                                                        int(q["year"]) if "year" in q else None,
+                                                        int(q.get("page", 1)), int(q.get("limit", PAGE_LIMIT))),
+            "/health": lambda index, q: {"students": len(index.ids), "loadedAt": index.loaded_at},
+        })
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as error:
+            # JSONDecodeError, or bytes that are not UTF-8
+            return self.send_json(400, {"message": f"Invalid JSON body: {error}"})
+        if isinstance(body, dict):
+            body = [body]
+        self.handle_request({
+            "/points": lambda index, q: {"applied": index.apply(body or [])},
+            "/reload": lambda index, q: {"students": index.load(self.server.db)},
+        })
+
+    def address_string(self):
+        # Unix-socket clients have no host/port
+        return self.client_address[0] if self.client_address else "unix"
+
+class UnixRankServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix socket, reachable from Node with http.request({socketPath})"""
+
+    daemon_threads = True
+
+def make_server(index, db, host=HOST, port=PORT, socket_path=None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixRankServer(socket_path, RankRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RankRequestHandler)
+    server.index = index
+    server.db = db
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve dense leaderboard ranks from memory")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--host", default=HOST, help=f"HTTP host (default: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"HTTP port (default: {PORT})")
+    parser.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    index = RankIndex()
+    start = time.perf_counter()
+    count = index.load(db)
+    print(f"Loaded {count:,} students into {len(index.partitions):,} partitions "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    server = make_server(index, db, args.host, args.port, args.socket)
+    print(f"Serving on {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
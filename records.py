@@ -0,0 +1,18 @@
+class Record:
+    """Generated document held in slots until a sink writes it; reads and sets fields like a dict"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def to_document(self):
+        """The dict the record stands for, with fields in document order"""
+        raise NotImplementedError
+
+def to_documents(docs):
+    """Plain documents for a sink; records are converted, dicts pass through"""
+    return [doc.to_document() if isinstance(doc, Record) else doc for doc in docs]
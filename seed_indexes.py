@@ -0,0 +1,116 @@
+import argparse
+import time
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+# Indexes per collection as (keys, options). Names are left to the server default
+# (e.g. email_1) so Mongoose recognises the ones its schemas declare.
+INDEXES = {
+    "students": [
+        # Schema uniques (student.model.js)
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("registerNo", ASCENDING)], {"unique": True}),
+        # leaderboard.service.js: overall ranking and the department/year/section filters
+        ([("totalPoints", DESCENDING)], {}),
+        ([("department", ASCENDING), ("currentClass.year", ASCENDING), ("totalPoints", DESCENDING)], {}),
+        ([("department", ASCENDING), ("currentClass.year", ASCENDING), ("currentClass.section", ASCENDING),
+          ("totalPoints", DESCENDING)], {}),
+        # Report services look students up by either class reference inside an $or
+        ([("currentClass.ref", ASCENDING)], {}),
+        ([("class", ASCENDING)], {}),
+    ],
+    "events": [
+        # Report pipelines: $match on submittedBy $in + status, often with a createdAt window
+        ([("submittedBy", ASCENDING), ("status", ASCENDING), ("createdAt", DESCENDING)], {}),
+        # Trend reports filter on the event date
+        ([("submittedBy", ASCENDING), ("date", DESCENDING)], {}),
+        # Department-wide category/status breakdowns
+        ([("status", ASCENDING), ("category", ASCENDING), ("date", DESCENDING)], {}),
+    ],
+    "classes": [
+        # Schema unique (class.model.js)
+        ([("year", ASCENDING), ("section", ASCENDING), ("academicYear", ASCENDING), ("department", ASCENDING)],
+         {"unique": True}),
+        # Role-based report filters
+        ([("department", ASCENDING), ("year", ASCENDING)], {}),
+        ([("academicAdvisors", ASCENDING)], {}),
+        ([("facultyAssigned", ASCENDING)], {}),
+    ],
+    "teachers": [
+        # Schema uniques (teacher.model.js)
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("registerNo", ASCENDING)], {"unique": True}),
+    ],
+}
+
+def index_name(keys):
+    """Server default name for an index, e.g. department_1_totalPoints_-1"""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+def metadata_indexes(collection):
+    """Index specs in *.metadata.json form, so mongorestore builds them after loading data"""
+    specs = [{"v": 2, "key": {"_id": 1}, "name": "_id_"}]
+    for keys, options in INDEXES.get(collection, []):
+        spec = {"v": 2, "key": dict(keys), "name": index_name(keys)}
+        spec.update(options)
+        specs.append(spec)
+    return specs
+
+def index_sizes(db, collection):
+    """Bytes used by each index of a collection"""
+    stats = next(db[collection].aggregate([{"$collStats": {"storageStats": {}}}]))
+    return stats["storageStats"].get("indexSizes", {})
+
+def build_indexes(db, collections=None):
+    """Build every configured index one at a time; returns (collection, name, seconds, bytes) rows"""
+    results = []
+    for collection, indexes in INDEXES.items():
+        if collections is not None and collection not in collections:
+            continue
+        timings = {}
+        for keys, options in indexes:
+            start = time.perf_counter()
+            name = db[collection].create_indexes([IndexModel(keys, **options)])[0]
+            timings[name] = time.perf_counter() - start
+
+        sizes = index_sizes(db, collection)
+        for name, seconds in timings.items():
+            results.append((collection, name, seconds, sizes.get(name, 0)))
+    return results
+
+def drop_indexes(db, collections=None):
+    """Drop everything except _id, for before/after comparisons"""
+    for collection in INDEXES:
+        if collections is None or collection in collections:
+            db[collection].drop_indexes()
+
+def print_index_report(results):
+    """Print build time and size per index"""
+    print(f"\n{'collection':<10} {'index':<62} {'build s':>8} {'size MB':>8}")
+    for collection, name, seconds, size in results:
+        print(f"{collection:<10} {name:<62} {seconds:>8.2f} {size / 2 ** 20:>8.1f}")
+    total_seconds = sum(row[2] for row in results)
+    total_size = sum(row[3] for row in results)
+    print(f"Built {len(results)} indexes in {total_seconds:.2f}s, {total_size / 2 ** 20:,.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the indexes the backend's leaderboard and report queries rely on")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--collection", action="append", choices=list(INDEXES),
+                        help="limit to a collection; repeat for several")
+    parser.add_argument("--drop", action="store_true",
+                        help="drop the non-_id indexes instead of building them")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    if args.drop:
+        drop_indexes(db, args.collection)
+        print("Dropped secondary indexes")
+    else:
+        print_index_report(build_indexes(db, args.collection))
@@ -0,0 +1,135 @@
+import contextlib
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage
+    resource = None
+
+# Prometheus metric name -> (report field, help text)
+PROMETHEUS_METRICS = {
+    "seed_phase_wall_seconds": ("wall_seconds", "Wall-clock seconds spent in the seeding phase"),
+    "seed_phase_cpu_seconds": ("cpu_seconds", "CPU seconds spent in the seeding phase"),
+    "seed_phase_documents": ("docs", "Documents produced or written by the seeding phase"),
+    "seed_phase_docs_per_second": ("docs_per_second", "Documents per wall-clock second"),
+    "seed_phase_bytes_written": ("bytes", "Bytes written by the seeding phase, when known"),
+    "seed_phase_peak_rss_bytes": ("peak_rss_bytes", "Peak resident set size seen at the end of the phase"),
+}
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def new_entry():
+    """Empty totals for one phase"""
+    return {"wall_seconds": 0.0, "cpu_seconds": 0.0, "docs": 0, "bytes": 0, "peak_rss_bytes": 0}
+
+def record(metrics, name, wall_seconds, cpu_seconds, docs=0, bytes_written=0):
+    """Add one measurement to a phase"""
+    entry = metrics.setdefault(name, new_entry())
+    entry["wall_seconds"] += wall_seconds
+    entry["cpu_seconds"] += cpu_seconds
+    entry["docs"] += docs
+    entry["bytes"] += bytes_written
+    entry["peak_rss_bytes"] = max(entry["peak_rss_bytes"], peak_rss())
+
+@contextlib.contextmanager
+def phase(metrics, name):
+    """Time a block; set docs/bytes on the yielded dict to attribute output to it"""
+    counts = {"docs": 0, "bytes": 0}
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    yield counts
+    record(metrics, name, time.perf_counter() - wall, time.process_time() - cpu,
+           counts["docs"], counts["bytes"])
+
+def timed(iterable, metrics, name, size=None):
+    """Yield from iterable, charging only the time spent producing items to a phase"""
+    iterator = iter(iterable)
+    wall = 0.0
+    cpu = 0.0
+    docs = 0
+    try:
+        while True:
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                wall += time.perf_counter() - wall_start
+                cpu += time.process_time() - cpu_start
+            docs += size(item) if size else 1
+            yield item
+    finally:
+        record(metrics, name, wall, cpu, docs)
+
+def exclude(metrics, name, nested):
+    """Remove a nested phase's time from an enclosing one, e.g. students pulled inside events"""
+    entry = metrics.get(name)
+    inner = metrics.get(nested)
+    if entry and inner:
+        entry["wall_seconds"] -= inner["wall_seconds"]
+        entry["cpu_seconds"] -= inner["cpu_seconds"]
+
+def record_sink_stats(metrics, stats):
+    """Turn a sink's per-collection stats into insert:<collection> phases"""
+    for collection, entry in stats.items():
+        record(metrics, f"insert:{collection}", entry["seconds"], entry["cpu_seconds"],
+               entry["docs"], entry["bytes"])
+
+def merge(total, metrics):
+    """Combine phases from several processes: times and counts add up, peak RSS is the max"""
+    for name, entry in metrics.items():
+        target = total.setdefault(name, new_entry())
+        for key in ("wall_seconds", "cpu_seconds", "docs", "bytes"):
+            target[key] += entry[key]
+        target["peak_rss_bytes"] = max(target["peak_rss_bytes"], entry["peak_rss_bytes"])
+    return total
+
+def build_report(metrics, run):
+    """JSON-ready report: run parameters plus per-phase figures with docs/sec"""
+    phases = {}
+    for name, entry in metrics.items():
+        phases[name] = dict(entry)
+        wall = entry["wall_seconds"]
+        phases[name]["docs_per_second"] = entry["docs"] / wall if wall > 0 else 0.0
+    return {"run": run, "phases": phases}
+
+def write_json(report, path):
+    """Write the report as JSON"""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+def to_prometheus(report):
+    """Render the report in the Prometheus text exposition format"""
+    lines = []
+    for metric, (field, help_text) in PROMETHEUS_METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, entry in report["phases"].items():
+            lines.append(f'{metric}{{phase="{name}"}} {entry[field]}')
+    lines.append("# HELP seed_run_wall_seconds Wall-clock seconds for the whole run")
+    lines.append("# TYPE seed_run_wall_seconds gauge")
+    lines.append(f"seed_run_wall_seconds {report['run']['wall_seconds']}")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(report, path):
+    """Write the report in Prometheus text format, e.g. for node_exporter's textfile collector"""
+    with open(path, "w") as f:
+        f.write(to_prometheus(report))
+
+def print_report(report):
+    """Print one line per phase"""
+    print(f"\n{'phase':<18} {'wall s':>8} {'cpu s':>8} {'docs':>11} {'docs/s':>11} {'MB':>9} {'peak RSS MB':>12}")
+    for name, entry in report["phases"].items():
+        print(f"{name:<18} {entry['wall_seconds']:>8.2f} {entry['cpu_seconds']:>8.2f} {entry['docs']:>11,} "
+              f"{entry['docs_per_second']:>11,.0f} {entry['bytes'] / 2 ** 20:>9.1f} "
+              f"{entry['peak_rss_bytes'] / 2 ** 20:>12.1f}")
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymongo import MongoClient, ReadPreference
+
+import bench_leaderboard
+import main
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+
+# Workload defaults
+DURATION = 60  # Seconds of simulated traffic
+ARRIVAL_RATE = 20.0  # New submissions per second, Poisson arrivals
+FACULTY = 8  # Concurrent reviewers
+REVIEW_SECONDS = 0.5  # Mean think time before a reviewer decides
+READERS = 4  # Concurrent leaderboard readers
+READER_PAUSE = 0.1  # Seconds between one reader's requests
+PROBE_FRACTION = 0.2  # Share of approvals whose visibility to readers is measured
+PROBE_INTERVAL = 0.005
+PROBE_TIMEOUT = 10.0
+THREADS = 32  # pymongo calls run in this thread pool
+RANDOM_SEED = 2024
+
+# Approve/reject odds follow the seeder's status mix among reviewed events
+APPROVE_ODDS = main.EVENT_STATUS_WEIGHTS[1] / (main.EVENT_STATUS_WEIGHTS[1] + main.EVENT_STATUS_WEIGHTS[2])
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+class EventSource:
+    """New Pending events drawn with main.py's sample_events, a block at a time"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.text_pools = main.build_text_pools()
+        self.points_table = main.build_points_table()
+        self.sample = None
+        self.row = 0
+
+    def next(self, student_id, now):
+        if self.sample is None or self.row >= len(self.sample["_id"]):
+            # sample_events works on naive UTC datetimes, like the rest of main.py
+            end = now.replace(tzinfo=None)
+            self.sample = main.sample_events(self.rng, main.EVENT_SAMPLE_BATCH, end - datetime.timedelta(days=30),
+                                             end, self.text_pools, self.points_table)
+            self.row = 0
+        event = main.build_event(self.sample, self.row, student_id, None, now)
+        # Points the event earns if approved, from the same POINTS_CONFIG the seeder uses
+        scope = self.sample["eventScope"][self.row]
+        points = main.POINTS_CONFIG[event["positionSecured"]][scope] if scope else 0
+        event.update({"status": "Pending", "pointsEarned": 0, "approvedBy": None, "createdAt": now})
+        self.row += 1
+        return event, points
+
+class Stats:
+    """Latencies and counts collected while the simulation runs"""
+
+    def __init__(self):
+        self.latencies = {"submit": [], "review": [], "leaderboard": [], "visibility": []}
+        self.counts = {"submitted": 0, "approved": 0, "rejected": 0, "reads": 0, "probe_timeouts": 0}
+
+    def add(self, name, seconds):
+        self.latencies[name].append(seconds * 1000)
+
+def submit(db, event):
+    """createEvent: insert the event, then list it on the student"""
+    db[main.EVENT_COLLECTION].insert_one(event)
+    db[main.STUDENT_COLLECTION].update_one({"_id": event["submittedBy"]},
+                                           {"$push": {"eventsParticipated": event["_id"]},
+                                            "$set": {"updatedAt": event["createdAt"]}})
+
+def review(db, event, approve, points, faculty_id):
+    """Approve with points and increment totalPoints, or reject, as the event controller does"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if approve:
+        db[main.EVENT_COLLECTION].update_one({"_id": event["_id"]}, {"$set": {
+            "status": "Approved", "pointsEarned": points, "approvedBy": faculty_id, "updatedAt": now}})
+        if points:
+            db[main.STUDENT_COLLECTION].update_one({"_id": event["submittedBy"]},
+                                                   {"$inc": {"totalPoints": points}, "$set": {"updatedAt": now}})
+    else:
+        db[main.EVENT_COLLECTION].update_one({"_id": event["_id"]}, {"$set": {
+            "status": "Rejected", "pointsEarned": 0, "approvedBy": faculty_id, "updatedAt": now}})
+
+def sees_approval(reader_db, event_id):
+    """True once a reader can see the approved event"""
+    return reader_db[main.EVENT_COLLECTION].find_one({"_id": event_id, "status": "Approved"}, {"_id": 1}) is not None
+
+async def submitter(db, students, source, queue, stats, rate, rng, deadline):
+    """Open-loop Poisson arrivals: submissions start on schedule however long earlier ones take"""
+    tasks = set()
+
+    async def one(student):
+        event, points = source.next(student["_id"], datetime.datetime.now(datetime.timezone.utc))
+        start = time.perf_counter()
+        await asyncio.to_thread(submit, db, event)
+        stats.add("submit", time.perf_counter() - start)
+        stats.counts["submitted"] += 1
+        await queue.put((event, points, student.get("faculty")))
+
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(rng.expovariate(rate))
+        task = asyncio.create_task(one(rng.choice(students)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+async def faculty_reviewer(db, reader_db, queue, stats, review_seconds, probe_fraction, rng):
+    """Take pending events off the queue, think, then approve or reject them"""
+    while True:
+        event, points, faculty_id = await queue.get()
+        try:
+            await asyncio.sleep(rng.expovariate(1 / review_seconds) if review_seconds else 0)
+            approve = rng.random() < APPROVE_ODDS
+            start = time.perf_counter()
+            await asyncio.to_thread(review, db, event, approve, points, faculty_id)
+            written = time.perf_counter()
+            stats.add("review", written - start)
+            stats.counts["approved" if approve else "rejected"] += 1
+
+            # Read-your-writes: how long until a leaderboard reader sees the approval
+            if approve and rng.random() < probe_fraction:
+                while not await asyncio.to_thread(sees_approval, reader_db, event["_id"]):
+                    if time.perf_counter() - written > PROBE_TIMEOUT:
+                        stats.counts["probe_timeouts"] += 1
+                        break
+                    await asyncio.sleep(PROBE_INTERVAL)
+                else:
+                    stats.add("visibility", time.perf_counter() - written)
+        finally:
+            queue.task_done()
+
+async def leaderboard_reader(reader_db, contexts, stats, pause, rng, deadline):
+    """Replay getLeaderboard with a random department/year filter"""
+    students = reader_db[main.STUDENT_COLLECTION]
+    while time.perf_counter() < deadline:
+        department, year = rng.choice(contexts)
+        start = time.perf_counter()
+        await asyncio.to_thread(bench_leaderboard.get_leaderboard, bench_leaderboard.QueryRunner(students),
+                                department, year)
+        stats.add("leaderboard", time.perf_counter() - start)
+        stats.counts["reads"] += 1
+        await asyncio.sleep(pause)
+
+def load_population(db):
+    """Students with the faculty member who reviews their class's events"""
+    faculty = {c["_id"]: (c.get("assignedFaculty") or [None])[0]
+               for c in db[main.CLASS_COLLECTION].find({}, {"assignedFaculty": 1})}
+    students = []
+    for student in db[main.STUDENT_COLLECTION].find({"isArchived": {"$ne": True}},
+                                                    {"class": 1, "department": 1, "currentClass.year": 1}):
+        student["faculty"] = faculty.get(student.get("class"))
+        students.append(student)
+    contexts = sorted({(s.get("department"), (s.get("currentClass") or {}).get("year")) for s in students},
+                      key=repr)
+    return students, contexts
+
+async def simulate(db, reader_db, duration=DURATION, rate=ARRIVAL_RATE, faculty=FACULTY, readers=READERS,
+                   review_seconds=REVIEW_SECONDS, reader_pause=READER_PAUSE, probe_fraction=PROBE_FRACTION,
+                   threads=THREADS, seed=RANDOM_SEED):
+    """Run submitters, reviewers and readers together for duration seconds.
+
+    Returns the Stats and the seconds the traffic actually ran, which excludes loading the population.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=threads))
+    rng = random.Random(seed)
+    main.fake.seed_instance(seed)
+    students, contexts = await asyncio.to_thread(load_population, db)
+    if not students:
+        raise SystemExit("No students found; seed the database first (python main.py)")
+    source = EventSource(np.random.default_rng(seed))
+    stats = Stats()
+    queue = asyncio.Queue()
+
+    started = time.perf_counter()
+    deadline = started + duration
+    reviewers = [asyncio.create_task(faculty_reviewer(db, reader_db, queue, stats, review_seconds,
+                                                      probe_fraction, random.Random(rng.random())))
+                 for _ in range(faculty)]
+    reader_tasks = [asyncio.create_task(leaderboard_reader(reader_db, contexts, stats, reader_pause,
+                                                           random.Random(rng.random()), deadline))
+                    for _ in range(readers)]
+    await submitter(db, students, source, queue, stats, rate, rng, deadline)
+    await asyncio.gather(*reader_tasks)
+    elapsed = time.perf_counter() - started
+
+    # Whatever is still queued is the review backlog; stop the reviewers there
+    stats.counts["backlog"] = queue.qsize()
+    for task in reviewers:
+        task.cancel()
+    await asyncio.gather(*reviewers, return_exceptions=True)
+    return stats, elapsed
+
+def print_stats(stats, duration):
+    """Throughput and latency percentiles per operation"""
+    counts = stats.counts
+    print(f"\nSubmitted {counts['submitted']:,} ({counts['submitted'] / duration:,.1f}/s), "
+          f"approved {counts['approved']:,}, rejected {counts['rejected']:,} "
+          f"({(counts['approved'] + counts['rejected']) / duration:,.1f} reviews/s), "
+          f"{counts['reads']:,} leaderboard reads ({counts['reads'] / duration:,.1f}/s), "
+          f"review backlog {counts['backlog']:,}")
+    print(f"{'operation':<14} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, values in stats.latencies.items():
+        if not values:
+            continue
+        values = sorted(values)
+        print(f"{name:<14} {len(values):>7,} {bench_leaderboard.percentile(values, 0.50):>8.1f} "
+              f"{bench_leaderboard.percentile(values, 0.95):>8.1f} {bench_leaderboard.percentile(values, 0.99):>8.1f} "
+              f"{values[-1]:>8.1f}")
+    if counts["probe_timeouts"]:
+        print(f"{counts['probe_timeouts']:,} approvals were not visible to readers within {PROBE_TIMEOUT:.0f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulate event submissions, faculty reviews and leaderboard reads against a seeded database")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--duration", type=float, default=DURATION, help=f"seconds to run (default: {DURATION})")
+    parser.add_argument("--rate", type=float, default=ARRIVAL_RATE,
+                        help=f"mean submissions per second (default: {ARRIVAL_RATE})")
+    parser.add_argument("--faculty", type=int, default=FACULTY, help=f"concurrent reviewers (default: {FACULTY})")
+    parser.add_argument("--review-seconds", type=float, default=REVIEW_SECONDS,
+                        help=f"mean reviewer think time (default: {REVIEW_SECONDS})")
+    parser.add_argument("--readers", type=int, default=READERS,
+                        help=f"concurrent leaderboard readers (default: {READERS})")
+    parser.add_argument("--reader-pause", type=float, default=READER_PAUSE,
+                        help=f"seconds between a reader's requests (default: {READER_PAUSE})")
+    parser.add_argument("--read-preference", choices=list(READ_PREFERENCES), default="primary",
+                        help="read preference for readers; use a secondary one on a replica set to see lag")
+    parser.add_argument("--probe-fraction", type=float, default=PROBE_FRACTION,
+                        help=f"share of approvals whose visibility is measured (default: {PROBE_FRACTION})")
+    parser.add_argument("--threads", type=int, default=THREADS, help=f"pymongo worker threads (default: {THREADS})")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help=f"random seed (default: {RANDOM_SEED})")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri, maxPoolSize=args.threads)
+    db = client[args.db]
+    reader_db = client.get_database(args.db, read_preference=READ_PREFERENCES[args.read_preference])
+    stats, elapsed = asyncio.run(simulate(db, reader_db, args.duration, args.rate, args.faculty, args.readers,
+                                          args.review_seconds, args.reader_pause, args.probe_fraction,
+                                          args.threads, args.seed))
+    print_stats(stats, elapsed)
@@ -0,0 +1,157 @@
+import time
+
+from bson import json_util
+from pymongo import MongoClient
+
+import bson_dump
+import records
+
+# Sink kinds selectable from the seeders' --sink option
+SINK_KINDS = ['mongo', 'bson', 'jsonl', 'null']
+
+# JSON-lines output uses relaxed Extended JSON so ObjectIds and dates round-trip
+JSONL_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+def new_stats_entry():
+    """Running totals a sink keeps per collection"""
+    return {"docs": 0, "bytes": 0, "seconds": 0.0, "cpu_seconds": 0.0}
+
+class Sink:
+    """Destination for generated documents that times every write per collection"""
+
+    def __init__(self):
+        self.stats = {}
+
+    def write(self, collection, docs):
+        """Write a chunk of documents or records and record docs, bytes, wall and CPU seconds spent"""
+        if not docs:
+            return
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        written = self.write_documents(collection, records.to_documents(docs))
+
+        entry = self.stats.setdefault(collection, new_stats_entry())
+        entry["docs"] += len(docs)
+        entry["bytes"] += written or 0
+        entry["seconds"] += time.perf_counter() - start
+        entry["cpu_seconds"] += time.process_time() - cpu_start
+
+    def write_documents(self, collection, docs):
+        """Persist docs; returns the bytes written when the sink knows them"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release files or connections"""
+
+class MongoSink(Sink):
+    """Unordered insert_many into a live database"""
+
+    def __init__(self, uri, db_name):
+        super().__init__()
+        # Opened here, inside whichever process writes, since clients are not fork-safe
+        self.client = MongoClient(uri)
+        self.db = self.client[db_name]
+
+    def write_documents(self, collection, docs):
+        self.db[collection].insert_many(docs, ordered=False)
+
+    def close(self):
+        self.client.close()
+
+class PartFileSink(Sink):
+    """Appends each collection to its own part file inside a dump directory"""
+
+    extension = None
+
+    def __init__(self, path, part):
+        super().__init__()
+        self.path = path
+        self.part = part
+        self.files = {}
+
+    def file_for(self, collection):
+        if collection not in self.files:
+            path = bson_dump.part_path(self.path, collection, self.part, self.extension)
+            self.files[collection] = open(path, "wb")
+        return self.files[collection]
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+class BsonFileSink(PartFileSink):
+    """mongorestore-compatible <collection>.bson files"""
+
+    extension = "bson"
+
+    def write_documents(self, collection, docs):
+        return bson_dump.append_documents(self.file_for(collection), docs)
+
+class JsonLinesSink(PartFileSink):
+    """One relaxed Extended JSON document per line, loadable with mongoimport"""
+
+    extension = "jsonl"
+
+    def write_documents(self, collection, docs):
+        data = "".join(json_util.dumps(doc, json_options=JSONL_OPTIONS) + "\n" for doc in docs).encode()
+        self.file_for(collection).write(data)
+        return len(data)
+
+class NullSink(Sink):
+    """Discards everything, leaving only generation cost"""
+
+    def write_documents(self, collection, docs):
+        return 0
+
+def sink_spec(kind, uri=None, db_name=None, dump_name=None):
+    """Picklable description of a sink, handed to every worker"""
+    if kind not in SINK_KINDS:
+        raise ValueError(f"Unknown sink '{kind}'; use one of {', '.join(SINK_KINDS)}")
+    spec = {"kind": kind, "uri": uri, "db_name": db_name, "path": None}
+    if kind in ("bson", "jsonl"):
+        spec["path"] = bson_dump.dump_path(dump_name or bson_dump.default_dump_name(db_name))
+    return spec
+
+def prepare_sink(spec, force=False):
+    """Set up output directories before any worker writes; force replaces a non-empty one"""
+    if spec["path"] is not None:
+        bson_dump.prepare_dump(spec["path"], force)
+
+def open_sink(spec, part):
+    """Sink for one writer; file sinks give every part its own files"""
+    kind = spec["kind"]
+    if kind == "mongo":
+        return MongoSink(spec["uri"], spec["db_name"])
+    if kind == "bson":
+        return BsonFileSink(spec["path"], part)
+    if kind == "jsonl":
+        return JsonLinesSink(spec["path"], part)
+    return NullSink()
+
+def finish_sink(spec, collections, parts, indexes=None, seed=None):
+    """Merge file sink parts in order; returns bytes per output file"""
+    if spec["kind"] == "bson":
+        return bson_dump.finish_dump(spec["path"], collections, parts, indexes, seed)
+    if spec["kind"] == "jsonl":
+        return bson_dump.merge_parts(spec["path"], collections, parts, "jsonl")
+    return {}
+
+def merge_stats(total, stats):
+    """Add one sink's per-collection stats into a running total"""
+    for collection, entry in stats.items():
+        target = total.setdefault(collection, new_stats_entry())
+        for key in target:
+            target[key] += entry[key]
+    return total
+
+def print_sink_report(kind, stats, generation_seconds):
+    """Print write throughput per collection next to the time spent generating"""
+    print(f"\nSink '{kind}' throughput:")
+    write_seconds = 0.0
+    for collection, entry in stats.items():
+        rate = entry["docs"] / entry["seconds"] if entry["seconds"] else float("inf")
+        size = f", {entry['bytes'] / 2 ** 20:,.1f} MB" if entry["bytes"] else ""
+        print(f"- {collection}: {entry['docs']:,} docs in {entry['seconds']:.2f}s "
+              f"({rate:,.0f} docs/s{size})")
+        write_seconds += entry["seconds"]
+    print(f"Write time: {write_seconds:.2f}s, generation time: {generation_seconds:.2f}s")
@@ -0,0 +1,26 @@
+import os
+import sys
+import uuid
+
+import pymongo
+import pytest
+
+# The scripts live at the repository root and import each other as top-level modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TEST_MONGO_URI = os.environ.get("TEST_MONGO_URI", "mongodb://localhost:27017/")
+
+@pytest.fixture
+def db():
+    """A scratch database on TEST_MONGO_URI, dropped afterwards; skips when no server answers"""
+    client = pymongo.MongoClient(TEST_MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError:
+        client.close()
+        pytest.skip(f"no MongoDB reachable at {TEST_MONGO_URI}")
+    name = f"leaderboard_test_{uuid.uuid4().hex[:12]}"
+    yield client[name]
+    client.drop_database(name)
+    client.close()
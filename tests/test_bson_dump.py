@@ -0,0 +1,18 @@
+import pytest
+
+import bson_dump
+import sinks
+
+def test_default_dump_leaves_the_committed_snapshot_alone():
+    spec = sinks.sink_spec("bson", db_name="leaderboard_db")
+    assert spec["path"] == bson_dump.dump_path("leaderboard_db_seed")
+
+def test_non_empty_dump_directory_needs_force(tmp_path):
+    (tmp_path / "admins.bson").write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        bson_dump.prepare_dump(str(tmp_path))
+    assert (tmp_path / "admins.bson").exists()
+
+    # Forcing starts from an empty directory, so no stale collection survives next to the new ones
+    bson_dump.prepare_dump(str(tmp_path), force=True)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [bson_dump.PARTS_DIR]
@@ -0,0 +1,33 @@
+from bson import ObjectId
+
+import bson_dump
+import load_dump
+from conftest import TEST_MONGO_URI
+
+def write_classes(path, classes):
+    path.mkdir()
+    with open(path / "classes.bson", "wb") as f:
+        bson_dump.append_documents(f, classes)
+
+def test_keys_repeated_in_the_dump_upsert_on_id(tmp_path):
+    twins = [{"_id": ObjectId(), "className": "1-A1-CSE"}, {"_id": ObjectId(), "className": "1-A1-CSE"}]
+    single = {"_id": ObjectId(), "className": "1-B1-CSE"}
+    write_classes(tmp_path / "dump", twins + [single])
+
+    repeated = load_dump.repeated_keys(load_dump.dump_tasks(str(tmp_path / "dump"), 1))
+    assert repeated == {"classes": {("1-A1-CSE",)}}
+    assert [load_dump.unique_criteria("classes", doc, repeated["classes"]) for doc in twins] == [
+        {"_id": doc["_id"]} for doc in twins]
+    assert load_dump.unique_criteria("classes", single, repeated["classes"]) == {"className": "1-B1-CSE"}
+
+def test_upsert_keeps_repeated_keys_and_reports_id_conflicts(tmp_path, db):
+    stored = {"_id": ObjectId(), "className": "2-A1-CSE"}
+    db.classes.insert_one(stored)
+    twins = [{"_id": ObjectId(), "className": "1-A1-CSE"}, {"_id": ObjectId(), "className": "1-A1-CSE"}]
+    write_classes(tmp_path / "dump", twins + [{"_id": ObjectId(), "className": "2-A1-CSE"}])
+
+    totals = load_dump.load_dump(str(tmp_path / "dump"), TEST_MONGO_URI, db.name, mode="upsert",
+                                 build_indexes=False)
+    assert totals["classes"]["conflicts"] == 1
+    assert db.classes.count_documents({"_id": {"$in": [doc["_id"] for doc in twins]}}) == 2
+    assert db.classes.count_documents({}) == 3
@@ -0,0 +1,23 @@
+import bcrypt
+
+import passwords
+
+def test_fixed_salts_ignore_hashes_cached_with_another_salt(monkeypatch):
+    monkeypatch.setattr(passwords, "password_cache", {})
+    random_salted = [{"rawPassword": "hunter2"}]
+    passwords.hash_passwords(random_salted, workers=1, rounds=4)
+
+    # A seeded run must not pick up the randomly salted hash an unseeded run cached
+    first, second = [{"rawPassword": "hunter2"}], [{"rawPassword": "hunter2"}]
+    passwords.hash_passwords(first, workers=1, rounds=4, fixed=True)
+    passwords.password_cache.clear()
+    passwords.hash_passwords(second, workers=1, rounds=4, fixed=True)
+    assert first[0]["password"] == second[0]["password"] != random_salted[0]["password"]
+    assert bcrypt.checkpw(b"hunter2", first[0]["password"].encode())
+
+def test_documents_sharing_a_password_are_hashed_once(monkeypatch):
+    monkeypatch.setattr(passwords, "password_cache", {})
+    docs = [{"rawPassword": "same"}, {"rawPassword": "same"}, {"rawPassword": "other"}]
+    passwords.hash_passwords(docs, workers=1, rounds=4)
+    assert docs[0]["password"] == docs[1]["password"] != docs[2]["password"]
+    assert sorted(passwords.password_cache) == ["other", "same"]
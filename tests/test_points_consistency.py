@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+import leaderboard_ranks
+import points_consistency
+
+def test_refresh_after_repair_reranks_the_student(db, tmp_path):
+    long_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    behind, ahead = ObjectId(), ObjectId()
+    event_id, ahead_event_id = ObjectId(), ObjectId()
+    db.students.insert_many([
+        # Owns 50 approved points but its total was never incremented
+        {"_id": behind, "totalPoints": 0, "eventsParticipated": [], "department": "CSE",
+         "currentClass": {"year": 1, "section": "A1"}, "updatedAt": long_ago},
+        {"_id": ahead, "totalPoints": 20, "eventsParticipated": [ahead_event_id], "department": "CSE",
+         "currentClass": {"year": 1, "section": "A1"}, "updatedAt": long_ago},
+    ])
+    db.events.insert_many([
+        {"_id": event_id, "submittedBy": behind, "status": "Approved", "pointsEarned": 50, "updatedAt": long_ago},
+        {"_id": ahead_event_id, "submittedBy": ahead, "status": "Approved", "pointsEarned": 20,
+         "updatedAt": long_ago},
+    ])
+
+    leaderboard_ranks.full_refresh(db)
+    assert db.leaderboard_ranks.find_one({"_id": behind})["overallRank"] == 2
+
+    points_consistency.run_check(db, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    repaired = db.students.find_one({"_id": behind})
+    assert repaired["totalPoints"] == 50 and repaired["eventsParticipated"] == [event_id]
+
+    result = leaderboard_ranks.incremental_refresh(db)
+    assert result["mode"] == "incremental" and result["students"] == 1
+    assert db.leaderboard_ranks.find_one({"_id": behind})["overallRank"] == 1
+    assert db.leaderboard_ranks.find_one({"_id": ahead})["overallRank"] == 2
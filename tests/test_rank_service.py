@@ -0,0 +1,37 @@
+import http.client
+import threading
+
+import numpy as np
+
+import rank_service
+
+def test_batched_moves_match_a_rebuilt_partition():
+    rng = np.random.default_rng(13)
+    members = np.arange(500, dtype=np.int64)
+    points = rng.integers(0, 40, len(members)).astype(np.float64)
+    partition = rank_service.Partition(members, points)
+
+    for _ in range(20):
+        moved = rng.choice(members, size=25, replace=False)
+        new_points = points.copy()
+        new_points[moved] = rng.integers(0, 60, len(moved))
+        partition.move_all([(m, points[m], new_points[m]) for m in moved])
+        points = new_points
+
+        rebuilt = rank_service.Partition(members, points)
+        assert np.array_equal(partition.members, rebuilt.members)
+        assert np.array_equal(partition.keys, rebuilt.keys)
+        assert np.array_equal(partition.distinct, rebuilt.distinct)
+        assert np.array_equal(partition.counts, rebuilt.counts)
+
+def test_invalid_json_is_a_bad_request():
+    server = rank_service.make_server(rank_service.RankIndex(), None, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address)
+        connection.request("POST", "/points", body=b"{not json", headers={"Content-Type": "application/json"})
+        assert connection.getresponse().status == 400
+    finally:
+        server.shutdown()
+        server.server_close()
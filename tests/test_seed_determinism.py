@@ -0,0 +1,31 @@
+import filecmp
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+SEED = 7
+
+def seed_dump(path, workers=1):
+    """Seed a small dataset into a BSON dump in a fresh interpreter, as the CLI does"""
+    subprocess.run([sys.executable, "main.py", "--seed", str(SEED), "--scale-factor", "small",
+                    "--workers", str(workers), "--dump", str(path)],
+                   cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def differing_files(first, second, suffix=""):
+    names = sorted(name for name in os.listdir(first) if name.endswith(suffix))
+    assert names == sorted(name for name in os.listdir(second) if name.endswith(suffix))
+    _, mismatch, errors = filecmp.cmpfiles(first, second, names, shallow=False)
+    return mismatch + errors
+
+def test_same_seed_gives_identical_data(tmp_path):
+    # Separate processes, so nothing generated once per interpreter (like the password salt) is shared
+    seed_dump(tmp_path / "first")
+    seed_dump(tmp_path / "second")
+    assert differing_files(tmp_path / "first", tmp_path / "second", ".bson") == []
+
+def test_dump_is_byte_identical_for_any_worker_count(tmp_path):
+    seed_dump(tmp_path / "serial", workers=1)
+    seed_dump(tmp_path / "parallel", workers=3)
+    assert differing_files(tmp_path / "serial", tmp_path / "parallel") == []
@@ -0,0 +1,26 @@
+from bson import ObjectId
+
+import year_end
+
+def make_class(year, section, students):
+    return {"_id": ObjectId(), "className": year_end.class_name(year, section, "CSE"), "department": "CSE",
+            "year": year, "section": section, "academicYear": "2024-2028", "students": students}
+
+def make_student(cls):
+    return {"_id": ObjectId(), "registerNo": str(ObjectId()), "class": cls["_id"],
+            "currentClass": {"year": cls["year"], "section": cls["section"], "ref": cls["_id"]}}
+
+def test_unplaced_student_stays_listed_in_its_class():
+    first, second = make_class(1, "A1", []), make_class(2, "A1", [])
+    # No 2-B1 class exists, so the 1-B1 student cannot be promoted
+    stranded = make_class(1, "B1", [])
+    promoted, unplaced = make_student(first), make_student(stranded)
+    first["students"].append(promoted["_id"])
+    stranded["students"].append(unplaced["_id"])
+
+    plan = year_end.plan_year_end([promoted, unplaced], [first, second, stranded])
+
+    assert [student["_id"] for student, _ in plan["unplaced"]] == [unplaced["_id"]]
+    assert plan["classes"][stranded["_id"]]["students"] == [unplaced["_id"]]
+    assert plan["classes"][second["_id"]]["students"] == [promoted["_id"]]
+    assert plan["classes"][first["_id"]]["students"] == []
@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from pymongo import MongoClient
+
+import points_engine
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+
+SNAPSHOT_PATH = 'points_snapshot.npz'
+TOP_MOVERS = 10
+STUDENT_PROJECTION = {"name": 1, "registerNo": 1, "department": 1, "currentClass.year": 1, "totalPoints": 1}
+
+def merged_configuration(baseline, candidate):
+    """A candidate's categories laid over the baseline, as the category config controller saves them"""
+    configuration = dict(baseline or {})
+    configuration.update(candidate or {})
+    return configuration
+
+def snapshot_fields(configurations):
+    """Fields each category is scored on across the configurations, in first-seen order"""
+    fields = {}
+    for configuration in configurations:
+        for category, rules in (configuration or {}).items():
+            field_list = fields.setdefault(category, [])
+            for field in (rules or {}):
+                if field not in field_list:
+                    field_list.append(field)
+    return fields
+
+def build_snapshot(db, baseline, candidates=(), batch_size=points_engine.BATCH_SIZE):
+    """Columnar copy of every student and the field values of every approved event.
+
+    Each event row holds ids into a vocabulary of (category, field, value) triples covering every
+    value the event answers, configured or not, so a candidate can price values the baseline ignores.
+    """
+    fields = snapshot_fields([baseline] + [merged_configuration(baseline, c) for c in candidates])
+    students = list(db[STUDENT_COLLECTION].find({}, STUDENT_PROJECTION))
+    positions = {student["_id"]: i for i, student in enumerate(students)}
+
+    triples = {}
+    matches = {"matches": {}}
+    rows, owners, current = [], [], []
+    projection = {"category": 1, "customAnswers": 1, "pointsEarned": 1, "submittedBy": 1}
+    projection.update({field: 1 for field_list in fields.values() for field in field_list
+                       if field in points_engine.EVENT_SCHEMA_FIELDS})
+    cursor = db[points_engine.EVENT_COLLECTION].find(points_engine.event_query(), projection, batch_size=batch_size)
+    for event in cursor:
+        owner = positions.get(event.get("submittedBy"))
+        if owner is None:
+            continue
+        row = []
+        category = event.get("category")
+        category_fields = fields.get(category, [])
+        answers = event.get("customAnswers")
+        keys = (points_engine.answer_keys(matches, category, category_fields, answers)
+                if isinstance(answers, dict) and category_fields else None)
+        for column, field in enumerate(category_fields):
+            value = event.get(field) if field in points_engine.EVENT_SCHEMA_FIELDS else None
+            if not points_engine.js_truthy(value) and keys is not None and keys[column] is not None:
+                value = answers[keys[column]]
+            if points_engine.js_truthy(value):
+                row.append(triples.setdefault((category, field, points_engine.js_key(value)), len(triples) + 1))
+        rows.append(row)
+        owners.append(owner)
+        current.append(event.get("pointsEarned") or 0)
+
+    width = max((len(row) for row in rows), default=0) or 1
+    matrix = np.zeros((len(rows), width), dtype=np.int32)
+    for i, row in enumerate(rows):
+        matrix[i, :len(row)] = row
+
+    vocabulary = list(triples)
+    return {
+        "matrix": matrix,
+        "event_student": np.array(owners, dtype=np.int32),
+        "event_points": np.array(current, dtype=np.float64),
+        "student_ids": np.array([str(s["_id"]) for s in students]),
+        "names": np.array([s.get("name") or "" for s in students]),
+        "register_nos": np.array([s.get("registerNo") or "" for s in students]),
+        "departments": np.array([s.get("department") or "" for s in students]),
+        "years": np.array([(s.get("currentClass") or {}).get("year") or 0 for s in students], dtype=np.int64),
+        "total_points": np.array([s.get("totalPoints") or 0 for s in students], dtype=np.float64),
+        "triple_category": np.array([t[0] for t in vocabulary] or [""]),
+        "triple_field": np.array([t[1] for t in vocabulary] or [""]),
+        "triple_value": np.array([t[2] for t in vocabulary] or [""]),
+        "field_category": np.array([c for c, field_list in fields.items() for _ in field_list] or [""]),
+        "field_name": np.array([f for field_list in fields.values() for f in field_list] or [""]),
+        "baseline": np.array(json.dumps(baseline or {})),
+    }
+
+def save_snapshot(snapshot, path):
+    np.savez_compressed(path, **snapshot)
+
+def load_snapshot(path):
+    with np.load(path) as data:
+        snapshot = {key: data[key] for key in data.files}
+    snapshot["baseline"] = json.loads(str(snapshot["baseline"]))
+    return snapshot
+
+def points_table(snapshot, configuration):
+    """Points for each vocabulary triple under a configuration; index 0 scores nothing"""
+    table = np.zeros(len(snapshot["triple_value"]) + 1, dtype=np.float64)
+    for i, (category, field, value) in enumerate(zip(snapshot["triple_category"], snapshot["triple_field"],
+                                                     snapshot["triple_value"]), start=1):
+        values = ((configuration or {}).get(category) or {}).get(field) or {}
+        amount = values.get(value) if isinstance(values, dict) else None
+        if points_engine.js_truthy(amount):
+            table[i] = float(amount)
+    return table
+
+def missing_fields(snapshot, configuration):
+    """(category, field) pairs a configuration scores that the snapshot did not capture"""
+    captured = set(zip(snapshot["field_category"], snapshot["field_name"]))
+    return [(category, field) for category, rules in configuration.items()
+            for field in (rules or {}) if (category, field) not in captured]
+
+def dense_ranks(points, groups):
+    """Dense rank within each group, highest points first, for every student at once"""
+    order = np.lexsort((-points, groups))
+    sorted_groups = groups[order]
+    sorted_points = points[order]
+    group_start = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    value_start = group_start | np.r_[True, sorted_points[1:] != sorted_points[:-1]]
+    counter = np.cumsum(value_start)
+    ranks = np.empty(len(points), dtype=np.int64)
+    ranks[order] = counter - np.maximum.accumulate(np.where(group_start, counter, 0)) + 1
+    return ranks
+
+def context_groups(snapshot):
+    """Group id per student for the (department, year) context and the labels of the groups"""
+    labels = np.char.add(np.char.add(snapshot["departments"], ":"), snapshot["years"].astype(str))
+    names, groups = np.unique(labels, return_inverse=True)
+    return names, groups
+
+def mover(snapshot, i, delta, before, after):
+    return {
+        "studentId": str(snapshot["student_ids"][i]),
+        "name": str(snapshot["names"][i]),
+        "registerNo": str(snapshot["register_nos"][i]),
+        "department": str(snapshot["departments"][i]),
+        "year": int(snapshot["years"][i]),
+        "currentPoints": float(snapshot["total_points"][i]),
+        "newPoints": float(snapshot["total_points"][i] + delta[i]),
+        "pointsDifference": float(delta[i]),
+        "contextRankBefore": int(before[i]),
+        "contextRankAfter": int(after[i]),
+    }
+
+def analyze(snapshot, configuration, top=TOP_MOVERS, context=None):
+    """Impact of scoring the snapshot's approved events with a configuration"""
+    if context is None:
+        context = context_groups(snapshot)
+    group_names, groups = context
+    student_count = len(snapshot["student_ids"])
+
+    event_points = points_table(snapshot, configuration)[snapshot["matrix"]].sum(axis=1)
+    event_delta = event_points - snapshot["event_points"]
+    delta = np.bincount(snapshot["event_student"], weights=event_delta, minlength=student_count)
+    new_points = snapshot["total_points"] + delta
+
+    overall_before = dense_ranks(snapshot["total_points"], np.zeros(student_count, dtype=np.int64))
+    overall_after = dense_ranks(new_points, np.zeros(student_count, dtype=np.int64))
+    before = dense_ranks(snapshot["total_points"], groups)
+    after = dense_ranks(new_points, groups)
+    shift = before - after  # positive: moved up
+
+    # Rank shifts per (department, year) context
+    moved = np.bincount(groups, weights=shift != 0, minlength=len(group_names))
+    sizes = np.bincount(groups, minlength=len(group_names))
+    mean_shift = np.bincount(groups, weights=np.abs(shift), minlength=len(group_names)) / np.maximum(sizes, 1)
+    max_up = np.zeros(len(group_names), dtype=np.int64)
+    max_down = np.zeros(len(group_names), dtype=np.int64)
+    np.maximum.at(max_up, groups, shift)
+    np.maximum.at(max_down, groups, -shift)
+    rank_impacts = {
+        str(name): {"students": int(sizes[g]), "studentsMoved": int(moved[g]),
+                    "meanAbsShift": round(float(mean_shift[g]), 2), "maxRise": int(max_up[g]),
+                    "maxDrop": int(max_down[g])}
+        for g, name in enumerate(group_names)
+    }
+
+    gainers = np.flatnonzero(delta > 0)
+    losers = np.flatnonzero(delta < 0)
+    top_gainers = gainers[np.argsort(-delta[gainers], kind="stable")[:top]]
+    top_losers = losers[np.argsort(delta[losers], kind="stable")[:top]]
+    rank_movers = np.argsort(-np.abs(shift), kind="stable")[:top]
+
+    return {
+        "totalEventsAffected": int(np.count_nonzero(event_delta)),
+        "totalStudentsAffected": int(gainers.size + losers.size),
+        "totalPointsChange": float(event_delta.sum()),
+        "studentsGainingPoints": int(gainers.size),
+        "studentsLosingPoints": int(losers.size),
+        "studentsChangingOverallRank": int(np.count_nonzero(overall_before != overall_after)),
+        "mostImpactedStudents": [mover(snapshot, i, delta, before, after) for i in np.r_[top_gainers, top_losers]],
+        "largestRankShifts": [mover(snapshot, i, delta, before, after) for i in rank_movers if shift[i] != 0],
+        "rankImpacts": rank_impacts,
+    }
+
+def compare(snapshot, candidates, top=TOP_MOVERS):
+    """Analyze several candidate configurations against one snapshot; returns {name: impacts}"""
+    context = context_groups(snapshot)
+    results = {}
+    for name, candidate in candidates:
+        configuration = merged_configuration(snapshot["baseline"], candidate)
+        start = time.perf_counter()
+        results[name] = analyze(snapshot, configuration, top, context)
+        results[name]["seconds"] = time.perf_counter() - start
+        results[name]["missingFields"] = [f"{c}.{f}" for c, f in missing_fields(snapshot, configuration)]
+    return results
+
+def print_impacts(name, impacts, groups=5):
+    """Print a candidate's summary, its most disrupted contexts and top movers"""
+    print(f"\n{name}: {impacts['totalEventsAffected']:,} events and {impacts['totalStudentsAffected']:,} students "
+          f"affected, {impacts['totalPointsChange']:+,.0f} points "
+          f"({impacts['studentsGainingPoints']:,} gaining, {impacts['studentsLosingPoints']:,} losing, "
+          f"{impacts['studentsChangingOverallRank']:,} changing overall rank) in {impacts['seconds'] * 1000:.0f} ms")
+    if impacts["missingFields"]:
+        print(f"  Not in snapshot (rebuild it with this candidate): {', '.join(impacts['missingFields'])}")
+
+    contexts = sorted(impacts["rankImpacts"].items(), key=lambda item: -item[1]["meanAbsShift"])[:groups]
+    for label, entry in contexts:
+        print(f"  {label:<12} {entry['studentsMoved']:>6,}/{entry['students']:<6,} moved, "
+              f"mean shift {entry['meanAbsShift']:.2f}, max rise {entry['maxRise']}, max drop {entry['maxDrop']}")
+    for student in impacts["mostImpactedStudents"]:
+        print(f"  {student['registerNo']:<12} {student['name']:<28} {student['pointsDifference']:+8,.0f} points, "
+              f"context rank {student['contextRankBefore']} -> {student['contextRankAfter']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Estimate how candidate categoryRules configurations would move students")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH,
+                        help=f"columnar snapshot to analyze; built from the database if missing (default: {SNAPSHOT_PATH})")
+    parser.add_argument("--refresh-snapshot", action="store_true", help="rebuild the snapshot even if it exists")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="baseline configuration JSON when building the snapshot (default: the active one)")
+    parser.add_argument("--candidate", metavar="PATH", action="append", default=[],
+                        help="candidate configuration JSON; categories it lists replace the baseline's. Repeat to compare")
+    parser.add_argument("--top", type=int, default=TOP_MOVERS, help=f"movers listed per candidate (default: {TOP_MOVERS})")
+    parser.add_argument("--json", metavar="PATH", help="also write the impacts as JSON")
+    args = parser.parse_args()
+
+    candidates = []
+    for path in args.candidate:
+        with open(path) as f:
+            candidates.append((os.path.basename(path), json.load(f)))
+
+    if args.refresh_snapshot or not os.path.exists(args.snapshot):
+        db = MongoClient(args.uri)[args.db]
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        else:
+            baseline = points_engine.active_configuration(db)
+        start = time.perf_counter()
+        snapshot = build_snapshot(db, baseline, [candidate for _, candidate in candidates])
+        save_snapshot(snapshot, args.snapshot)
+        print(f"Snapshot of {len(snapshot['event_student']):,} approved events and "
+              f"{len(snapshot['student_ids']):,} students written to {args.snapshot} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    snapshot = load_snapshot(args.snapshot)
+    print(f"Loaded {len(snapshot['event_student']):,} events in {time.perf_counter() - start:.2f}s")
+
+    results = compare(snapshot, candidates or [("baseline", {})], args.top)
+    for name, impacts in results.items():
+        print_impacts(name, impacts)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
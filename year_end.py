@@ -0,0 +1,198 @@
+import argparse
+import re
+import time
+from datetime import datetime, timezone
+
+from pymongo import MongoClient, UpdateMany, UpdateOne
+
+# Connect to MongoDB
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'leaderboard_db'
+STUDENT_COLLECTION = 'students'
+CLASS_COLLECTION = 'classes'
+RUN_COLLECTION = 'yearendruns'  # One document per applied academic year, so a rerun is refused
+
+BATCH_SIZE = 1000  # Student ids per updateMany
+SAMPLE_CHANGES = 10  # Student moves listed in the dry-run report
+
+STUDENT_PROJECTION = {"registerNo": 1, "program": 1, "department": 1, "year": 1, "class": 1,
+                      "currentClass": 1, "isGraduated": 1, "isArchived": 1}
+
+def graduation_year(student):
+    """Final year of study, as advanceToNextYear decides it"""
+    return 5 if student.get("program") == "MTech" else 4
+
+def next_academic_year(span):
+    """'2024-2028' -> '2025-2029', the span of the next intake"""
+    match = re.fullmatch(r"(\d{4})-(\d{4})", span or "")
+    if not match:
+        return span
+    return f"{int(match.group(1)) + 1}-{int(match.group(2)) + 1}"
+
+def class_name(year, section, department):
+    """className as class.model.js builds it"""
+    return f"{year}-{section}-{department}"
+
+def build_class_index(classes):
+    """(className, department, year) -> class, the lookup promoteStudents.js does per student"""
+    return {(c["className"], c["department"], c["year"]): c for c in classes}
+
+def plan_year_end(students, classes):
+    """Every change the year end makes, computed once over all students and classes"""
+    index = build_class_index(classes)
+    by_id = {c["_id"]: c for c in classes}
+    plan = {"promotions": {}, "graduations": [], "archives": [], "unplaced": [], "classes": {}, "moves": []}
+    incoming = {c["_id"]: [] for c in classes}
+    listed_in = {student_id: c["_id"] for c in classes for student_id in c.get("students") or []}
+
+    for student in students:
+        if student.get("isGraduated"):
+            if not student.get("isArchived"):
+                plan["archives"].append(student["_id"])
+            continue
+
+        current = student.get("currentClass") or {}
+        source = by_id.get(current.get("ref") or student.get("class"))
+        year = current.get("year") or student.get("year")
+        if year is not None and year >= graduation_year(student):
+            plan["graduations"].append(student["_id"])
+            continue
+        target = None
+        if source is None:
+            reason = "no current class"
+        else:
+            next_name = class_name(source["year"] + 1, source["section"], source["department"])
+            target = index.get((next_name, source["department"], source["year"] + 1))
+            reason = f"no class {next_name}"
+        if target is None:
+            # Left in place: the class they still point at must go on listing them
+            plan["unplaced"].append((student, reason))
+            kept = source["_id"] if source is not None else listed_in.get(student["_id"])
+            if kept is not None:
+                incoming[kept].append(student["_id"])
+            continue
+        plan["promotions"].setdefault((source["_id"], target["_id"]), []).append(student["_id"])
+        incoming[target["_id"]].append(student["_id"])
+        if len(plan["moves"]) < SAMPLE_CHANGES:
+            plan["moves"].append((student.get("registerNo"), source["className"], target["className"]))
+
+    # Each class now holds the cohort promoted into it plus anyone left in it; first-year classes
+    # wait for the next intake
+    sources = {target: by_id[source] for source, target in plan["promotions"]}
+    for c in classes:
+        academic_year = sources[c["_id"]]["academicYear"] if c["_id"] in sources else (
+            next_academic_year(c.get("academicYear")) if c["year"] == 1 else c.get("academicYear"))
+        plan["classes"][c["_id"]] = {"className": c["className"], "academicYear": academic_year,
+                                     "students": incoming[c["_id"]],
+                                     "before": (c.get("academicYear"), len(c.get("students") or []))}
+    return plan
+
+def batched(ids, batch_size):
+    for start in range(0, len(ids), batch_size):
+        yield ids[start:start + batch_size]
+
+def plan_operations(plan, classes, now, batch_size=BATCH_SIZE):
+    """Bulk writes for students and classes; one updateMany per source class and id batch"""
+    by_id = {c["_id"]: c for c in classes}
+    student_ops = []
+    for (source_id, target_id), ids in plan["promotions"].items():
+        target = by_id[target_id]
+        entry = {"year": target["year"], "section": target["section"],
+                 "academicYear": by_id[source_id].get("academicYear"), "classRef": target_id}
+        update = {
+            "$set": {"year": target["year"], "class": target_id,
+                     "currentClass": {"year": target["year"], "section": target["section"], "ref": target_id},
+                     "updatedAt": now},
+            "$push": {"classHistory": entry},
+        }
+        for chunk in batched(ids, batch_size):
+            student_ops.append(UpdateMany({"_id": {"$in": chunk}, "isGraduated": {"$ne": True}}, update))
+
+    # Graduating and archiving both end with the archived state archiveGraduatedStudents.js leaves
+    leaving = plan["graduations"] + plan["archives"]
+    for chunk in batched(leaving, batch_size):
+        student_ops.append(UpdateMany({"_id": {"$in": chunk}}, {"$set": {
+            "isGraduated": True, "isArchived": True, "class": None, "updatedAt": now}}))
+
+    class_ops = [UpdateOne({"_id": class_id}, {"$set": {"academicYear": change["academicYear"],
+                                                        "students": change["students"], "updatedAt": now}})
+                 for class_id, change in plan["classes"].items()]
+    return student_ops, class_ops
+
+def print_plan(plan):
+    """Dry-run diff: counts per class move, graduations, unplaced students and class changes"""
+    print(f"\n{'from class':<16} {'to class':<16} {'students':>9}")
+    for (source_id, target_id), ids in sorted(plan["promotions"].items(),
+                                              key=lambda item: plan["classes"][item[0][1]]["className"]):
+        print(f"{plan['classes'][source_id]['className']:<16} {plan['classes'][target_id]['className']:<16} "
+              f"{len(ids):>9,}")
+    print(f"\nPromoted: {sum(len(ids) for ids in plan['promotions'].values()):,}, "
+          f"graduating: {len(plan['graduations']):,}, archiving earlier graduates: {len(plan['archives']):,}, "
+          f"unplaced: {len(plan['unplaced']):,}")
+    for register_no, source, target in plan["moves"]:
+        print(f"  {register_no}: {source} -> {target}")
+    for student, reason in plan["unplaced"][:SAMPLE_CHANGES]:
+        print(f"  {student.get('registerNo')}: not promoted, {reason}")
+
+    changed = [c for c in plan["classes"].values()
+               if c["before"] != (c["academicYear"], len(c["students"]))]
+    print(f"\nClasses changing: {len(changed):,}")
+    for c in changed[:SAMPLE_CHANGES]:
+        print(f"  {c['className']}: academicYear {c['before'][0]} -> {c['academicYear']}, "
+              f"students {c['before'][1]:,} -> {len(c['students']):,}")
+
+def run_year_end(db, label, dry_run=False, force=False, batch_size=BATCH_SIZE):
+    """Plan and (unless dry_run) apply the year end; returns per-step timings"""
+    timings = {}
+    if not dry_run and not force and db[RUN_COLLECTION].find_one({"_id": label}):
+        raise SystemExit(f"Year end {label} was already applied; pass --force to run it again")
+
+    start = time.perf_counter()
+    students = list(db[STUDENT_COLLECTION].find({"isArchived": {"$ne": True}}, STUDENT_PROJECTION))
+    classes = list(db[CLASS_COLLECTION].find({}, {"year": 1, "section": 1, "className": 1, "department": 1,
+                                                  "academicYear": 1, "students": 1}))
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plan = plan_year_end(students, classes)
+    now = datetime.now(timezone.utc)
+    student_ops, class_ops = plan_operations(plan, classes, now, batch_size)
+    timings["plan"] = time.perf_counter() - start
+
+    print_plan(plan)
+    if dry_run:
+        return timings, len(student_ops) + len(class_ops)
+
+    start = time.perf_counter()
+    if student_ops:
+        db[STUDENT_COLLECTION].bulk_write(student_ops, ordered=False)
+    if class_ops:
+        db[CLASS_COLLECTION].bulk_write(class_ops, ordered=False)
+    db[RUN_COLLECTION].update_one({"_id": label}, {"$set": {
+        "appliedAt": now,
+        "promoted": sum(len(ids) for ids in plan["promotions"].values()),
+        "graduated": len(plan["graduations"]),
+        "archived": len(plan["archives"]),
+        "unplaced": len(plan["unplaced"]),
+    }}, upsert=True)
+    timings["apply"] = time.perf_counter() - start
+    return timings, len(student_ops) + len(class_ops)
+
+if __name__ == "__main__":
+    now = datetime.now()
+    parser = argparse.ArgumentParser(description="Promote, graduate and archive students for the year end in bulk")
+    parser.add_argument("--uri", default=MONGO_URI, help=f"MongoDB URI (default: {MONGO_URI})")
+    parser.add_argument("--db", default=DB_NAME, help=f"database name (default: {DB_NAME})")
+    parser.add_argument("--academic-year", default=f"{now.year - 1}-{now.year}",
+                        help="academic year being closed, recorded so it is only applied once "
+                             f"(default: {now.year - 1}-{now.year})")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes without writing them")
+    parser.add_argument("--force", action="store_true", help="apply even if this academic year was applied before")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"student ids per bulk update (default: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    db = MongoClient(args.uri)[args.db]
+    timings, operations = run_year_end(db, args.academic_year, args.dry_run, args.force, args.batch_size)
+    print(f"\n{'Dry run' if args.dry_run else 'Applied'}: {operations:,} bulk operations; "
+          + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items()))